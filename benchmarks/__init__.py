@@ -0,0 +1 @@
+"""Benchmarks of the ceur_graph hot paths"""
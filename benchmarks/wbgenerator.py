@@ -0,0 +1,553 @@
+"""
+Benchmarks of the conversions between the data models and wikibase items in ceur_graph.wbgenerator.
+
+Run with
+    python -m benchmarks.wbgenerator
+to compare against the stored baseline. The run fails if a benchmark regressed beyond the thresholds.
+Use --save-baseline to store the results of the current run as new baseline.
+"""
+
+import argparse
+import gc
+import logging
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+import uuid
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from pydantic import AnyHttpUrl, BaseModel
+from wikibaseintegrator import WikibaseIntegrator
+from wikibaseintegrator.entities import ItemEntity
+from wikibaseintegrator.wbi_enums import ActionIfExists, WikibaseSnakType
+
+from ceur_graph.datamodel.editorsignature import EditorSignature, EditorSignatureCreate
+from ceur_graph.datamodel.item import StatementBase
+from ceur_graph.datamodel.paper import Paper, PaperCreate
+from ceur_graph.datamodel.reference import Reference, ReferenceCreate
+from ceur_graph.datamodel.scholarsignature import ScholarSignature, ScholarSignatureCreate
+from ceur_graph.datamodel.volume import Volume, VolumeCreate
+from ceur_graph.wbgenerator import (
+    create_item_from_model,
+    create_qualified_statement_from_model,
+    get_mapping_plan,
+    get_model_from_item,
+    get_models_from_qualified_statement,
+    update_qualified_statement_from_model,
+)
+
+logger = logging.getLogger(__name__)
+
+BASELINE_PATH = Path(__file__).parent.joinpath("baseline.json")
+ITEM_ID = "Q1"
+# (number of authors, number of references) of the synthetic papers
+PAPER_SIZES = {"small": (1, 0), "typical": (5, 30), "large": (100, 300)}
+VOLUME_EDITORS = 50
+
+
+class BenchmarkResult(BaseModel):
+    """
+    Measurements of one benchmark
+    """
+
+    name: str
+    ops_per_sec: float
+    time_per_op: float
+    time_stdev: float
+    # peak memory allocated by one conversion as traced by tracemalloc
+    allocated_bytes: int
+    rounds: int
+    iterations: int
+
+
+class Baseline(BaseModel):
+    """
+    Stored benchmark results to compare against
+    """
+
+    created_at: datetime
+    python_version: str
+    platform: str
+    # ops/sec of the reference workload on the machine the baseline was recorded on
+    machine_speed: float
+    results: dict[str, BenchmarkResult]
+
+
+class Regression(BaseModel):
+    """
+    Metric of a benchmark that is worse than in the baseline
+    """
+
+    name: str
+    metric: str
+    baseline: float
+    current: float
+    change: float
+
+
+class Benchmark:
+    """
+    Benchmark of one conversion.
+    The setup builds the input data and returns the function to measure so that the preparation is not measured.
+    """
+
+    def __init__(self, name: str, setup: Callable[[], Callable[[], Any]]):
+        self.name = name
+        self.setup = setup
+
+    def run(self, rounds: int = 5, min_round_time: float = 0.2, allocation_runs: int = 3) -> BenchmarkResult:
+        """
+        Run the benchmark
+        :param rounds: number of timed rounds
+        :param min_round_time: minimal duration of a round in seconds. The number of iterations per round is
+        calibrated to reach it
+        :param allocation_runs: number of runs traced for the allocated memory. The minimum is reported
+        :return:
+        """
+        func = self.setup()
+        # warm up caches like the mapping plans
+        func()
+        iterations = 1
+        while True:
+            duration = self._time(func, iterations)
+            if duration >= min_round_time:
+                break
+            iterations = max(iterations * 2, int(iterations * min_round_time / max(duration, 1e-9)))
+        times = [duration / iterations]
+        times.extend(self._time(func, iterations) / iterations for _ in range(rounds - 1))
+        # the fastest round is the least disturbed by other processes
+        time_per_op = min(times)
+        return BenchmarkResult(
+            name=self.name,
+            ops_per_sec=1 / time_per_op,
+            time_per_op=time_per_op,
+            time_stdev=statistics.stdev(times) if len(times) > 1 else 0,
+            allocated_bytes=self._trace_allocations(func, allocation_runs),
+            rounds=rounds,
+            iterations=iterations,
+        )
+
+    @staticmethod
+    def _time(func: Callable[[], Any], iterations: int) -> float:
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for _ in range(iterations):
+                func()
+            return time.perf_counter() - start
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    @staticmethod
+    def _trace_allocations(func: Callable[[], Any], runs: int) -> int:
+        tracemalloc.start()
+        try:
+            allocated = []
+            for _ in range(runs):
+                tracemalloc.reset_peak()
+                start, _ = tracemalloc.get_traced_memory()
+                func()
+                _, peak = tracemalloc.get_traced_memory()
+                allocated.append(peak - start)
+            return min(allocated)
+        finally:
+            tracemalloc.stop()
+
+
+def get_author(i: int) -> ScholarSignatureCreate:
+    """
+    Get a synthetic author signature. Every third author is not yet linked to a scholar item
+    :param i: position of the author
+    :return:
+    """
+    return ScholarSignatureCreate(
+        scholar_id=WikibaseSnakType.UNKNOWN_VALUE.value if i % 3 == 0 else f"Q{1000 + i}",
+        object_named_as=f"Author {i}",
+        series_ordinal=i + 1,
+        orcid_id=f"0000-0002-{1000 + i:04d}-{i % 1000:03d}X",
+        affiliation_string=[f"University {i % 7}", f"Institute {i % 5}"],
+        affiliation=[f"Q{2000 + i % 7}"],
+        dblp_author_id=f"{i % 100}/{1000 + i}",
+    )
+
+
+def get_editor(i: int) -> EditorSignatureCreate:
+    """
+    Get a synthetic editor signature
+    :param i: position of the editor
+    :return:
+    """
+    return EditorSignatureCreate(**get_author(i).model_dump(exclude_unset=True))
+
+
+def get_reference(i: int) -> ReferenceCreate:
+    """
+    Get a synthetic paper reference. Most references are not linked to an item
+    :param i: position of the reference
+    :return:
+    """
+    return ReferenceCreate(
+        reference_id=f"Q{3000 + i}" if i % 4 == 0 else WikibaseSnakType.UNKNOWN_VALUE.value,
+        object_named_as=f"Reference title {i}",
+        series_ordinal=i + 1,
+        doi=f"10.1000/ref.{i}",
+        title=f"Reference title {i}",
+        author_name_string=[f"Author {i}-{j}" for j in range(3)],
+        described_at_url=AnyHttpUrl(f"https://example.org/ref/{i}"),
+    )
+
+
+def get_paper() -> PaperCreate:
+    return PaperCreate(
+        label="Benchmark paper",
+        description="ceur-ws paper 2025",
+        title="Benchmark paper title",
+        published_in="Q100",
+        full_work_available_at_url=AnyHttpUrl("https://ceur-ws.org/Vol-1/paper1.pdf"),
+        pages=12,
+        dblp_publication_id="conf/bench/Paper25",
+        language_of_work="Q1",
+        wikidata_id="Q123456",
+    )
+
+
+def get_volume() -> VolumeCreate:
+    return VolumeCreate(
+        label="Proceedings of the Benchmark Workshop",
+        description="Proceedings of CEUR-WS Vol-1",
+        title="Proceedings of the Benchmark Workshop",
+        short_name="BENCH 2025",
+        dblp_publication_id="conf/bench/2025",
+        language_of_work="Q1",
+        urn="urn:nbn:de:0074-1-0",
+        full_work_available_at_url=AnyHttpUrl("https://ceur-ws.org/Vol-1/"),
+        volume="1",
+        part_of_the_series="Q13",
+        number_of_submissions=120,
+        number_of_accepted_submissions=30,
+    )
+
+
+def add_statements(item: ItemEntity, statements: list[StatementBase]):
+    """
+    Add the given statements to the item with statement ids as if the item was loaded from the wikibase
+    """
+    for statement in statements:
+        claim = create_qualified_statement_from_model(statement)
+        claim.id = f"{ITEM_ID}${uuid.UUID(int=random.getrandbits(128))}"
+        # statements are unique, skip the quadratic duplicate check of wikibaseintegrator
+        item.claims.add(claim, action_if_exists=ActionIfExists.FORCE_APPEND)
+
+
+def get_paper_item(wbi: WikibaseIntegrator, authors: int, references: int) -> ItemEntity:
+    """
+    Get a synthetic paper item with the given number of authors and references
+    """
+    item = create_item_from_model(get_paper(), wbi)
+    item.id = ITEM_ID
+    add_statements(item, [get_author(i) for i in range(authors)])
+    add_statements(item, [get_reference(i) for i in range(references)])
+    return item
+
+
+def get_volume_item(wbi: WikibaseIntegrator, editors: int = VOLUME_EDITORS) -> ItemEntity:
+    """
+    Get a synthetic volume item with the given number of editors
+    """
+    item = create_item_from_model(get_volume(), wbi)
+    item.id = ITEM_ID
+    add_statements(item, [get_editor(i) for i in range(editors)])
+    return item
+
+
+def get_benchmarks() -> list[Benchmark]:
+    """
+    Get the benchmarks of the conversion hot paths
+    :return:
+    """
+    random.seed(0)
+    wbi = WikibaseIntegrator()
+
+    def create_item(model: BaseModel) -> Callable[[], Callable[[], Any]]:
+        return lambda: lambda: create_item_from_model(model, wbi)
+
+    def create_statement(model: StatementBase) -> Callable[[], Callable[[], Any]]:
+        return lambda: lambda: create_qualified_statement_from_model(model)
+
+    benchmarks = [
+        Benchmark("create_item_from_model[paper]", create_item(get_paper())),
+        Benchmark("create_item_from_model[volume]", create_item(get_volume())),
+        Benchmark("create_qualified_statement_from_model[author]", create_statement(get_author(1))),
+        Benchmark("create_qualified_statement_from_model[reference]", create_statement(get_reference(1))),
+        Benchmark("create_qualified_statement_from_model[editor]", create_statement(get_editor(1))),
+    ]
+
+    def from_item(model: type[BaseModel], get_item: Callable[[], ItemEntity]) -> Callable[[], Callable[[], Any]]:
+        def setup():
+            item = get_item()
+            return lambda: get_model_from_item(item, model)
+
+        return setup
+
+    def statements_from_item(
+        model: type[StatementBase], get_item: Callable[[], ItemEntity]
+    ) -> Callable[[], Callable[[], Any]]:
+        def setup():
+            item = get_item()
+            return lambda: get_models_from_qualified_statement(item, model)
+
+        return setup
+
+    def update_statement(
+        model: type[StatementBase], get_item: Callable[[], ItemEntity], update: StatementBase
+    ) -> Callable[[], Callable[[], Any]]:
+        def setup():
+            item = get_item()
+            claims = item.claims.get(get_mapping_plan(model).get_statement_subject().prop_nr)
+            statement_id = claims[len(claims) // 2].id
+            return lambda: update_qualified_statement_from_model(item, statement_id, update)
+
+        return setup
+
+    for size, (authors, references) in PAPER_SIZES.items():
+
+        def get_item(authors=authors, references=references) -> ItemEntity:
+            return get_paper_item(wbi, authors, references)
+
+        label = f"paper-{size}-{authors}a-{references}r"
+        benchmarks.append(Benchmark(f"get_model_from_item[{label}]", from_item(Paper, get_item)))
+        benchmarks.append(
+            Benchmark(
+                f"get_models_from_qualified_statement[authors,{label}]",
+                statements_from_item(ScholarSignature, get_item),
+            )
+        )
+        if references:
+            benchmarks.append(
+                Benchmark(
+                    f"get_models_from_qualified_statement[references,{label}]",
+                    statements_from_item(Reference, get_item),
+                )
+            )
+        if size == "large":
+            benchmarks.append(
+                Benchmark(
+                    f"update_qualified_statement_from_model[author,{label}]",
+                    update_statement(ScholarSignature, get_item, get_author(7)),
+                )
+            )
+            benchmarks.append(
+                Benchmark(
+                    f"update_qualified_statement_from_model[reference,{label}]",
+                    update_statement(Reference, get_item, get_reference(7)),
+                )
+            )
+
+    def get_volume_with_editors() -> ItemEntity:
+        return get_volume_item(wbi)
+
+    label = f"volume-{VOLUME_EDITORS}e"
+    benchmarks.append(Benchmark(f"get_model_from_item[{label}]", from_item(Volume, get_volume_with_editors)))
+    benchmarks.append(
+        Benchmark(
+            f"get_models_from_qualified_statement[editors,{label}]",
+            statements_from_item(EditorSignature, get_volume_with_editors),
+        )
+    )
+    return benchmarks
+
+
+def reference_workload():
+    """
+    Pure Python workload used to compare the speed of the machine running the benchmarks with the one of the baseline
+    """
+    values = {f"Q{i}": [str(i)] * 3 for i in range(500)}
+    return sorted(values.items(), key=lambda entry: entry[1][0])
+
+
+def measure_machine_speed(rounds: int = 5, min_round_time: float = 0.2) -> float:
+    """
+    Measure the ops/sec of the reference workload
+    :param rounds:
+    :param min_round_time:
+    :return:
+    """
+    return Benchmark("reference", lambda: reference_workload).run(rounds, min_round_time, allocation_runs=1).ops_per_sec
+
+
+def run_benchmarks(
+    benchmarks: list[Benchmark],
+    rounds: int = 5,
+    min_round_time: float = 0.2,
+    allocation_runs: int = 3,
+) -> dict[str, BenchmarkResult]:
+    """
+    Run the given benchmarks
+    :param benchmarks:
+    :param rounds: number of timed rounds per benchmark
+    :param min_round_time: minimal duration of a round in seconds
+    :param allocation_runs: number of runs traced for the allocated memory
+    :return: results by benchmark name
+    """
+    results = {}
+    for benchmark in benchmarks:
+        result = benchmark.run(rounds=rounds, min_round_time=min_round_time, allocation_runs=allocation_runs)
+        logger.info(f"{result.name}: {result.ops_per_sec:.1f} ops/s, {result.allocated_bytes} bytes")
+        results[benchmark.name] = result
+    return results
+
+
+def compare_results(
+    baseline: Baseline,
+    results: dict[str, BenchmarkResult],
+    machine_speed: float | None = None,
+    threshold: float = 0.25,
+    allocation_threshold: float = 0.1,
+) -> list[Regression]:
+    """
+    Compare the results against the baseline. Benchmarks missing in the baseline are not compared
+    :param baseline:
+    :param results:
+    :param machine_speed: ops/sec of the reference workload in this run. If given the ops/sec of the baseline are
+    scaled by the speed difference of the machines
+    :param threshold: maximal tolerated relative decrease of the ops/sec
+    :param allocation_threshold: maximal tolerated relative increase of the allocated memory
+    :return: regressions beyond the thresholds
+    """
+    regressions = []
+    speedup = machine_speed / baseline.machine_speed if machine_speed is not None else 1
+    for name, result in results.items():
+        expected = baseline.results.get(name)
+        if expected is None:
+            continue
+        expected_ops_per_sec = expected.ops_per_sec * speedup
+        throughput_change = result.ops_per_sec / expected_ops_per_sec - 1
+        if throughput_change < -threshold:
+            regressions.append(
+                Regression(
+                    name=name,
+                    metric="ops_per_sec",
+                    baseline=expected_ops_per_sec,
+                    current=result.ops_per_sec,
+                    change=throughput_change,
+                )
+            )
+        allocation_change = result.allocated_bytes / max(expected.allocated_bytes, 1) - 1
+        if allocation_change > allocation_threshold:
+            regressions.append(
+                Regression(
+                    name=name,
+                    metric="allocated_bytes",
+                    baseline=expected.allocated_bytes,
+                    current=result.allocated_bytes,
+                    change=allocation_change,
+                )
+            )
+    return regressions
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Baseline | None:
+    if not path.exists():
+        return None
+    return Baseline.model_validate_json(path.read_text())
+
+
+def save_baseline(results: dict[str, BenchmarkResult], machine_speed: float, path: Path = BASELINE_PATH) -> Baseline:
+    baseline = Baseline(
+        created_at=datetime.now().astimezone(),
+        python_version=platform.python_version(),
+        platform=platform.platform(),
+        machine_speed=machine_speed,
+        results=results,
+    )
+    path.write_text(baseline.model_dump_json(indent=2) + "\n")
+    return baseline
+
+
+def format_results(
+    results: dict[str, BenchmarkResult], baseline: Baseline | None = None, machine_speed: float | None = None
+) -> str:
+    """
+    Format the results as table
+    :param results:
+    :param baseline: If given the change to the baseline is included
+    :param machine_speed: ops/sec of the reference workload in this run
+    :return:
+    """
+    speedup = machine_speed / baseline.machine_speed if baseline is not None and machine_speed is not None else 1
+    name_width = max(len(name) for name in results)
+    lines = [f"{'benchmark':<{name_width}} {'ops/sec':>12} {'µs/op':>10} {'bytes/op':>10} {'Δ ops/sec':>10}"]
+    for name, result in results.items():
+        expected = baseline.results.get(name) if baseline is not None else None
+        change = f"{result.ops_per_sec / (expected.ops_per_sec * speedup) - 1:+.1%}" if expected is not None else "-"
+        lines.append(
+            f"{name:<{name_width}} {result.ops_per_sec:>12.1f} {result.time_per_op * 1e6:>10.1f} "
+            f"{result.allocated_bytes:>10} {change:>10}"
+        )
+    return "\n".join(lines)
+
+
+def main(args: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", "--filter", help="only run the benchmarks whose name contains the given string")
+    parser.add_argument("--rounds", type=int, default=5, help="number of timed rounds per benchmark")
+    parser.add_argument("--min-round-time", type=float, default=0.2, help="minimal duration of a round in seconds")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="path of the baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=0.25, help="maximal tolerated relative decrease of the ops/sec"
+    )
+    parser.add_argument(
+        "--allocation-threshold",
+        type=float,
+        default=0.1,
+        help="maximal tolerated relative increase of the allocated memory",
+    )
+    parser.add_argument(
+        "--no-normalize",
+        action="store_true",
+        help="compare the ops/sec as measured instead of scaling them by the speed difference of the machines",
+    )
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as new baseline")
+    parsed = parser.parse_args(args)
+    benchmarks = [
+        benchmark for benchmark in get_benchmarks() if parsed.filter is None or parsed.filter in benchmark.name
+    ]
+    machine_speed = measure_machine_speed(parsed.rounds, parsed.min_round_time)
+    results = run_benchmarks(benchmarks, rounds=parsed.rounds, min_round_time=parsed.min_round_time)
+    baseline = load_baseline(parsed.baseline)
+    print(format_results(results, baseline, None if parsed.no_normalize else machine_speed))
+    if parsed.save_baseline:
+        save_baseline(results, machine_speed, parsed.baseline)
+        print(f"Stored baseline at {parsed.baseline}")
+        return 0
+    if baseline is None:
+        print(f"No baseline found at {parsed.baseline}. Store one with --save-baseline")
+        return 0
+    if baseline.python_version != platform.python_version():
+        print(f"Baseline was recorded with Python {baseline.python_version}, the allocations might differ")
+    regressions = compare_results(
+        baseline,
+        results,
+        machine_speed=None if parsed.no_normalize else machine_speed,
+        threshold=parsed.threshold,
+        allocation_threshold=parsed.allocation_threshold,
+    )
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression.name} {regression.metric}: {regression.baseline:.1f} → {regression.current:.1f} "
+            f"({regression.change:+.1%})"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(main())
@@ -1,4 +1,5 @@
 import secrets
+import time
 from datetime import UTC, datetime, timedelta
 from typing import Annotated
 
@@ -9,13 +10,13 @@ from pydantic import BaseModel
 from starlette import status
 from wikibaseintegrator.wbi_login import LoginError
 
-from ceur_graph.ceur_dev import CeurDev
-from ceur_graph.datamodel.auth import WikibaseBotAuth
+from ceur_graph.api.concurrency import WRITE_ROUTES, run_blocking
+from ceur_graph.api.sessions import get_session_manager
+from ceur_graph.ceur_dev import CeurDev, get_ceur_dev
 
 SECRET_KEY = secrets.token_hex(20)
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
-users_db: dict[str, CeurDev] = {}
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
@@ -28,21 +29,20 @@ class Token(BaseModel):
 async def login_user(username: str, password: str) -> Token:
     """
     Validate the given user name and password. If they are valid generate an access token and return it.
-    After generating the access token, the token and the Wikibase login object are stored in the user db
+    The user is logged in to the wikibase instance only once. All access tokens of the user share the session.
     :param username: user name
     :param password: password
     :return:
     """
-    auth = WikibaseBotAuth(user=username, password=password)
-    ceur_dev = CeurDev(auth)
+    session_manager = get_session_manager()
     try:
-        ceur_dev.get_wbi_login()
+        await run_blocking(session_manager.login, username, password, route_group=WRITE_ROUTES)
     except LoginError as e:
         raise HTTPException(status_code=400, detail="Incorrect username or password") from e
 
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(data={"sub": username}, expires_delta=access_token_expires)
-    users_db[access_token] = ceur_dev
+    session_manager.add_token(username, access_token, time.time() + access_token_expires.total_seconds())
     return Token(access_token=access_token, token_type="bearer")
 
 
@@ -52,16 +52,25 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]) -> Ceu
     The current user identifies with his token.
     :param token: token of the current user
     :return: CEURDev instance of the current user
-    :raises HTTPException: if the token is invalid
+    :raises HTTPException: if the token is invalid, expired or the session of the user was evicted
     """
-    user = users_db.get(token)
-    if not user:
+    session = get_session_manager().get_session(token)
+    if session is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    return user
+    return session.wikibase
+
+
+async def get_anonymous_user() -> CeurDev:
+    """
+    Get the shared anonymous wikibase instance for routes that only read.
+    The instance is created at application startup and reused by all requests.
+    :return: CEURDev instance without authorization
+    """
+    return get_ceur_dev()
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
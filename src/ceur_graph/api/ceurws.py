@@ -1,8 +1,10 @@
 import logging
+from typing import Annotated
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 
-from ceur_graph.ceur_dev import CeurDev
+from ceur_graph.api.concurrency import READ_ROUTES, offload
+from ceur_graph.volume_index import VolumeIds, get_volume_index
 
 logger = logging.getLogger(__name__)
 
@@ -13,20 +15,31 @@ router = APIRouter(
 )
 
 
+@router.get("/volumes", response_model=list[VolumeIds])
+@offload(READ_ROUTES)
+def get_volume_ids(volume_number: Annotated[list[int], Query()]):
+    """
+    Get the Qids of the proceedings and documents of multiple volumes by their volume numbers.
+    """
+    return get_volume_index().get_volumes(volume_number)
+
+
 @router.get("/Vol-{volume_number}/papers")
+@offload(READ_ROUTES)
 def get_volume_paper_ids(volume_number: int):
     """
     Get the documents published in a proceedings by its volume number.
     The document can either be a paper, preface, invited paper or keynote.
     """
-    volume_documents = CeurDev().get_papers_of_proceedings_by_volume_number(volume_number)
+    volume_documents = get_volume_index().get_papers(volume_number)
     return volume_documents
 
 
 @router.get("/Vol-{volume_number}")
+@offload(READ_ROUTES)
 def get_volume_id(volume_number: int):
     """
     Get the Qid of the volume with the given volume number.
     """
-    proceedings_qid = CeurDev().get_proceedings_by_volume_number(volume_number)
+    proceedings_qid = get_volume_index().get_proceedings(volume_number)
     return proceedings_qid
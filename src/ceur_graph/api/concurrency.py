@@ -0,0 +1,82 @@
+import asyncio
+import functools
+import logging
+from collections.abc import Callable
+from typing import Any
+from weakref import WeakKeyDictionary
+
+from anyio import CapacityLimiter, to_thread
+
+logger = logging.getLogger(__name__)
+
+READ_ROUTES = "read"
+WRITE_ROUTES = "write"
+IMPORT_ROUTES = "import"
+DEFAULT_ROUTE_LIMIT = 10
+
+route_limits: dict[str, int] = {
+    READ_ROUTES: 20,
+    WRITE_ROUTES: 4,
+    IMPORT_ROUTES: 2,
+}
+_limiters: WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, CapacityLimiter]] = WeakKeyDictionary()
+
+
+def get_route_limiter(name: str) -> CapacityLimiter:
+    """
+    Get the capacity limiter of the given route group for the running event loop
+    :param name: name of the route group
+    :return:
+    """
+    limiters = _limiters.setdefault(asyncio.get_running_loop(), {})
+    limiter = limiters.get(name)
+    if limiter is None:
+        limiter = CapacityLimiter(route_limits.get(name, DEFAULT_ROUTE_LIMIT))
+        limiters[name] = limiter
+    return limiter
+
+
+def set_route_limit(name: str, limit: int):
+    """
+    Set the maximal number of concurrently executed requests of the given route group
+    :param name: name of the route group
+    :param limit: number of worker threads the route group can use at the same time
+    :return:
+    """
+    route_limits[name] = limit
+    for limiters in _limiters.values():
+        if name in limiters:
+            limiters[name].total_tokens = limit
+
+
+async def run_blocking[T](func: Callable[..., T], *args: Any, route_group: str, **kwargs: Any) -> T:
+    """
+    Run the given blocking function in a worker thread without blocking the event loop.
+    The number of concurrent calls is limited per route group.
+    :param func: blocking function
+    :param args: positional arguments of the function
+    :param route_group: name of the route group whose limit applies
+    :param kwargs: keyword arguments of the function
+    :return: result of the function
+    """
+    limiter = get_route_limiter(route_group)
+    return await to_thread.run_sync(functools.partial(func, *args, **kwargs), limiter=limiter)
+
+
+def offload[T](route_group: str) -> Callable[[Callable[..., T]], Callable[..., Any]]:
+    """
+    Decorator turning a blocking route handler into an async route handler that runs the handler in a worker thread
+    bounded by the limit of the given route group.
+    The signature of the handler is kept so that FastAPI resolves the parameters and dependencies as before.
+    :param route_group: name of the route group whose limit applies
+    :return:
+    """
+
+    def decorator(func: Callable[..., T]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            return await run_blocking(func, *args, route_group=route_group, **kwargs)
+
+        return wrapper
+
+    return decorator
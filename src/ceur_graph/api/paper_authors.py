@@ -1,13 +1,16 @@
 import logging
-from typing import Annotated
+from typing import Annotated, Any
 
 from fastapi import APIRouter, Body, Depends
 from pydantic import Field
 from starlette import status
 
-from ceur_graph.api.auth import get_current_user
+from ceur_graph.api.auth import get_anonymous_user, get_current_user
+from ceur_graph.api.concurrency import READ_ROUTES, WRITE_ROUTES, offload
 from ceur_graph.api.utils import (
+    StatementBatchResult,
     handle_get_all_statements,
+    handle_statement_batch_creation,
     handle_statement_creation,
     handle_statement_deletion_by_id,
     handle_statement_deletion_by_object,
@@ -35,19 +38,24 @@ router = APIRouter(
     status_code=status.HTTP_200_OK,
     response_model=list[ScholarSignature],
 )
-def get_authors(paper_id: Annotated[str, Field(pattern=r"Q\d+")]):
+@offload(READ_ROUTES)
+def get_authors(
+    paper_id: Annotated[str, Field(pattern=r"Q\d+")],
+    ceur_dev: Annotated[CeurDev, Depends(get_anonymous_user)],
+):
     """
     Get authors
     """
     return handle_get_all_statements(
-        wikibase=CeurDev(),
+        wikibase=ceur_dev,
         item_id=paper_id,
         target_model=ScholarSignature,
     )
 
 
 @router.post("/")
-async def create_paper_author(
+@offload(WRITE_ROUTES)
+def create_paper_author(
     paper_id: str,
     ceur_dev: Annotated[CeurDev, Depends(get_current_user)],
     scholar_signature: Annotated[ScholarSignatureCreate, Body(embed=True)],
@@ -60,8 +68,28 @@ async def create_paper_author(
     )
 
 
+@router.post(":batch", status_code=status.HTTP_200_OK, response_model=list[StatementBatchResult])
+@offload(WRITE_ROUTES)
+def create_paper_authors(
+    paper_id: Annotated[str, Field(pattern=r"Q\d+")],
+    ceur_dev: Annotated[CeurDev, Depends(get_current_user)],
+    scholar_signatures: Annotated[list[dict[str, Any]], Body(embed=True)],
+):
+    """
+    Create multiple paper authors with a single edit
+    """
+    return handle_statement_batch_creation(
+        wikibase=ceur_dev,
+        item_id=paper_id,
+        statements=scholar_signatures,
+        create_model=ScholarSignatureCreate,
+        target_model=ScholarSignature,
+    )
+
+
 @router.delete("/{statement_id}")
-async def delete_paper_author_by_statement_id(
+@offload(WRITE_ROUTES)
+def delete_paper_author_by_statement_id(
     paper_id: Annotated[str, Field(pattern=r"Q\d+")],
     statement_id: str,
     ceur_dev: Annotated[CeurDev, Depends(get_current_user)],
@@ -78,7 +106,8 @@ async def delete_paper_author_by_statement_id(
 
 
 @router.delete("/")
-async def delete_paper_author(
+@offload(WRITE_ROUTES)
+def delete_paper_author(
     paper_id: Annotated[str, Field(pattern=r"Q\d+")],
     object_named_as: str,
     ceur_dev: Annotated[CeurDev, Depends(get_current_user)],
@@ -95,7 +124,8 @@ async def delete_paper_author(
 
 
 @router.put("/{statement_id}", response_model=ScholarSignature, status_code=status.HTTP_200_OK)
-async def update_paper_author(
+@offload(WRITE_ROUTES)
+def update_paper_author(
     paper_id: Annotated[str, Field(pattern=r"Q\d+")],
     statement_id: str,
     scholar_signature: Annotated[ScholarSignatureUpdate, Body(embed=True)],  # type: ignore
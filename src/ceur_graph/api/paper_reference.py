@@ -1,14 +1,17 @@
 import logging
-from typing import Annotated
+from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Body, Depends
 from pydantic import Field
 from starlette import status
 
-from ceur_graph.api.auth import get_current_user
+from ceur_graph.api.auth import get_anonymous_user, get_current_user
+from ceur_graph.api.concurrency import READ_ROUTES, WRITE_ROUTES, offload
 from ceur_graph.api.utils import (
+    StatementBatchResult,
     handle_get_all_statements,
     handle_get_statement_by_id,
+    handle_statement_batch_creation,
     handle_statement_creation,
     handle_statement_deletion_by_id,
     handle_statement_update,
@@ -30,18 +33,23 @@ router = APIRouter(
 
 
 @router.get("/", status_code=status.HTTP_200_OK, response_model=list[Reference])
-def get_paper_references(paper_id: Annotated[str, Field(pattern=r"Q\d+")]):
+@offload(READ_ROUTES)
+def get_paper_references(
+    paper_id: Annotated[str, Field(pattern=r"Q\d+")],
+    ceur_dev: Annotated[CeurDev, Depends(get_anonymous_user)],
+):
     """
     Get paper references
     """
     return handle_get_all_statements(
-        wikibase=CeurDev(),
+        wikibase=ceur_dev,
         item_id=paper_id,
         target_model=Reference,
     )
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=Reference)
+@offload(WRITE_ROUTES)
 def create_paper_reference(
     paper_id: Annotated[str, Field(pattern=r"Q\d+")],
     ceur_dev: Annotated[CeurDev, Depends(get_current_user)],
@@ -58,7 +66,27 @@ def create_paper_reference(
     )
 
 
+@router.post(":batch", status_code=status.HTTP_200_OK, response_model=list[StatementBatchResult])
+@offload(WRITE_ROUTES)
+def create_paper_references(
+    paper_id: Annotated[str, Field(pattern=r"Q\d+")],
+    ceur_dev: Annotated[CeurDev, Depends(get_current_user)],
+    references: Annotated[list[dict[str, Any]], Body(embed=True)],
+):
+    """
+    Create multiple paper references with a single edit
+    """
+    return handle_statement_batch_creation(
+        wikibase=ceur_dev,
+        item_id=paper_id,
+        statements=references,
+        create_model=ReferenceCreate,
+        target_model=Reference,
+    )
+
+
 @router.get("/{statement_id}", status_code=status.HTTP_200_OK, response_model=Reference)
+@offload(READ_ROUTES)
 def get_paper_reference_by_statement_id(
     paper_id: Annotated[str, Field(pattern=r"Q\d+")],
     statement_id: str,
@@ -68,7 +96,7 @@ def get_paper_reference_by_statement_id(
     Get paper reference by statement id
     """
     return handle_get_statement_by_id(
-        wikibase=CeurDev(),
+        wikibase=ceur_dev,
         item_id=paper_id,
         statement_id=statement_id,
         target_model=Reference,
@@ -76,6 +104,7 @@ def get_paper_reference_by_statement_id(
 
 
 @router.put("/{statement_id}", status_code=status.HTTP_200_OK, response_model=Reference)
+@offload(WRITE_ROUTES)
 def update_paper_reference(
     paper_id: Annotated[str, Field(pattern=r"Q\d+")],
     statement_id: str,
@@ -95,6 +124,7 @@ def update_paper_reference(
 
 
 @router.delete("/{statement_id}", status_code=status.HTTP_204_NO_CONTENT)
+@offload(WRITE_ROUTES)
 def delete_paper_reference(
     paper_id: Annotated[str, Field(pattern=r"Q\d+")],
     statement_id: str,
@@ -1,11 +1,12 @@
 import logging
 from typing import Annotated
 
-from fastapi import APIRouter, Body, Depends
+from fastapi import APIRouter, Body, Depends, Response
 from pydantic import Field
 from starlette import status
 
-from ceur_graph.api.auth import get_current_user
+from ceur_graph.api.auth import get_anonymous_user, get_current_user
+from ceur_graph.api.concurrency import READ_ROUTES, WRITE_ROUTES, offload
 from ceur_graph.api.utils import (
     handle_get_item_by_id,
     handle_item_creation,
@@ -26,6 +27,7 @@ router = APIRouter(
 
 
 @router.post("/", response_model=Paper, status_code=status.HTTP_201_CREATED)
+@offload(WRITE_ROUTES)
 def create_paper(
     paper: Annotated[PaperCreate, Body(embed=True)],
     ceur_dev: Annotated[CeurDev, Depends(get_current_user)],
@@ -38,30 +40,38 @@ def create_paper(
 
 
 @router.get("/{paper_id}", response_model=Paper, status_code=status.HTTP_200_OK)
-async def get_paper(paper_id: str):
+@offload(READ_ROUTES)
+def get_paper(
+    paper_id: str,
+    ceur_dev: Annotated[CeurDev, Depends(get_anonymous_user)],
+):
     return handle_get_item_by_id(
-        wikibase=CeurDev(),
+        wikibase=ceur_dev,
         item_id=paper_id,
         target_model=Paper,
     )
 
 
 @router.put("/{paper_id}", response_model=Paper, status_code=status.HTTP_200_OK)
-async def update_paper(
+@offload(WRITE_ROUTES)
+def update_paper(
     paper_id: Annotated[str, Field(pattern=r"Q\d+")],
     paper: Annotated[PaperUpdate, Body(embed=True)],  # type: ignore
     ceur_dev: Annotated[CeurDev, Depends(get_current_user)],
+    response: Response,
 ):
     return handle_item_update(
         wikibase=ceur_dev,
         item_id=paper_id,
         model_obj=paper,
         target_model=Paper,
+        response=response,
     )
 
 
 @router.delete("/{paper_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_paper(
+@offload(WRITE_ROUTES)
+def delete_paper(
     paper_id: str,
     ceur_dev: Annotated[CeurDev, Depends(get_current_user)],
     reason: Annotated[str | None, Field(description="Reason for deletion")] = None,
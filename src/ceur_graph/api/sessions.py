@@ -0,0 +1,321 @@
+import hashlib
+import hmac
+import logging
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from pydantic import BaseModel
+
+from ceur_graph.ceur_dev import CeurDev
+from ceur_graph.datamodel.auth import WikibaseBotAuth
+
+logger = logging.getLogger(__name__)
+
+
+def hash_password(password: str, salt: bytes) -> bytes:
+    """
+    Hash the given password to verify later logins without a new login handshake
+    :param password:
+    :param salt:
+    :return:
+    """
+    return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, 100_000)
+
+
+class UserSession(BaseModel):
+    """
+    Logged in wikibase instance of a user shared by all access tokens of the user
+    """
+
+    username: str
+    wikibase: CeurDev
+    password_hash: bytes
+    salt: bytes
+    created_at: float
+    last_used: float
+
+    def verify_password(self, password: str) -> bool:
+        return hmac.compare_digest(self.password_hash, hash_password(password, self.salt))
+
+
+class SessionManagerStats(BaseModel):
+    """
+    Counters of the session manager
+    """
+
+    logins: int = 0
+    reused_logins: int = 0
+    token_refreshes: int = 0
+    failed_refreshes: int = 0
+    expired_tokens: int = 0
+    evicted_sessions: int = 0
+    sessions: int = 0
+    tokens: int = 0
+
+
+class SessionManager:
+    """
+    Pool of the logged in wikibase sessions of the API users.
+    Each user is logged in once and all access tokens of the user share the authenticated session and its edit token.
+    Expired access tokens and idle sessions are evicted. Edit tokens are renewed in the background before they expire.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 100,
+        idle_timeout: float = 3600,
+        refresh_margin: float = 0.25,
+        maintenance_interval: float = 10,
+    ):
+        """
+        constructor
+        :param max_sessions: maximum number of sessions. The least recently used session is evicted first
+        :param idle_timeout: seconds after which an unused session is evicted
+        :param refresh_margin: fraction of the edit token renew period before its end in which the token is refreshed
+        :param maintenance_interval: seconds between two evictions and token refreshes of the background thread
+        """
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.refresh_margin = refresh_margin
+        self.maintenance_interval = maintenance_interval
+        self._sessions: OrderedDict[str, UserSession] = OrderedDict()
+        # access token → username and expiration timestamp
+        self._tokens: dict[str, tuple[str, float]] = {}
+        self._lock = threading.Lock()
+        # username → lock serializing the logins of the user and number of logins holding or waiting for it
+        self._user_locks: dict[str, tuple[threading.Lock, int]] = {}
+        self._stats = SessionManagerStats()
+        self._stop_event: threading.Event | None = None
+
+    @contextmanager
+    def _user_lock(self, username: str) -> Iterator[None]:
+        """
+        Serialize the logins of the given user. The lock is only kept while a login of the user is running so that
+        failed logins and evicted users leave no lock behind.
+        :param username:
+        :return:
+        """
+        with self._lock:
+            lock, users = self._user_locks.get(username, (threading.Lock(), 0))
+            self._user_locks[username] = (lock, users + 1)
+        try:
+            with lock:
+                yield
+        finally:
+            with self._lock:
+                lock, users = self._user_locks[username]
+                if users == 1:
+                    del self._user_locks[username]
+                else:
+                    self._user_locks[username] = (lock, users - 1)
+
+    def login(self, username: str, password: str) -> UserSession:
+        """
+        Get the session of the given user. Only the first login of a user or a login with a different password performs
+        the login handshake with the wikibase instance.
+        :param username:
+        :param password:
+        :return:
+        :raises LoginError: if the credentials are rejected by the wikibase instance
+        """
+        with self._user_lock(username):
+            with self._lock:
+                session = self._sessions.get(username)
+            if session is not None and session.verify_password(password):
+                with self._lock:
+                    session.last_used = time.time()
+                    self._sessions.move_to_end(username)
+                    self._stats.reused_logins += 1
+                return session
+            wikibase = CeurDev(WikibaseBotAuth(user=username, password=password))
+            wikibase.login()
+            salt = secrets.token_bytes(16)
+            now = time.time()
+            session = UserSession(
+                username=username,
+                wikibase=wikibase,
+                password_hash=hash_password(password, salt),
+                salt=salt,
+                created_at=now,
+                last_used=now,
+            )
+            with self._lock:
+                self._remove_session(username)
+                self._sessions[username] = session
+                self._stats.logins += 1
+                while len(self._sessions) > self.max_sessions:
+                    self._remove_session(next(iter(self._sessions)))
+                    self._stats.evicted_sessions += 1
+        self.start_maintenance()
+        return session
+
+    def add_token(self, username: str, token: str, expires_at: float):
+        """
+        Bind the given access token to the session of the user
+        :param username:
+        :param token:
+        :param expires_at: expiration timestamp of the token
+        :return:
+        """
+        with self._lock:
+            self._tokens[token] = (username, expires_at)
+
+    def get_session(self, token: str) -> UserSession | None:
+        """
+        Get the session of the given access token
+        :param token:
+        :return: session or None if the token is unknown, expired or its session was evicted
+        """
+        with self._lock:
+            entry = self._tokens.get(token)
+            if entry is None:
+                return None
+            username, expires_at = entry
+            session = self._sessions.get(username)
+            if expires_at <= time.time() or session is None:
+                del self._tokens[token]
+                self._stats.expired_tokens += 1
+                return None
+            session.last_used = time.time()
+            self._sessions.move_to_end(username)
+            return session
+
+    def get_user_session(self, username: str) -> UserSession | None:
+        """
+        Get the session of the given user independent of an access token, e.g. to execute background jobs of the user
+        :param username:
+        :return: session or None if the user is not logged in
+        """
+        with self._lock:
+            session = self._sessions.get(username)
+            if session is not None:
+                session.last_used = time.time()
+                self._sessions.move_to_end(username)
+            return session
+
+    def _remove_session(self, username: str):
+        """
+        Remove the session of the given user and its tokens. Must be called with the lock held.
+        :param username:
+        :return:
+        """
+        if self._sessions.pop(username, None) is None:
+            return
+        for token in [token for token, (user, _) in self._tokens.items() if user == username]:
+            del self._tokens[token]
+
+    def evict(self) -> int:
+        """
+        Evict expired access tokens and idle sessions
+        :return: number of evicted sessions
+        """
+        now = time.time()
+        with self._lock:
+            expired = [token for token, (_, expires_at) in self._tokens.items() if expires_at <= now]
+            for token in expired:
+                del self._tokens[token]
+            self._stats.expired_tokens += len(expired)
+            idle = [
+                username for username, session in self._sessions.items() if now - session.last_used > self.idle_timeout
+            ]
+            for username in idle:
+                self._remove_session(username)
+            self._stats.evicted_sessions += len(idle)
+        if idle:
+            logger.debug(f"Evicted {len(idle)} idle sessions")
+        return len(idle)
+
+    def refresh_tokens(self) -> int:
+        """
+        Renew the edit tokens that are about to expire. Sessions whose renewal fails are logged in again.
+        :return: number of refreshed sessions
+        """
+        with self._lock:
+            sessions = list(self._sessions.values())
+        refreshed = 0
+        for session in sessions:
+            login = session.wikibase.wbi.login
+            if login is None:
+                continue
+            renew_at = login.instantiation_time + login.token_renew_period * (1 - self.refresh_margin)
+            if time.time() < renew_at:
+                continue
+            try:
+                try:
+                    session.wikibase.refresh_edit_token()
+                except Exception as e:
+                    logger.info(f"Renewing the login of {session.username} after failed token refresh: {e}")
+                    session.wikibase.login(renew=True)
+                refreshed += 1
+            except Exception as e:
+                logger.error(f"Failed to refresh the session of {session.username}: {e}")
+                with self._lock:
+                    self._stats.failed_refreshes += 1
+        with self._lock:
+            self._stats.token_refreshes += refreshed
+        return refreshed
+
+    def start_maintenance(self):
+        """
+        Evict expired tokens and idle sessions and refresh the edit tokens in a background thread
+        :return:
+        """
+        with self._lock:
+            if self._stop_event is not None:
+                return
+            stop_event = threading.Event()
+            self._stop_event = stop_event
+
+        def run():
+            while not stop_event.wait(self.maintenance_interval):
+                try:
+                    self.evict()
+                    self.refresh_tokens()
+                except Exception as e:
+                    logger.error(f"Session maintenance failed: {e}")
+
+        threading.Thread(target=run, name="session-maintenance", daemon=True).start()
+
+    def stop_maintenance(self):
+        """
+        Stop the background maintenance
+        :return:
+        """
+        with self._lock:
+            if self._stop_event is not None:
+                self._stop_event.set()
+                self._stop_event = None
+
+    def stats(self) -> SessionManagerStats:
+        """
+        Get the counters and the number of sessions and tokens
+        :return:
+        """
+        with self._lock:
+            return self._stats.model_copy(update={"sessions": len(self._sessions), "tokens": len(self._tokens)})
+
+
+_session_manager: SessionManager | None = None
+_session_manager_lock = threading.Lock()
+
+
+def get_session_manager() -> SessionManager:
+    """Get the process wide session manager"""
+    global _session_manager
+    with _session_manager_lock:
+        if _session_manager is None:
+            _session_manager = SessionManager()
+        return _session_manager
+
+
+def set_session_manager(session_manager: SessionManager | None):
+    """Set the process wide session manager. None resets the manager"""
+    global _session_manager
+    with _session_manager_lock:
+        if _session_manager is not None and _session_manager is not session_manager:
+            _session_manager.stop_maintenance()
+        _session_manager = session_manager
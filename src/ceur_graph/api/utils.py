@@ -1,7 +1,10 @@
 import logging
+import math
+from enum import Enum
+from typing import Any
 
-from fastapi import HTTPException
-from pydantic import BaseModel
+from fastapi import HTTPException, Response
+from pydantic import BaseModel, SerializeAsAny, ValidationError
 from starlette import status
 from wikibaseintegrator.entities import ItemEntity
 
@@ -12,7 +15,9 @@ from ceur_graph.datamodel.item import (
     Statement,
     StatementBase,
 )
+from ceur_graph.resilience import CircuitOpenError
 from ceur_graph.wbgenerator import (
+    ItemUpdateReport,
     add_statement_from_model,
     create_item_from_model,
     delete_property_statement_by_id,
@@ -28,6 +33,24 @@ from ceur_graph.wikibase import Wikibase
 
 logger = logging.getLogger(__name__)
 
+UPDATED_FIELDS_HEADER = "X-Updated-Fields"
+UNCHANGED_FIELDS_HEADER = "X-Unchanged-Fields"
+
+
+def get_http_exception(error: Exception) -> HTTPException:
+    """
+    Get the http exception reporting the given error of a wikibase operation
+    :param error:
+    :return: 503 if the wikibase instance is currently unavailable otherwise 500
+    """
+    if isinstance(error, CircuitOpenError):
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(error),
+            headers={"Retry-After": str(math.ceil(error.retry_after))},
+        )
+    return HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(error))
+
 
 def handle_get_item_by_id(wikibase: Wikibase, item_id: str, target_model: type[ItemBase]):
     """
@@ -40,7 +63,7 @@ def handle_get_item_by_id(wikibase: Wikibase, item_id: str, target_model: type[I
     try:
         item: ItemEntity = wikibase.get_item(item_id)
     except Exception as e:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)) from e
+        raise get_http_exception(e) from e
     model = get_model_from_item(item, target_model)
     return model
 
@@ -61,11 +84,11 @@ def handle_item_deletion(
     """
     try:
         logger.debug(f"Deleting item {item_id} of type {get_model_label(target_model)}")
-        item = wikibase.get_item(item_id)
+        item = wikibase.get_item(item_id, for_update=True)
         wikibase.delete_entity(item, reason=reason)
     except Exception as e:
         logger.debug(f"Failed to delete item {item_id} of type {get_model_label(target_model)}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)) from e
+        raise get_http_exception(e) from e
 
 
 def handle_item_update(
@@ -73,23 +96,39 @@ def handle_item_update(
     item_id: str,
     model_obj: EntityBase,
     target_model: type[ItemBase],
+    response: Response | None = None,
 ):
     """
-    Handle item update
+    Handle item update. The item is only written if the update changes it.
     :param wikibase:
     :param item_id:
     :param model_obj:
     :param target_model:
+    :param response: response to report the changed and unchanged fields in the headers
     :return:
     """
+    report: ItemUpdateReport | None = None
+
+    def modify(item: ItemEntity) -> bool:
+        nonlocal report
+        report = update_item_from_model(model=model_obj, item=item)
+        return report.has_changes
+
     try:
-        item: ItemEntity = wikibase.get_item(item_id)
-        update_item_from_model(model=model_obj, item=item)
-        updated_item = wikibase.write_item(item, summary=f"Updates {get_model_label(target_model)} statements")
-        updated_paper = get_model_from_item(updated_item, target_model)
+        updated_paper = wikibase.modify_item(
+            item_id,
+            modify=modify,
+            get_result=lambda updated_item: get_model_from_item(updated_item, target_model),
+            summary=f"Updates {get_model_label(target_model)} statements",
+        )
+        if report is None or not report.has_changes:
+            logger.debug(f"Update of {item_id} does not change the item → skipping write")
+        if response is not None and report is not None:
+            response.headers[UPDATED_FIELDS_HEADER] = ",".join(report.changed)
+            response.headers[UNCHANGED_FIELDS_HEADER] = ",".join(report.unchanged)
         return updated_paper
     except Exception as e:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)) from e
+        raise get_http_exception(e) from e
 
 
 def handle_item_creation(wikibase: Wikibase, model_obj: EntityBase, target_model: type[ItemBase]):
@@ -107,7 +146,7 @@ def handle_item_creation(wikibase: Wikibase, model_obj: EntityBase, target_model
         created_model = get_model_from_item(created_item, target_model)
         return created_model
     except Exception as e:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)) from e
+        raise get_http_exception(e) from e
 
 
 def handle_statement_deletion_by_id(wikibase: Wikibase, item_id: str, statement_id: str, model: type[Statement]):
@@ -120,16 +159,22 @@ def handle_statement_deletion_by_id(wikibase: Wikibase, item_id: str, statement_
     :return: None if the deletion was successful
     :raise HTTPException if the statement was not found or some error occurred
     """
-    try:
-        item: ItemEntity = wikibase.get_item(item_id)
+    is_removed = False
+
+    def modify(item: ItemEntity) -> bool:
+        nonlocal is_removed
         is_removed = delete_property_statement_by_id(item, statement_id, model)
-        if is_removed:
-            wikibase.write_item(item, summary=f"Removes {get_model_label(model)}")
-        else:
+        return is_removed
+
+    try:
+        wikibase.modify_item(
+            item_id, modify=modify, get_result=lambda item: None, summary=f"Removes {get_model_label(model)}"
+        )
+        if not is_removed:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Statement not found")
     except Exception as e:
         logger.error(e)
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)) from e
+        raise get_http_exception(e) from e
 
 
 def handle_statement_deletion_by_object(
@@ -146,17 +191,22 @@ def handle_statement_deletion_by_object(
     :param model:
     :return:
     """
+    is_removed = False
+
+    def modify(item: ItemEntity) -> bool:
+        nonlocal is_removed
+        is_removed = delete_statement_by_matching_model(item, model(object_named_as=object_named_as))
+        return is_removed
+
     try:
-        item: ItemEntity = wikibase.get_item(item_id)
-        subject_to_delete = model(object_named_as=object_named_as)
-        is_removed = delete_statement_by_matching_model(item, subject_to_delete)
-        if is_removed:
-            wikibase.write_item(item, summary=f"Removes {get_model_label(model)}")
-        else:
+        wikibase.modify_item(
+            item_id, modify=modify, get_result=lambda item: None, summary=f"Removes {get_model_label(model)}"
+        )
+        if not is_removed:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Statement not found")
     except Exception as e:
         logger.error(e)
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)) from e
+        raise get_http_exception(e) from e
 
 
 def handle_statement_creation(
@@ -173,15 +223,115 @@ def handle_statement_creation(
     :param target_model:
     :return:
     """
-    try:
-        item: ItemEntity = wikibase.get_item(item_id)
+
+    def modify(item: ItemEntity) -> bool:
         add_statement_from_model(item, model_obj)
-        updated_item = wikibase.write_item(item, summary=f"Adds {get_model_label(target_model)}")
-        created_subject = get_item_statement_by_model(item=updated_item, model=model_obj, target_model=target_model)
+        return True
+
+    try:
+        created_subject = wikibase.modify_item(
+            item_id,
+            modify=modify,
+            get_result=lambda updated_item: get_item_statement_by_model(
+                item=updated_item, model=model_obj, target_model=target_model
+            ),
+            summary=f"Adds {get_model_label(target_model)}",
+        )
         return created_subject
     except Exception as e:
         logger.error(e)
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)) from e
+        raise get_http_exception(e) from e
+
+
+class StatementBatchStatus(Enum):
+    """
+    Outcome of a single statement of a batch creation
+    """
+
+    CREATED = "created"
+    DUPLICATE = "duplicate"
+    INVALID = "invalid"
+    FAILED = "failed"
+
+
+class StatementBatchResult(BaseModel):
+    """
+    Result of a single statement of a batch creation
+    """
+
+    index: int
+    status: StatementBatchStatus
+    statement: SerializeAsAny[StatementBase] | None = None
+    detail: str | None = None
+
+
+def handle_statement_batch_creation(
+    wikibase: Wikibase,
+    item_id: str,
+    statements: list[dict[str, Any]],
+    create_model: type[StatementBase],
+    target_model: type[Statement],
+) -> list[StatementBatchResult]:
+    """
+    Handle the creation of multiple statements. The item is loaded once, all valid statements are added and the item
+    is written as a single revision.
+    :param wikibase:
+    :param item_id:
+    :param statements: raw statements validated individually against the create model
+    :param create_model: model of the statements to create
+    :param target_model: model of the created statements
+    :return: result for each given statement in the given order
+    """
+    results: list[StatementBatchResult] = []
+    created: list[tuple[StatementBatchResult, StatementBase]] = []
+
+    def modify(item: ItemEntity) -> bool:
+        results.clear()
+        created.clear()
+        for i, raw_statement in enumerate(statements):
+            try:
+                model_obj = create_model.model_validate(raw_statement)
+            except ValidationError as e:
+                results.append(StatementBatchResult(index=i, status=StatementBatchStatus.INVALID, detail=str(e)))
+                continue
+            existing_statement = get_item_statement_by_model(item=item, model=model_obj)
+            if existing_statement is not None:
+                result = StatementBatchResult(
+                    index=i,
+                    status=StatementBatchStatus.DUPLICATE,
+                    statement=existing_statement,
+                    detail="Statement already exists",
+                )
+                results.append(result)
+                continue
+            try:
+                add_statement_from_model(item, model_obj)
+            except Exception as e:
+                logger.debug(f"Failed to add {get_model_label(target_model)} {i} to {item_id}: {e}")
+                results.append(StatementBatchResult(index=i, status=StatementBatchStatus.FAILED, detail=str(e)))
+                continue
+            result = StatementBatchResult(index=i, status=StatementBatchStatus.CREATED)
+            results.append(result)
+            created.append((result, model_obj))
+        return len(created) > 0
+
+    def get_result(updated_item: ItemEntity) -> list[StatementBatchResult]:
+        for result, model_obj in created:
+            result.statement = get_item_statement_by_model(
+                item=updated_item, model=model_obj, target_model=target_model
+            )
+        return results
+
+    try:
+        return wikibase.modify_item(
+            item_id,
+            modify=modify,
+            get_result=get_result,
+            summary=f"Adds {get_model_label(target_model)} statements",
+        )
+    except Exception as e:
+        logger.error(e)
+        raise get_http_exception(e) from e
 
 
 def handle_statement_update(
@@ -200,18 +350,24 @@ def handle_statement_update(
     :param target_model:
     :return:
     """
-    try:
-        item: ItemEntity = wikibase.get_item(item_id)
+
+    def modify(item: ItemEntity) -> bool:
         update_qualified_statement_from_model(item=item, statement_id=statement_id, model=model_obj)
         # Check if modification would invalidate the model → error is raised if invalid
         get_item_statement_by_id(item, statement_id, target_model)
-        # modification is valid → push changes to wikibase
-        updated_item = wikibase.write_item(item, summary=f"Update {get_model_label(target_model)}")
-        updated_author_signature = get_item_statement_by_id(updated_item, statement_id, target_model)
+        return True
+
+    try:
+        updated_author_signature = wikibase.modify_item(
+            item_id,
+            modify=modify,
+            get_result=lambda updated_item: get_item_statement_by_id(updated_item, statement_id, target_model),
+            summary=f"Update {get_model_label(target_model)}",
+        )
         return updated_author_signature
     except Exception as e:
         logger.error(e)
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)) from e
+        raise get_http_exception(e) from e
 
 
 def handle_get_all_statements(wikibase: Wikibase, item_id: str, target_model: type[Statement]) -> list[Statement]:
@@ -228,7 +384,7 @@ def handle_get_all_statements(wikibase: Wikibase, item_id: str, target_model: ty
         return models
     except Exception as e:
         logger.error(e)
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)) from e
+        raise get_http_exception(e) from e
 
 
 def handle_get_statement_by_id(
@@ -251,7 +407,7 @@ def handle_get_statement_by_id(
             return model
     except Exception as e:
         logger.error(e)
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)) from e
+        raise get_http_exception(e) from e
 
 
 def get_model_label(model: type[BaseModel]) -> str:
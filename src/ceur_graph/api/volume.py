@@ -1,10 +1,11 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Body, Depends
+from fastapi import APIRouter, Body, Depends, Response
 from pydantic import Field
 from starlette import status
 
-from ceur_graph.api.auth import get_current_user
+from ceur_graph.api.auth import get_anonymous_user, get_current_user
+from ceur_graph.api.concurrency import READ_ROUTES, WRITE_ROUTES, offload
 from ceur_graph.api.utils import (
     handle_get_item_by_id,
     handle_item_creation,
@@ -22,6 +23,7 @@ router = APIRouter(
 
 
 @router.post("/", response_model=Volume, status_code=status.HTTP_201_CREATED)
+@offload(WRITE_ROUTES)
 def create_volume(
     volume: Annotated[VolumeCreate, Body(embed=True)],
     ceur_dev: Annotated[CeurDev, Depends(get_current_user)],
@@ -37,22 +39,28 @@ def create_volume(
 
 
 @router.get("/{volume_id}", response_model=Volume, status_code=status.HTTP_200_OK)
-async def get_volume(volume_id: str):
+@offload(READ_ROUTES)
+def get_volume(
+    volume_id: str,
+    ceur_dev: Annotated[CeurDev, Depends(get_anonymous_user)],
+):
     """
     Get volume data by id.
     """
     return handle_get_item_by_id(
-        wikibase=CeurDev(),
+        wikibase=ceur_dev,
         item_id=volume_id,
         target_model=Volume,
     )
 
 
 @router.put("/{volume_id}", response_model=Volume, status_code=status.HTTP_200_OK)
-async def update_volume(
+@offload(WRITE_ROUTES)
+def update_volume(
     volume_id: Annotated[str, Field(pattern=r"Q\d+")],
     volume: Annotated[VolumeUpdate, Body(embed=True)],  # type: ignore
     ceur_dev: Annotated[CeurDev, Depends(get_current_user)],
+    response: Response,
 ):
     """
     Update volume data by id.
@@ -62,11 +70,13 @@ async def update_volume(
         item_id=volume_id,
         model_obj=volume,
         target_model=Volume,
+        response=response,
     )
 
 
 @router.delete("/{volume_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_volume(
+@offload(WRITE_ROUTES)
+def delete_volume(
     volume_id: str,
     ceur_dev: Annotated[CeurDev, Depends(get_current_user)],
     reason: Annotated[str | None, Field(description="Reason for deletion")] = None,
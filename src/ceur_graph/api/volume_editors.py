@@ -1,13 +1,16 @@
 import logging
-from typing import Annotated
+from typing import Annotated, Any
 
 from fastapi import APIRouter, Body, Depends
 from pydantic import Field
 from starlette import status
 
-from ceur_graph.api.auth import get_current_user
+from ceur_graph.api.auth import get_anonymous_user, get_current_user
+from ceur_graph.api.concurrency import READ_ROUTES, WRITE_ROUTES, offload
 from ceur_graph.api.utils import (
+    StatementBatchResult,
     handle_get_all_statements,
+    handle_statement_batch_creation,
     handle_statement_creation,
     handle_statement_deletion_by_id,
     handle_statement_deletion_by_object,
@@ -34,19 +37,24 @@ router = APIRouter(
     status_code=status.HTTP_200_OK,
     response_model=list[EditorSignature],
 )
-def get_editors(volume_id: Annotated[str, Field(pattern=r"Q\d+")]):
+@offload(READ_ROUTES)
+def get_editors(
+    volume_id: Annotated[str, Field(pattern=r"Q\d+")],
+    ceur_dev: Annotated[CeurDev, Depends(get_anonymous_user)],
+):
     """
     Get editors
     """
     return handle_get_all_statements(
-        wikibase=CeurDev(),
+        wikibase=ceur_dev,
         item_id=volume_id,
         target_model=EditorSignature,
     )
 
 
 @router.post("/")
-async def create_volume_editor(
+@offload(WRITE_ROUTES)
+def create_volume_editor(
     volume_id: str,
     ceur_dev: Annotated[CeurDev, Depends(get_current_user)],
     scholar_signature: Annotated[EditorSignatureCreate, Body(embed=True)],
@@ -59,8 +67,28 @@ async def create_volume_editor(
     )
 
 
+@router.post(":batch", status_code=status.HTTP_200_OK, response_model=list[StatementBatchResult])
+@offload(WRITE_ROUTES)
+def create_volume_editors(
+    volume_id: Annotated[str, Field(pattern=r"Q\d+")],
+    ceur_dev: Annotated[CeurDev, Depends(get_current_user)],
+    scholar_signatures: Annotated[list[dict[str, Any]], Body(embed=True)],
+):
+    """
+    Create multiple volume editors with a single edit
+    """
+    return handle_statement_batch_creation(
+        wikibase=ceur_dev,
+        item_id=volume_id,
+        statements=scholar_signatures,
+        create_model=EditorSignatureCreate,
+        target_model=EditorSignature,
+    )
+
+
 @router.delete("/{statement_id}")
-async def delete_volume_editor_by_statement_id(
+@offload(WRITE_ROUTES)
+def delete_volume_editor_by_statement_id(
     volume_id: Annotated[str, Field(pattern=r"Q\d+")],
     statement_id: str,
     ceur_dev: Annotated[CeurDev, Depends(get_current_user)],
@@ -77,7 +105,8 @@ async def delete_volume_editor_by_statement_id(
 
 
 @router.delete("/")
-async def delete_volume_editor(
+@offload(WRITE_ROUTES)
+def delete_volume_editor(
     volume_id: Annotated[str, Field(pattern=r"Q\d+")],
     object_named_as: str,
     ceur_dev: Annotated[CeurDev, Depends(get_current_user)],
@@ -94,7 +123,8 @@ async def delete_volume_editor(
 
 
 @router.put("/{statement_id}", response_model=EditorSignature, status_code=status.HTTP_200_OK)
-async def update_volume_editor(
+@offload(WRITE_ROUTES)
+def update_volume_editor(
     volume_id: Annotated[str, Field(pattern=r"Q\d+")],
     statement_id: str,
     scholar_signature: Annotated[EditorSignatureUpdate, Body(embed=True)],  # type: ignore
@@ -1,13 +1,16 @@
 import logging
-from typing import Annotated
+from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Body, Depends
 from pydantic import Field
 from starlette import status
 
-from ceur_graph.api.auth import get_current_user
+from ceur_graph.api.auth import get_anonymous_user, get_current_user
+from ceur_graph.api.concurrency import READ_ROUTES, WRITE_ROUTES, offload
 from ceur_graph.api.utils import (
+    StatementBatchResult,
     handle_get_all_statements,
+    handle_statement_batch_creation,
     handle_statement_creation,
     handle_statement_deletion_by_id,
     handle_statement_deletion_by_object,
@@ -32,18 +35,23 @@ router = APIRouter(
 
 
 @router.get("/", status_code=status.HTTP_200_OK, response_model=list[Subject])
-def get_subjects(volume_id: Annotated[str, Field(pattern=r"Q\d+")]):
+@offload(READ_ROUTES)
+def get_subjects(
+    volume_id: Annotated[str, Field(pattern=r"Q\d+")],
+    ceur_dev: Annotated[CeurDev, Depends(get_anonymous_user)],
+):
     """
     Get volume subjects
     """
     return handle_get_all_statements(
-        wikibase=CeurDev(),
+        wikibase=ceur_dev,
         item_id=volume_id,
         target_model=Subject,
     )
 
 
 @router.post("/", status_code=status.HTTP_200_OK, response_model=Subject)
+@offload(WRITE_ROUTES)
 def create_subject(
     volume_id: Annotated[str, Field(pattern=r"Q\d+")],
     ceur_dev: Annotated[CeurDev, Depends(get_current_user)],
@@ -60,7 +68,27 @@ def create_subject(
     )
 
 
+@router.post(":batch", status_code=status.HTTP_200_OK, response_model=list[StatementBatchResult])
+@offload(WRITE_ROUTES)
+def create_subjects(
+    volume_id: Annotated[str, Field(pattern=r"Q\d+")],
+    ceur_dev: Annotated[CeurDev, Depends(get_current_user)],
+    subjects: Annotated[list[dict[str, Any]], Body(embed=True)],
+):
+    """
+    Create multiple volume subjects with a single edit
+    """
+    return handle_statement_batch_creation(
+        wikibase=ceur_dev,
+        item_id=volume_id,
+        statements=subjects,
+        create_model=SubjectCreate,
+        target_model=Subject,
+    )
+
+
 @router.delete("/{statement_id}", status_code=status.HTTP_204_NO_CONTENT)
+@offload(WRITE_ROUTES)
 def delete_subject_by_statement_id(
     volume_id: Annotated[str, Field(pattern=r"Q\d+")],
     statement_id: str,
@@ -78,6 +106,7 @@ def delete_subject_by_statement_id(
 
 
 @router.delete("/", status_code=status.HTTP_204_NO_CONTENT)
+@offload(WRITE_ROUTES)
 def delete_subject_by_object_named_as(
     volume_id: Annotated[str, Field(pattern=r"Q\d+")],
     object_named_as: str,
@@ -95,6 +124,7 @@ def delete_subject_by_object_named_as(
 
 
 @router.put("/{statement_id}", status_code=status.HTTP_200_OK, response_model=Subject)
+@offload(WRITE_ROUTES)
 def update_subject(
     volume_id: Annotated[str, Field(pattern=r"Q\d+")],
     ceur_dev: Annotated[CeurDev, Depends(get_current_user)],
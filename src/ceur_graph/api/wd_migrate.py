@@ -1,15 +1,18 @@
 import logging
-from pathlib import Path
+import time
+from enum import Enum
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
-from wikibasemigrator.migrator import WikibaseMigrator
-from wikibasemigrator.model.profile import UserToken, WikibaseMigrationProfile, load_profile
+from fastapi import APIRouter, Body, Depends, HTTPException, status
+from pydantic import BaseModel
 from wikibasemigrator.model.translations import EntityTranslationResult
 
 from ceur_graph.api.auth import get_current_user
+from ceur_graph.api.concurrency import READ_ROUTES, WRITE_ROUTES, offload
+from ceur_graph.api.sessions import get_session_manager
 from ceur_graph.ceur_dev import CeurDev
-from ceur_graph.datamodel.auth import WikibaseAuthorizationConfig, WikibaseLoginTypes
+from ceur_graph.jobs import Job, JobDeferredError, get_job_manager
+from ceur_graph.migration import get_migrator_pool
 
 logger = logging.getLogger(__name__)
 
@@ -21,65 +24,167 @@ router = APIRouter(
 )
 
 
-@router.post("/import/{entity_id}")
+WD_IMPORT_JOB = "wd_import"
+# seconds a queued import waits for a new login of its user, e.g. after a restart, before it fails
+SESSION_WAIT_TIMEOUT = 24 * 3600
+MAX_IMPORT_BATCH_SIZE = 500
+# number of migrated entities written to the target wikibase at the same time
+IMPORT_WRITE_WORKERS = 4
+
+
+class EntityImportStatus(Enum):
+    """
+    Outcome of a single entity of an import
+    """
+
+    CREATED = "created"
+    UPDATED = "updated"
+    NOT_FOUND = "not_found"
+    FAILED = "failed"
+
+
+class EntityImportResult(BaseModel):
+    """
+    Result of a single entity of an import
+    """
+
+    wikidata_id: str
+    status: EntityImportStatus
+    ceurdev_id: str | None = None
+    detail: str | None = None
+
+
+@router.post("/import", status_code=status.HTTP_202_ACCEPTED)
+@offload(WRITE_ROUTES)
+def wikidata_batch_import(
+    entity_ids: Annotated[list[str], Body(embed=True, min_length=1, max_length=MAX_IMPORT_BATCH_SIZE)],
+    ceur_dev: Annotated[CeurDev, Depends(get_current_user)],
+    summary: str | None = None,
+) -> Job:
+    """
+    Queue the import of the given Wikidata entities, e.g. all papers of a proceedings, as one migration run.
+    The import is executed in the background. Its status and the outcome of each entity are available at
+    /wd/jobs/{job_id}.
+    """
+    return submit_import_job(ceur_dev, entity_ids, summary)
+
+
+@router.post("/import/{entity_id}", status_code=status.HTTP_202_ACCEPTED)
+@offload(WRITE_ROUTES)
 def wikidata_import(
     entity_id: str,
     ceur_dev: Annotated[CeurDev, Depends(get_current_user)],
     summary: str | None = None,
-):
-    """
-    Import the given Wikidata entity corresponding to the provided entity_id.
-    """
-    # todo fix for proper resource loading
-    path = Path(__file__).parent.parent.joinpath("./resources/migration_profiles/wd_to_ceur-dev.yaml")
-    migration_profile = load_profile(path)
-    if ceur_dev.auth_config is None:
-        return {
-            "error": True,
-            "message": "Authentication configuration not provided. Please ensure that you are logged in",
-        }
-    update_migration_profile(ceur_dev.auth_config, migration_profile)
-    try:
-        migrator = WikibaseMigrator(migration_profile)
-        translations = migrator.translate_entities_by_id([entity_id])
-        migrated_entities = migrator.migrate_entities_to_target(translations, summary=summary)
-        # ToDo in case of merge created_entity is empty!
-        migrated_entity: EntityTranslationResult = migrated_entities[0]
-        if migrated_entity.created_entity is not None:
-            qid = migrated_entities[0].created_entity.id
-        elif migrated_entity.entity.id is not None:
-            qid = migrated_entity.entity.id
+) -> Job:
+    """
+    Queue the import of the given Wikidata entity corresponding to the provided entity_id.
+    The import is executed in the background. Its status and result are available at /wd/jobs/{job_id}.
+    """
+    return submit_import_job(ceur_dev, [entity_id], summary)
+
+
+@router.get("/jobs/{job_id}")
+@offload(READ_ROUTES)
+def get_import_job(job_id: str, ceur_dev: Annotated[CeurDev, Depends(get_current_user)]) -> Job:
+    """
+    Get the status and result of the given import job
+    """
+    job = get_job_manager().get_job(job_id)
+    if job is None or job.username != getattr(ceur_dev.auth_config, "user", None):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
+
+
+def submit_import_job(ceur_dev: CeurDev, entity_ids: list[str], summary: str | None = None) -> Job:
+    """
+    Queue the import of the given Wikidata entities with the session of the given user
+    :param ceur_dev: wikibase instance of the current user
+    :param entity_ids: ids of the Wikidata entities
+    :param summary: summary of the edits
+    :return: queued job
+    """
+    username = getattr(ceur_dev.auth_config, "user", None)
+    if username is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication configuration not provided. Please ensure that you are logged in",
+        )
+    entity_ids = list(dict.fromkeys(entity_id.strip() for entity_id in entity_ids))
+    return get_job_manager().submit(WD_IMPORT_JOB, {"entity_ids": entity_ids, "summary": summary}, username=username)
+
+
+def run_import_job(job: Job) -> list[dict]:
+    """
+    Execute the given import job with the wikibase session of the user who submitted it
+    :param job: job with the entity_ids and summary parameters
+    :return: outcome of each entity
+    :raises JobDeferredError: if the user is currently not logged in
+    """
+    session = get_session_manager().get_user_session(job.username) if job.username is not None else None
+    if session is None:
+        if time.time() - job.created_at > SESSION_WAIT_TIMEOUT:
+            raise ValueError(f"User {job.username} did not log in again to resume the import")
+        raise JobDeferredError(f"Waiting for a login of user {job.username}")
+    results = migrate_entities(session.wikibase, job.params["entity_ids"], summary=job.params.get("summary"))
+    return [result.model_dump(mode="json") for result in results]
+
+
+def migrate_entities(
+    ceur_dev: CeurDev,
+    entity_ids: list[str],
+    summary: str | None = None,
+    max_workers: int = IMPORT_WRITE_WORKERS,
+) -> list[EntityImportResult]:
+    """
+    Import the given Wikidata entities into the wikibase of the given instance in one migration run.
+    The entities are fetched and translated together so that the item and property mappings are looked up once for the
+    whole batch. The mappings are cached across imports by the pooled migrator of the user. The translated entities
+    are written with bounded parallelism.
+    :param ceur_dev: logged in wikibase instance
+    :param entity_ids: ids of the Wikidata entities
+    :param summary: summary of the edits
+    :param max_workers: number of entities written at the same time
+    :return: outcome of each entity in the order of the given ids
+    """
+    username = getattr(ceur_dev.auth_config, "user", None)
+    migrator = get_migrator_pool().get_migrator(username or "", ceur_dev)
+    # the imported entities themselves are always looked up again to merge entities created since the last import
+    migrator.mapper.invalidate(entity_ids)
+    translations = migrator.translate_entities_by_id(entity_ids)
+    # entities to augment already carry the id of the existing target entity
+    existing = {
+        source_id: translation.entity.id
+        for source_id, translation in translations.entities.items()
+        if translation.entity.id is not None
+    }
+    migrated_entities: list[EntityTranslationResult] = migrator.migrate_entities_to_target(
+        translations, summary=summary, max_workers=max_workers
+    )
+    migrated_by_id = {migrated.original_entity.id: migrated for migrated in migrated_entities}
+    results = []
+    for entity_id in entity_ids:
+        migrated_entity = migrated_by_id.get(entity_id)
+        if migrated_entity is None:
+            result = EntityImportResult(
+                wikidata_id=entity_id, status=EntityImportStatus.NOT_FOUND, detail="Entity not found in Wikidata"
+            )
+        elif migrated_entity.created_entity is None:
+            result = EntityImportResult(
+                wikidata_id=entity_id,
+                status=EntityImportStatus.FAILED,
+                ceurdev_id=existing.get(entity_id),
+                detail="; ".join(migrated_entity.errors) or "Entity not created or augmented",
+            )
         else:
-            raise ValueError("Error on import! Entity not created or augmented")
-        return {"error": False, "wikidata_id": entity_id, "ceurdev_id": qid}
-    except Exception as e:
-        logger.error(f"Failed to migrate {entity_id}: {e}")
-        return {"error": True, "message": str(e)}
-
-
-def update_migration_profile(auth_config: WikibaseAuthorizationConfig, profile: WikibaseMigrationProfile):
-    """
-    Update the authentication information of the migration profile
-    :param auth_config: wikibase auth config to use for updating the migration profile target
-    :param profile: migration profile to update
-    :return:
-    """
-    match auth_config.auth_type:
-        case WikibaseLoginTypes.NONE:
-            pass
-        case WikibaseLoginTypes.USER:
-            profile.target.user = auth_config.user
-            profile.target.password = auth_config.password
-        case WikibaseLoginTypes.BOT:
-            profile.target.user = auth_config.user
-            profile.target.bot_password = auth_config.password
-        case WikibaseLoginTypes.OAUTH1:
-            profile.target.consumer_key = auth_config.consumer_token
-            profile.target.consumer_secret = auth_config.consumer_secret
-            profile.target.user_token = UserToken(
-                oauth_token=auth_config.access_token, oauth_token_secret=auth_config.access_secret
+            result = EntityImportResult(
+                wikidata_id=entity_id,
+                status=EntityImportStatus.UPDATED if entity_id in existing else EntityImportStatus.CREATED,
+                ceurdev_id=migrated_entity.created_entity.id,
             )
-        case WikibaseLoginTypes.OAUTH2:
-            logger.info("OAuth2 is currently not supported by wikibase migrator")
-        case _:
-            raise Exception(f"Unknown auth_type {auth_config.auth_type}")
+        results.append(result)
+    migrator.mapper.add_mappings(
+        {result.wikidata_id: result.ceurdev_id for result in results if result.status is EntityImportStatus.CREATED}
+    )
+    imported = sum(result.status in (EntityImportStatus.CREATED, EntityImportStatus.UPDATED) for result in results)
+    logger.info(f"Imported {imported} of {len(results)} Wikidata entities")
+    return results
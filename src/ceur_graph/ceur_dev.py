@@ -1,7 +1,11 @@
 import logging
+import threading
 from importlib.resources import files
 from string import Template
 
+from pydantic import HttpUrl
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
 import ceur_graph.resources.queries
 from ceur_graph.datamodel.auth import WikibaseAuthorizationConfig
 from ceur_graph.wikibase import Wikibase
@@ -9,18 +13,42 @@ from ceur_graph.wikibase import Wikibase
 logger = logging.getLogger(__name__)
 
 
+class CeurDevSettings(BaseSettings):
+    """
+    Endpoints of the ceur-dev wikibase instance.
+    Can be set with environment variables prefixed with CEUR_DEV_, e.g. CEUR_DEV_MEDIAWIKI_API_URL, to use a mirror or
+    a local stand-in of the instance. The entity prefixes are the concept URIs used in the queries and should only be
+    changed together with the queries.
+    """
+
+    model_config = SettingsConfigDict(env_prefix="CEUR_DEV_")
+
+    sparql_endpoint: HttpUrl = HttpUrl("https://ceur-dev.wikibase.cloud/query/sparql")
+    website: HttpUrl = HttpUrl("https://ceur-dev.wikibase.cloud/")
+    item_prefix: HttpUrl = HttpUrl("https://ceur-dev.wikibase.cloud/entity/")
+    property_prefix: HttpUrl = HttpUrl("https://ceur-dev.wikibase.cloud/prop/direct/")
+    mediawiki_api_url: HttpUrl = HttpUrl("https://ceur-dev.wikibase.cloud/w/api.php")
+
+
 class CeurDev(Wikibase):
     """
     Provides access to the Ceur-dev Wikibase API.
     """
 
-    def __init__(self, auth_config: WikibaseAuthorizationConfig | None = None):
+    def __init__(self, auth_config: WikibaseAuthorizationConfig | None = None, settings: CeurDevSettings | None = None):
+        """
+        constructor
+        :param auth_config: authorization of the user
+        :param settings: endpoints of the instance. Defaults to the settings from the environment
+        """
+        if settings is None:
+            settings = CeurDevSettings()
         super().__init__(
-            sparql_endpoint="https://ceur-dev.wikibase.cloud/query/sparql",
-            website="https://ceur-dev.wikibase.cloud/",
-            item_prefix="https://ceur-dev.wikibase.cloud/entity/",
-            property_prefix="https://ceur-dev.wikibase.cloud/prop/direct/",
-            mediawiki_api_url="https://ceur-dev.wikibase.cloud/w/api.php",
+            sparql_endpoint=settings.sparql_endpoint,
+            website=settings.website,
+            item_prefix=settings.item_prefix,
+            property_prefix=settings.property_prefix,
+            mediawiki_api_url=settings.mediawiki_api_url,
             auth_config=auth_config,
         )
 
@@ -61,6 +89,30 @@ class CeurDev(Wikibase):
             query_file="ceur-dev_proceedings_by_volume_number.rq", params={"volume_number": volume_number}
         )
 
+    @classmethod
+    def get_volumes_query(cls, limit: int, offset: int = 0) -> str:
+        """
+        Get the query for a page of all volumes with their proceedings and documents.
+        :param limit: page size
+        :param offset: offset of the page
+        :return:
+        """
+        return cls._load_query_and_substitute(
+            query_file="ceur-dev_volumes.rq", params={"limit": limit, "offset": offset}
+        )
+
+    @classmethod
+    def get_volumes_of_items_query(cls, item_uris: list[str]) -> str:
+        """
+        Get the query for the volumes related to the given items.
+        An item is related to a volume if it is the proceedings of the volume or a document published in it.
+        :param item_uris: URIs of the items
+        :return:
+        """
+        return cls._load_query_and_substitute(
+            query_file="ceur-dev_volumes_of_items.rq", params={"items": " ".join(f"<{uri}>" for uri in item_uris)}
+        )
+
     def get_proceedings_by_volume_number(self, volume_id: int) -> str | None:
         """
         Get the ceur-dev volume QID for the given volume id.
@@ -91,3 +143,23 @@ class CeurDev(Wikibase):
             if document_qid is not None:
                 paper_ids.append(document_qid)
         return paper_ids
+
+
+_ceur_dev: CeurDev | None = None
+_ceur_dev_lock = threading.Lock()
+
+
+def get_ceur_dev() -> CeurDev:
+    """Get the process wide anonymous CeurDev instance shared by all read operations"""
+    global _ceur_dev
+    with _ceur_dev_lock:
+        if _ceur_dev is None:
+            _ceur_dev = CeurDev()
+        return _ceur_dev
+
+
+def set_ceur_dev(ceur_dev: CeurDev | None):
+    """Set the process wide anonymous CeurDev instance. None resets the instance"""
+    global _ceur_dev
+    with _ceur_dev_lock:
+        _ceur_dev = ceur_dev
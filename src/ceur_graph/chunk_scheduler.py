@@ -0,0 +1,193 @@
+import logging
+import threading
+
+import httpx
+from pydantic import BaseModel, HttpUrl
+
+logger = logging.getLogger(__name__)
+
+TIMEOUT_STATUS_CODES = {500, 502, 503, 504}
+
+
+def is_timeout_error(error: BaseException) -> bool:
+    """
+    Check if the given error indicates that the query took too long.
+    The query service answers queries exceeding its time limit with a server error.
+    :param error:
+    :return:
+    """
+    if isinstance(error, httpx.TimeoutException | TimeoutError):
+        return True
+    return isinstance(error, httpx.HTTPStatusError) and error.response.status_code in TIMEOUT_STATUS_CODES
+
+
+class ChunkSchedulerStats(BaseModel):
+    """
+    Observed behaviour and current tuning of a chunk scheduler
+    """
+
+    chunk_size: int
+    concurrency: int
+    chunks: int = 0
+    values: int = 0
+    timeouts: int = 0
+    splits: int = 0
+    chunk_size_increases: int = 0
+    chunk_size_decreases: int = 0
+    latency_per_value: float | None = None
+    bytes_per_value: float | None = None
+    size_ceiling: float | None = None
+
+
+class AdaptiveChunkScheduler:
+    """
+    Tunes the chunk size and concurrency of chunked VALUES queries against one endpoint.
+    The chunk size follows the observed latency per value towards the target latency and is capped by the query size.
+    Timeouts halve the chunk size, reduce the concurrency and cap the chunk size below the timed out size. Successful
+    chunks slowly raise the cap and the concurrency again.
+    """
+
+    def __init__(
+        self,
+        initial_chunk_size: int = 500,
+        min_chunk_size: int = 10,
+        max_chunk_size: int = 5000,
+        target_latency: float = 5.0,
+        max_query_bytes: int = 200_000,
+        max_concurrency: int = 10,
+        smoothing: float = 0.3,
+        ceiling_relaxation: float = 1.05,
+    ):
+        """
+        constructor
+        :param initial_chunk_size: chunk size before any latency was observed
+        :param min_chunk_size: lower bound of the chunk size
+        :param max_chunk_size: upper bound of the chunk size
+        :param target_latency: desired duration of a chunk query in seconds
+        :param max_query_bytes: maximum size of a chunk query
+        :param max_concurrency: upper bound of the number of concurrently queried chunks
+        :param smoothing: weight of the latest observation in the moving averages
+        :param ceiling_relaxation: factor by which the chunk size cap set by a timeout is raised per successful chunk
+        """
+        self.min_chunk_size = min_chunk_size
+        self.max_chunk_size = max_chunk_size
+        self.target_latency = target_latency
+        self.max_query_bytes = max_query_bytes
+        self.max_concurrency = max_concurrency
+        self.smoothing = smoothing
+        self.ceiling_relaxation = ceiling_relaxation
+        self._lock = threading.Lock()
+        self._stats = ChunkSchedulerStats(
+            chunk_size=self._clamp(initial_chunk_size),
+            concurrency=max_concurrency,
+        )
+
+    @property
+    def chunk_size(self) -> int:
+        return self._stats.chunk_size
+
+    @property
+    def concurrency(self) -> int:
+        return self._stats.concurrency
+
+    def _clamp(self, chunk_size: float) -> int:
+        return max(self.min_chunk_size, min(self.max_chunk_size, int(chunk_size)))
+
+    def _average(self, current: float | None, observed: float) -> float:
+        if current is None:
+            return observed
+        return (1 - self.smoothing) * current + self.smoothing * observed
+
+    def _set_chunk_size(self, chunk_size: int):
+        """
+        Set the chunk size and count the adjustment. Must be called with the lock held.
+        """
+        stats = self._stats
+        if chunk_size > stats.chunk_size:
+            stats.chunk_size_increases += 1
+        elif chunk_size < stats.chunk_size:
+            stats.chunk_size_decreases += 1
+        else:
+            return
+        logger.debug(f"Adjusting chunk size from {stats.chunk_size} to {chunk_size}")
+        stats.chunk_size = chunk_size
+
+    def record_success(self, number_of_values: int, latency: float, query_bytes: int):
+        """
+        Record a successfully queried chunk and retune the chunk size
+        :param number_of_values: number of values of the chunk
+        :param latency: duration of the query in seconds
+        :param query_bytes: size of the query
+        :return:
+        """
+        if number_of_values <= 0:
+            return
+        with self._lock:
+            stats = self._stats
+            stats.chunks += 1
+            stats.values += number_of_values
+            stats.latency_per_value = self._average(stats.latency_per_value, latency / number_of_values)
+            stats.bytes_per_value = self._average(stats.bytes_per_value, query_bytes / number_of_values)
+            ideal_size = self.target_latency / max(stats.latency_per_value, 1e-6)
+            ideal_size = min(ideal_size, self.max_query_bytes / max(stats.bytes_per_value, 1))
+            if stats.size_ceiling is not None:
+                ideal_size = min(ideal_size, stats.size_ceiling)
+                stats.size_ceiling *= self.ceiling_relaxation
+            # grow at most by factor two per chunk to approach the ideal size gradually
+            self._set_chunk_size(self._clamp(min(ideal_size, stats.chunk_size * 2)))
+            if stats.concurrency < self.max_concurrency:
+                stats.concurrency += 1
+
+    def record_timeout(self, number_of_values: int):
+        """
+        Record a timed out chunk, halve the chunk size and reduce the concurrency
+        :param number_of_values: number of values of the chunk
+        :return:
+        """
+        with self._lock:
+            stats = self._stats
+            stats.timeouts += 1
+            ceiling = number_of_values - 1
+            stats.size_ceiling = ceiling if stats.size_ceiling is None else min(stats.size_ceiling, ceiling)
+            self._set_chunk_size(self._clamp(min(stats.chunk_size, number_of_values) // 2))
+            stats.concurrency = max(1, stats.concurrency // 2)
+
+    def record_split(self):
+        """
+        Record that a timed out chunk was split for retrying
+        :return:
+        """
+        with self._lock:
+            self._stats.splits += 1
+
+    def stats(self) -> ChunkSchedulerStats:
+        """
+        Get the statistics and the current tuning of the scheduler
+        :return:
+        """
+        with self._lock:
+            return self._stats.model_copy()
+
+
+_schedulers: dict[str, AdaptiveChunkScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_chunk_scheduler(endpoint_url: HttpUrl | str) -> AdaptiveChunkScheduler:
+    """Get the long-lived chunk scheduler of the given endpoint"""
+    if isinstance(endpoint_url, HttpUrl):
+        endpoint_url = endpoint_url.unicode_string()
+    with _schedulers_lock:
+        scheduler = _schedulers.get(endpoint_url)
+        if scheduler is None:
+            scheduler = AdaptiveChunkScheduler()
+            _schedulers[endpoint_url] = scheduler
+        return scheduler
+
+
+def set_chunk_scheduler(endpoint_url: HttpUrl | str, scheduler: AdaptiveChunkScheduler):
+    """Set the chunk scheduler of the given endpoint"""
+    if isinstance(endpoint_url, HttpUrl):
+        endpoint_url = endpoint_url.unicode_string()
+    with _schedulers_lock:
+        _schedulers[endpoint_url] = scheduler
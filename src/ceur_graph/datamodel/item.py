@@ -1,6 +1,6 @@
-from typing import Annotated, Literal, Self
+from typing import Annotated, Any, ClassVar, Literal, Self
 
-from pydantic import BaseModel, Field, constr, model_validator
+from pydantic import BaseModel, ConfigDict, Field, constr, model_validator
 from pydantic.fields import FieldInfo
 from wikibaseintegrator import datatypes
 from wikibaseintegrator.wbi_enums import WikibaseSnakType
@@ -30,23 +30,73 @@ class EntityBase(BaseModel):
     description: Annotated[str, Field(json_schema_extra={CEUR_DEV_ID: "schema:description"})]
 
 
-class StatementBase(BaseModel):
+class StatementLayout(BaseModel):
+    """
+    Fields of a statement model that are mapped to the statement subject and the statement qualifiers
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    subject_field: str | None = None
+    qualifier_fields: tuple[str, ...] = ()
+
     @classmethod
-    def get_statement_subject(cls, lookup_key: str) -> str:
+    def from_model(cls, model: type[BaseModel], lookup_key: str) -> "StatementLayout":
         """
-        Each statement is expected to have one field as the statement subject.
+        Compute the statement layout of the given model
+        :param model:
+        :param lookup_key: key of the property id in the json_schema_extra of the fields
         :return:
         """
         field_name: str
         field_metadata: FieldInfo
         subject_field = None
-        for field_name, field_metadata in cls.model_fields.items():
+        qualifier_fields: list[str] = []
+        for field_name, field_metadata in model.model_fields.items():
+            if not isinstance(field_metadata.json_schema_extra, dict):
+                continue
             field_prop_id = field_metadata.json_schema_extra.get(lookup_key)
             if field_prop_id is not None:
                 id_parts = field_prop_id.split("/")
-                if len(id_parts) > 2 and id_parts[-2] == "statement":
+                if len(id_parts) > 2 and id_parts[-2] == "statement" and subject_field is None:
                     subject_field = field_name
-                    break
+                elif len(id_parts) > 2 and id_parts[-2] == "qualifier":
+                    qualifier_fields.append(field_name)
+        return cls(subject_field=subject_field, qualifier_fields=tuple(qualifier_fields))
+
+
+class StatementBase(BaseModel):
+    __statement_layouts__: ClassVar[dict[str, StatementLayout]] = {}
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+        cls.__statement_layouts__ = {CEUR_DEV_ID: StatementLayout.from_model(cls, CEUR_DEV_ID)}
+
+    @classmethod
+    def get_statement_layout(cls, lookup_key: str = CEUR_DEV_ID) -> StatementLayout:
+        """
+        Get the statement layout of this model. The layout is computed once per class and lookup key.
+        :param lookup_key:
+        :return:
+        """
+        layouts = cls.__dict__.get("__statement_layouts__")
+        if layouts is None:
+            layouts = {}
+            cls.__statement_layouts__ = layouts
+        layout = layouts.get(lookup_key)
+        if layout is None:
+            layout = StatementLayout.from_model(cls, lookup_key)
+            layouts[lookup_key] = layout
+        return layout
+
+    @classmethod
+    def get_statement_subject(cls, lookup_key: str) -> str:
+        """
+        Each statement is expected to have one field as the statement subject.
+        :return:
+        """
+        subject_field = cls.get_statement_layout(lookup_key).subject_field
         if subject_field is None:
             raise Exception(f"Model {cls.__name__} has no statement object defined for {lookup_key}")
         return subject_field
@@ -58,16 +108,7 @@ class StatementBase(BaseModel):
         :param lookup_key:
         :return:
         """
-        field_name: str
-        field_metadata: FieldInfo
-        qualifier_fields: list[str] = []
-        for field_name, field_metadata in cls.model_fields.items():
-            field_prop_id = field_metadata.json_schema_extra.get(lookup_key)
-            if field_prop_id is not None:
-                id_parts = field_prop_id.split("/")
-                if len(id_parts) > 2 and id_parts[-2] == "qualifier":
-                    qualifier_fields.append(field_name)
-        return qualifier_fields
+        return list(cls.get_statement_layout(lookup_key).qualifier_fields)
 
 
 class Statement(StatementBase):
@@ -0,0 +1,139 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from pydantic import BaseModel
+
+
+class EntityCacheEntry(BaseModel):
+    """
+    Cached entity json along with its revision
+    """
+
+    entity_json: str
+    lastrevid: int
+    validated_at: float
+
+    def get_entity_json(self) -> dict:
+        """
+        Get a fresh copy of the cached entity json
+        :return:
+        """
+        return json.loads(self.entity_json)
+
+
+class EntityCacheStats(BaseModel):
+    """
+    Counters of the entity cache
+    """
+
+    hits: int = 0
+    misses: int = 0
+    revalidations: int = 0
+    outdated: int = 0
+    evictions: int = 0
+    entries: int = 0
+
+
+class EntityCache:
+    """
+    In-process LRU cache of entity json keyed by the entity URI.
+    Entries store the lastrevid of the entity so that they can be revalidated against the current revision.
+    """
+
+    def __init__(self, max_entries: int = 2048, max_stale: float = 0):
+        """
+        constructor
+        :param max_entries: maximum number of cached entities
+        :param max_stale: number of seconds a validated entry is served without revalidation. 0 revalidates every hit
+        """
+        self.max_entries = max_entries
+        self.max_stale = max_stale
+        self._entries: OrderedDict[str, EntityCacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = EntityCacheStats()
+
+    def get(self, entity_uri: str) -> EntityCacheEntry | None:
+        """
+        Get the cached entry of the given entity
+        :param entity_uri:
+        :return:
+        """
+        with self._lock:
+            entry = self._entries.get(entity_uri)
+            if entry is None:
+                self._stats.misses += 1
+            else:
+                self._entries.move_to_end(entity_uri)
+            return entry
+
+    def needs_revalidation(self, entry: EntityCacheEntry) -> bool:
+        """
+        Check if the given entry has to be revalidated before it is served
+        :param entry:
+        :return:
+        """
+        return time.time() - entry.validated_at >= self.max_stale
+
+    def mark_valid(self, entity_uri: str, revalidated: bool = False):
+        """
+        Mark the entry as up to date and count the hit
+        :param entity_uri:
+        :param revalidated: True if the revision of the entry was checked against the wikibase
+        :return:
+        """
+        with self._lock:
+            self._stats.hits += 1
+            if revalidated:
+                self._stats.revalidations += 1
+                entry = self._entries.get(entity_uri)
+                if entry is not None:
+                    entry.validated_at = time.time()
+
+    def set(self, entity_uri: str, entity_json: dict):
+        """
+        Cache the given entity json
+        :param entity_uri:
+        :param entity_json: entity json as returned by wbgetentities
+        :return:
+        """
+        entry = EntityCacheEntry(
+            entity_json=json.dumps(entity_json),
+            lastrevid=int(entity_json["lastrevid"]),
+            validated_at=time.time(),
+        )
+        with self._lock:
+            self._entries[entity_uri] = entry
+            self._entries.move_to_end(entity_uri)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def evict(self, entity_uri: str, outdated: bool = False):
+        """
+        Remove the given entity from the cache
+        :param entity_uri:
+        :param outdated: True if the entry is removed because a newer revision exists
+        :return:
+        """
+        with self._lock:
+            entry = self._entries.pop(entity_uri, None)
+            if entry is not None and outdated:
+                self._stats.outdated += 1
+
+    def clear(self):
+        """
+        Remove all entries
+        :return:
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> EntityCacheStats:
+        """
+        Get the hit/miss counters of the cache
+        :return:
+        """
+        with self._lock:
+            return self._stats.model_copy(update={"entries": len(self._entries)})
@@ -0,0 +1,471 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatus(Enum):
+    """
+    Status of a background job
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class Job(BaseModel):
+    """
+    Background job
+    """
+
+    job_id: str
+    kind: str
+    username: str | None = None
+    params: dict[str, Any]
+    status: JobStatus = JobStatus.QUEUED
+    result: Any | None = None
+    error: str | None = None
+    attempts: int = 0
+    created_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
+    not_before: float = 0
+
+
+class JobDeferredError(Exception):
+    """
+    Raised by a job handler if the job can not be executed yet
+    """
+
+    def __init__(self, message: str, delay: float | None = None):
+        """
+        constructor
+        :param message: reason of the deferral
+        :param delay: seconds to wait before the job is executed again. Defaults to the deferral delay of the manager
+        """
+        super().__init__(message)
+        self.delay = delay
+
+
+class JobManagerStats(BaseModel):
+    """
+    Counters of the job manager
+    """
+
+    submitted: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    deferred: int = 0
+    queued: int = 0
+    running: int = 0
+    workers: int = 0
+
+
+class JobStore:
+    """
+    SQLite store of the background jobs.
+    Jobs that were running when the process stopped are queued again when the store is opened.
+    """
+
+    def __init__(self, path: Path | str = ":memory:"):
+        """
+        constructor
+        :param path: path of the database file. Defaults to an in-memory database
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._con = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                username TEXT,
+                params TEXT NOT NULL,
+                status TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                not_before REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS jobs_queue ON jobs(status, not_before, created_at);
+            """
+        )
+        requeued = self._con.execute(
+            "UPDATE jobs SET status = ?, started_at = NULL WHERE status = ?",
+            (JobStatus.QUEUED.value, JobStatus.RUNNING.value),
+        ).rowcount
+        if requeued:
+            logger.info(f"Queued {requeued} interrupted jobs again")
+
+    @staticmethod
+    def _to_job(row: tuple) -> Job:
+        (
+            job_id,
+            kind,
+            username,
+            params,
+            status,
+            result,
+            error,
+            attempts,
+            created_at,
+            started_at,
+            finished_at,
+            not_before,
+        ) = row
+        return Job(
+            job_id=job_id,
+            kind=kind,
+            username=username,
+            params=json.loads(params),
+            status=JobStatus(status),
+            result=json.loads(result) if result is not None else None,
+            error=error,
+            attempts=attempts,
+            created_at=created_at,
+            started_at=started_at,
+            finished_at=finished_at,
+            not_before=not_before,
+        )
+
+    def add(self, job: Job):
+        """
+        Store the given job
+        :param job:
+        :return:
+        """
+        with self._lock:
+            self._con.execute(
+                "INSERT INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job.job_id,
+                    job.kind,
+                    job.username,
+                    json.dumps(job.params),
+                    job.status.value,
+                    json.dumps(job.result) if job.result is not None else None,
+                    job.error,
+                    job.attempts,
+                    job.created_at,
+                    job.started_at,
+                    job.finished_at,
+                    job.not_before,
+                ),
+            )
+
+    def get(self, job_id: str) -> Job | None:
+        """
+        Get the job with the given id
+        :param job_id:
+        :return: job or None if the job is unknown
+        """
+        with self._lock:
+            row = self._con.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._to_job(row) if row is not None else None
+
+    def claim_next(self, kinds: list[str]) -> Job | None:
+        """
+        Mark the oldest due queued job of the given kinds as running
+        :param kinds: job kinds that can be executed
+        :return: claimed job or None if no job is due
+        """
+        if not kinds:
+            return None
+        now = time.time()
+        placeholders = ", ".join("?" for _ in kinds)
+        with self._lock:
+            self._con.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._con.execute(
+                    f"SELECT * FROM jobs WHERE status = ? AND not_before <= ? AND kind IN ({placeholders}) "
+                    "ORDER BY created_at LIMIT 1",
+                    (JobStatus.QUEUED.value, now, *kinds),
+                ).fetchone()
+                if row is not None:
+                    self._con.execute(
+                        "UPDATE jobs SET status = ?, started_at = ?, attempts = attempts + 1 WHERE job_id = ?",
+                        (JobStatus.RUNNING.value, now, row[0]),
+                    )
+            finally:
+                self._con.execute("COMMIT")
+        if row is None:
+            return None
+        job = self._to_job(row)
+        return job.model_copy(update={"status": JobStatus.RUNNING, "started_at": now, "attempts": job.attempts + 1})
+
+    def finish(self, job_id: str, result: Any | None = None, error: str | None = None):
+        """
+        Record the result or error of the given job
+        :param job_id:
+        :param result: result of a succeeded job. Must be JSON serializable
+        :param error: error message of a failed job
+        :return:
+        """
+        status = JobStatus.FAILED if error is not None else JobStatus.SUCCEEDED
+        with self._lock:
+            self._con.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE job_id = ?",
+                (status.value, json.dumps(result) if result is not None else None, error, time.time(), job_id),
+            )
+
+    def defer(self, job_id: str, not_before: float, reason: str):
+        """
+        Queue the given job again
+        :param job_id:
+        :param not_before: timestamp before which the job is not executed
+        :param reason: reason of the deferral
+        :return:
+        """
+        with self._lock:
+            self._con.execute(
+                "UPDATE jobs SET status = ?, started_at = NULL, not_before = ?, error = ? WHERE job_id = ?",
+                (JobStatus.QUEUED.value, not_before, reason, job_id),
+            )
+
+    def next_due(self) -> float | None:
+        """
+        Get the earliest execution timestamp of the queued jobs
+        :return: timestamp or None if no job is queued
+        """
+        with self._lock:
+            row = self._con.execute(
+                "SELECT MIN(not_before) FROM jobs WHERE status = ?", (JobStatus.QUEUED.value,)
+            ).fetchone()
+        return row[0]
+
+    def purge(self, older_than: float) -> int:
+        """
+        Remove the finished jobs that finished before the given timestamp
+        :param older_than:
+        :return: number of removed jobs
+        """
+        with self._lock:
+            return self._con.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+                (JobStatus.SUCCEEDED.value, JobStatus.FAILED.value, older_than),
+            ).rowcount
+
+    def count(self) -> dict[JobStatus, int]:
+        """
+        Get the number of jobs per status
+        :return:
+        """
+        with self._lock:
+            rows = self._con.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {JobStatus(status): count for status, count in rows}
+
+    def close(self):
+        self._con.close()
+
+
+class JobManager:
+    """
+    Executes the jobs of a persistent job store in a bounded pool of worker threads.
+    Each job kind has a registered handler that receives the job and returns its JSON serializable result. Handlers
+    raise JobDeferredError if the job can not be executed yet, e.g. because the session of the submitting user is gone
+    after a restart.
+    """
+
+    def __init__(
+        self,
+        store: JobStore | None = None,
+        workers: int = 2,
+        defer_delay: float = 30,
+        poll_interval: float = 5,
+        retention: float = 7 * 24 * 3600,
+    ):
+        """
+        constructor
+        :param store: store of the jobs. Defaults to an in-memory store
+        :param workers: number of jobs executed at the same time
+        :param defer_delay: seconds a deferred job waits before it is executed again
+        :param poll_interval: maximum number of seconds an idle worker waits before it checks the store again
+        :param retention: seconds finished jobs are kept in the store
+        """
+        self.store = store if store is not None else JobStore()
+        self.workers = workers
+        self.defer_delay = defer_delay
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self._handlers: dict[str, Callable[[Job], Any]] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._stop_event: threading.Event | None = None
+        self._threads: list[threading.Thread] = []
+        self._stats = JobManagerStats()
+
+    def register(self, kind: str, handler: Callable[[Job], Any]):
+        """
+        Register the handler of the given job kind
+        :param kind:
+        :param handler: executes the job and returns its JSON serializable result
+        :return:
+        """
+        with self._lock:
+            self._handlers[kind] = handler
+
+    def submit(self, kind: str, params: dict[str, Any], username: str | None = None) -> Job:
+        """
+        Queue a new job
+        :param kind: kind of the job. A handler must be registered for the kind
+        :param params: JSON serializable parameters of the job
+        :param username: name of the user who submitted the job
+        :return: queued job
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for jobs of kind {kind}")
+        job = Job(job_id=uuid.uuid4().hex, kind=kind, username=username, params=params, created_at=time.time())
+        self.store.add(job)
+        with self._wakeup:
+            self._stats.submitted += 1
+            self._wakeup.notify()
+        return job
+
+    def get_job(self, job_id: str) -> Job | None:
+        """
+        Get the job with the given id
+        :param job_id:
+        :return: job or None if the job is unknown or purged
+        """
+        return self.store.get(job_id)
+
+    def run_next(self) -> Job | None:
+        """
+        Execute the oldest due job in the calling thread
+        :return: executed job or None if no job is due
+        """
+        with self._lock:
+            handlers = dict(self._handlers)
+        job = self.store.claim_next(list(handlers))
+        if job is None:
+            return None
+        logger.debug(f"Executing {job.kind} job {job.job_id} (attempt {job.attempts})")
+        try:
+            result = handlers[job.kind](job)
+        except JobDeferredError as e:
+            delay = e.delay if e.delay is not None else self.defer_delay
+            self.store.defer(job.job_id, time.time() + delay, str(e))
+            with self._lock:
+                self._stats.deferred += 1
+            logger.info(f"Deferred {job.kind} job {job.job_id} by {delay}s: {e}")
+        except Exception as e:
+            logger.error(f"{job.kind} job {job.job_id} failed: {e}")
+            self.store.finish(job.job_id, error=str(e))
+            with self._lock:
+                self._stats.failed += 1
+        else:
+            self.store.finish(job.job_id, result=result)
+            with self._lock:
+                self._stats.succeeded += 1
+        return self.store.get(job.job_id)
+
+    def _wait_for_jobs(self, stop_event: threading.Event):
+        next_due = self.store.next_due()
+        timeout = self.poll_interval
+        if next_due is not None:
+            timeout = min(timeout, max(next_due - time.time(), 0))
+        with self._wakeup:
+            if not stop_event.is_set() and timeout > 0:
+                self._wakeup.wait(timeout)
+
+    def start(self):
+        """
+        Start the worker threads. Until then submitted jobs are only queued
+        :return:
+        """
+        with self._lock:
+            if self._stop_event is not None:
+                return
+            stop_event = threading.Event()
+            self._stop_event = stop_event
+        purged = self.store.purge(time.time() - self.retention)
+        if purged:
+            logger.debug(f"Purged {purged} finished jobs")
+
+        def run():
+            while not stop_event.is_set():
+                try:
+                    job = self.run_next()
+                except Exception as e:
+                    logger.error(f"Job worker failed: {e}")
+                    job = None
+                if job is None:
+                    self._wait_for_jobs(stop_event)
+
+        threads = [threading.Thread(target=run, name=f"job-worker-{i}", daemon=True) for i in range(self.workers)]
+        with self._lock:
+            self._threads = threads
+        for thread in threads:
+            thread.start()
+
+    def stop(self, timeout: float | None = None):
+        """
+        Stop the worker threads after their current job
+        :param timeout: seconds to wait for each worker thread
+        :return:
+        """
+        with self._wakeup:
+            if self._stop_event is None:
+                return
+            self._stop_event.set()
+            self._stop_event = None
+            threads = self._threads
+            self._threads = []
+            self._wakeup.notify_all()
+        for thread in threads:
+            thread.join(timeout)
+
+    def stats(self) -> JobManagerStats:
+        """
+        Get the counters and the number of queued and running jobs
+        :return:
+        """
+        counts = self.store.count()
+        with self._lock:
+            return self._stats.model_copy(
+                update={
+                    "queued": counts.get(JobStatus.QUEUED, 0),
+                    "running": counts.get(JobStatus.RUNNING, 0),
+                    "workers": len(self._threads),
+                }
+            )
+
+
+_job_manager: JobManager | None = None
+_job_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """Get the process wide job manager"""
+    global _job_manager
+    with _job_manager_lock:
+        if _job_manager is None:
+            _job_manager = JobManager()
+        return _job_manager
+
+
+def set_job_manager(job_manager: JobManager | None):
+    """Set the process wide job manager. None resets the manager"""
+    global _job_manager
+    with _job_manager_lock:
+        if _job_manager is not None and _job_manager is not job_manager:
+            _job_manager.stop()
+        _job_manager = job_manager
@@ -1,9 +1,12 @@
 import logging
+from contextlib import asynccontextmanager
+from pathlib import Path
 from typing import Annotated
 
 import uvicorn
 from fastapi import Depends, FastAPI
 from fastapi.security import OAuth2PasswordRequestForm
+from wikibaseintegrator import wbi_helpers
 
 from ceur_graph.api import (
     ceurws,
@@ -18,10 +21,106 @@ from ceur_graph.api import (
     wd_migrate,
 )
 from ceur_graph.api.auth import login_user
+from ceur_graph.api.concurrency import IMPORT_ROUTES, route_limits
+from ceur_graph.api.sessions import get_session_manager
+from ceur_graph.ceur_dev import CeurDev, set_ceur_dev
+from ceur_graph.jobs import JobManager, JobStore, set_job_manager
+from ceur_graph.migration import get_migrator_pool
+from ceur_graph.mirror import MirrorSettings, MirrorStore, WikibaseMirror
+from ceur_graph.term_store import TermDictionary, TermDictionarySettings, TermStore
+from ceur_graph.wikibase import (
+    close_sparql_client,
+    get_sparql_client,
+    remove_mirror,
+    remove_term_dictionary,
+    set_mirror,
+    set_term_dictionary,
+)
 
 logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+JOB_STORE_PATH = Path.home().joinpath(".ceur-graph", "jobs.sqlite")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create the shared anonymous CeurDev instance, load the migration profile and start the background job workers at
+    startup and release the connection pools and background threads on shutdown.
+    If enabled in the TermDictionarySettings and MirrorSettings the term dictionary and the local mirror of ceur-dev
+    are registered and synchronized in the background.
+    """
+    ceur_dev = CeurDev()
+    ceur_dev.login()
+    set_ceur_dev(ceur_dev)
+    get_sparql_client()
+    get_migrator_pool().profile_cache.get()
+    JOB_STORE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    job_manager = JobManager(JobStore(JOB_STORE_PATH), workers=route_limits[IMPORT_ROUTES])
+    job_manager.register(wd_migrate.WD_IMPORT_JOB, wd_migrate.run_import_job)
+    set_job_manager(job_manager)
+    job_manager.start()
+    term_dictionary = start_term_dictionary(ceur_dev, TermDictionarySettings())
+    mirror = start_mirror(ceur_dev, MirrorSettings())
+    yield
+    if mirror is not None:
+        mirror.stop_periodic_sync()
+        remove_mirror(ceur_dev.mediawiki_api_url)
+        mirror.store.close()
+    if term_dictionary is not None:
+        term_dictionary.stop_periodic_sync()
+        remove_term_dictionary(ceur_dev.mediawiki_api_url)
+        term_dictionary.store.close()
+    set_job_manager(None)
+    job_manager.store.close()
+    get_session_manager().stop_maintenance()
+    close_sparql_client()
+    wbi_helpers.default_session.close()
+    set_ceur_dev(None)
+
+
+def start_term_dictionary(ceur_dev: CeurDev, settings: TermDictionarySettings) -> TermDictionary | None:
+    """
+    Register the term dictionary of the given instance and start its background synchronization
+    :param ceur_dev:
+    :param settings:
+    :return: the registered term dictionary or None if it is disabled
+    """
+    if not settings.enabled:
+        return None
+    settings.path.parent.mkdir(parents=True, exist_ok=True)
+    term_dictionary = TermDictionary(ceur_dev, TermStore(settings.path))
+    if settings.preload_property_types:
+        try:
+            # the first synchronization clears the store, so it has to run before the preload
+            term_dictionary.sync()
+            term_dictionary.preload_property_types()
+        except Exception as e:
+            logger.warning(f"Failed to preload the property types of {term_dictionary.mediawiki_api_url}: {e}")
+    set_term_dictionary(term_dictionary)
+    term_dictionary.start_periodic_sync(settings.sync_interval)
+    return term_dictionary
+
+
+def start_mirror(ceur_dev: CeurDev, settings: MirrorSettings) -> WikibaseMirror | None:
+    """
+    Register the local mirror of the given instance and start its background synchronization.
+    Item reads fall back to the wikibase until the first synchronization is completed.
+    :param ceur_dev:
+    :param settings:
+    :return: the registered mirror or None if it is disabled
+    """
+    if not settings.enabled:
+        return None
+    settings.path.parent.mkdir(parents=True, exist_ok=True)
+    mirror = WikibaseMirror(ceur_dev, MirrorStore(settings.path), max_staleness=settings.max_staleness)
+    set_mirror(mirror)
+    mirror.start_periodic_sync(settings.sync_interval)
+    return mirror
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 app.include_router(papers.router)
 app.include_router(paper_authors.router)
 app.include_router(paper_subject.router)
@@ -0,0 +1,340 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from importlib.resources import as_file, files
+from importlib.resources.abc import Traversable
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel
+from wikibaseintegrator import WikibaseIntegrator
+from wikibasemigrator.mapper import WikibaseItemMapper
+from wikibasemigrator.migrator import WikibaseMigrator
+from wikibasemigrator.model.profile import UserToken, WikibaseConfig, WikibaseMigrationProfile, load_profile
+
+from ceur_graph.datamodel.auth import WikibaseAuthorizationConfig, WikibaseLoginTypes
+
+if TYPE_CHECKING:
+    from ceur_graph.wikibase import Wikibase
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIGRATION_PROFILE = "wd_to_ceur-dev.yaml"
+
+
+def get_migration_profile_resource(name: str = DEFAULT_MIGRATION_PROFILE) -> Traversable:
+    """
+    Get the packaged migration profile with the given name
+    :param name: file name of the profile
+    :return:
+    """
+    return files("ceur_graph").joinpath("resources", "migration_profiles", name)
+
+
+class MigrationStats(BaseModel):
+    """
+    Counters of the migrator pool
+    """
+
+    profile_loads: int = 0
+    profile_generation: int = 0
+    migrators_created: int = 0
+    migrators_reused: int = 0
+    migrators: int = 0
+    mappings: int = 0
+
+
+class ProfileCache:
+    """
+    Parsed migration profile that is loaded once and reloaded when the profile file changes
+    """
+
+    def __init__(self, resource: Traversable | None = None, check_interval: float = 5):
+        """
+        constructor
+        :param resource: profile resource. Defaults to the packaged Wikidata → ceur-dev profile
+        :param check_interval: minimal number of seconds between two checks for modifications of the profile file
+        """
+        self.resource = resource if resource is not None else get_migration_profile_resource()
+        self.check_interval = check_interval
+        self.generation = 0
+        self.loads = 0
+        self._lock = threading.Lock()
+        self._profile: WikibaseMigrationProfile | None = None
+        self._mtime: float | None = None
+        self._checked_at = 0.0
+
+    def _get_mtime(self) -> float | None:
+        """
+        Get the modification time of the profile file. Resources that are not plain files, e.g. inside a zip archive,
+        can not change and have no modification time.
+        """
+        if isinstance(self.resource, Path):
+            return self.resource.stat().st_mtime
+        return None
+
+    def get(self) -> WikibaseMigrationProfile:
+        """
+        Get the profile. The returned profile is shared and must not be modified
+        :return:
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._profile is not None and now - self._checked_at < self.check_interval:
+                return self._profile
+            self._checked_at = now
+            mtime = self._get_mtime()
+            if self._profile is None or mtime != self._mtime:
+                with as_file(self.resource) as path:
+                    self._profile = load_profile(path)
+                self._mtime = mtime
+                self.generation += 1
+                self.loads += 1
+                logger.info(f"Loaded migration profile {self._profile.name} (generation {self.generation})")
+            return self._profile
+
+
+def get_user_profile(
+    profile: WikibaseMigrationProfile, auth_config: WikibaseAuthorizationConfig
+) -> WikibaseMigrationProfile:
+    """
+    Get an overlay of the given profile with the credentials of the given user.
+    Only the target configuration is copied, all other parts are shared with the given profile.
+    :param profile: shared profile
+    :param auth_config: authorization of the user
+    :return: profile of the user
+    """
+    user_profile = profile.model_copy(update={"target": profile.target.model_copy()})
+    update_migration_profile(auth_config, user_profile)
+    return user_profile
+
+
+def update_migration_profile(auth_config: WikibaseAuthorizationConfig, profile: WikibaseMigrationProfile):
+    """
+    Update the authentication information of the migration profile
+    :param auth_config: wikibase auth config to use for updating the migration profile target
+    :param profile: migration profile to update
+    :return:
+    """
+    match auth_config.auth_type:
+        case WikibaseLoginTypes.NONE:
+            pass
+        case WikibaseLoginTypes.USER:
+            profile.target.user = auth_config.user
+            profile.target.password = auth_config.password
+        case WikibaseLoginTypes.BOT:
+            profile.target.user = auth_config.user
+            profile.target.bot_password = auth_config.password
+        case WikibaseLoginTypes.OAUTH1:
+            profile.target.consumer_key = auth_config.consumer_token
+            profile.target.consumer_secret = auth_config.consumer_secret
+            profile.target.user_token = UserToken(
+                oauth_token=auth_config.access_token, oauth_token_secret=auth_config.access_secret
+            )
+        case WikibaseLoginTypes.OAUTH2:
+            logger.info("OAuth2 is currently not supported by wikibase migrator")
+        case _:
+            raise Exception(f"Unknown auth_type {auth_config.auth_type}")
+
+
+class SharedItemMapper(WikibaseItemMapper):
+    """
+    Thread safe item and property mapper that is shared by all migrators of a profile so that the mappings are cached
+    across imports.
+    Missing mappings are queried again after missing_ttl seconds as the mapped entities might have been created since.
+    """
+
+    _raw_mappings: set[tuple[str, str]]
+
+    def __init__(self, profile: WikibaseMigrationProfile, missing_ttl: float = 600):
+        """
+        constructor
+        :param profile: migration profile with the mapping queries
+        :param missing_ttl: seconds a missing mapping is cached
+        """
+        super().__init__(profile)
+        self.missing_ttl = missing_ttl
+        self._lock = threading.RLock()
+        self._missing_since: dict[str, float] = {}
+
+    def _expire_missing(self, ids: Iterable[str]):
+        now = time.monotonic()
+        for id_value in ids:
+            if self.mappings.get(id_value, "") is None:
+                cached_at = self._missing_since.setdefault(id_value, now)
+                if now - cached_at > self.missing_ttl:
+                    del self.mappings[id_value]
+                    del self._missing_since[id_value]
+
+    def prepare_cache_for(self, items: list[str]):
+        with self._lock:
+            self._expire_missing(items)
+            super().prepare_cache_for(items)
+
+    def query_mappings_for(self, ids: list[str]):
+        with self._lock:
+            super().query_mappings_for(ids)
+            now = time.monotonic()
+            for id_value in ids:
+                if self.mappings.get(id_value) is None:
+                    self._missing_since[id_value] = now
+
+    def get_mapping_for(self, item: str) -> str | None:
+        with self._lock:
+            self._expire_missing([item])
+            return super().get_mapping_for(item)
+
+    def get_existing_mappings(self) -> dict[str, str]:
+        with self._lock:
+            return super().get_existing_mappings()
+
+    def add_mappings(self, mappings: dict[str, str]):
+        """
+        Add the mappings of newly migrated entities
+        :param mappings: target entity id by source entity id
+        :return:
+        """
+        with self._lock:
+            for source, target in mappings.items():
+                self._raw_mappings.add((source, target))
+                self.mappings[source] = target
+                self._missing_since.pop(source, None)
+
+    def invalidate(self, ids: Iterable[str]):
+        """
+        Remove the cached mappings of the given entities so that they are queried again
+        :param ids: source entity ids
+        :return:
+        """
+        ids = set(ids)
+        with self._lock:
+            for id_value in ids:
+                self.mappings.pop(id_value, None)
+                self._missing_since.pop(id_value, None)
+            self._raw_mappings = {mapping for mapping in self._raw_mappings if mapping[0] not in ids}
+
+
+class SessionMigrator(WikibaseMigrator):
+    """
+    Migrator writing with the logged in session of a wikibase instance instead of logging in for each migration
+    """
+
+    def __init__(self, profile: WikibaseMigrationProfile, mapper: WikibaseItemMapper, wikibase: "Wikibase"):
+        """
+        constructor
+        :param profile: profile with the credentials of the user
+        :param mapper: shared mapper of the profile
+        :param wikibase: logged in target wikibase instance
+        """
+        super().__init__(profile)
+        self.mapper = mapper
+        self.wikibase = wikibase
+
+    @property
+    def target_wbi(self) -> WikibaseIntegrator:
+        return self.wikibase.wbi
+
+    def get_wikibase_login(self, wikibase_config: WikibaseConfig):
+        if wikibase_config is self.profile.target:
+            return self.wikibase.login()
+        return WikibaseMigrator.get_wikibase_login(wikibase_config)
+
+
+class MigratorPool:
+    """
+    Pool of migrators per authenticated user.
+    All migrators share the cached profile and its item mapper. The pooled migrator of a user is replaced when the
+    profile is reloaded or the user logged in again.
+    """
+
+    def __init__(self, profile_cache: ProfileCache | None = None, max_migrators: int = 100, missing_ttl: float = 600):
+        """
+        constructor
+        :param profile_cache: cache of the migration profile. Defaults to the packaged Wikidata → ceur-dev profile
+        :param max_migrators: maximum number of pooled migrators. The least recently used migrator is dropped first
+        :param missing_ttl: seconds a missing mapping is cached
+        """
+        self.profile_cache = profile_cache if profile_cache is not None else ProfileCache()
+        self.max_migrators = max_migrators
+        self.missing_ttl = missing_ttl
+        self._lock = threading.Lock()
+        self._mapper: SharedItemMapper | None = None
+        self._mapper_generation = 0
+        self._migrators: OrderedDict[str, tuple[int, SessionMigrator]] = OrderedDict()
+        self._stats = MigrationStats()
+
+    def get_mapper(self) -> SharedItemMapper:
+        """
+        Get the shared mapper of the current profile
+        :return:
+        """
+        profile = self.profile_cache.get()
+        with self._lock:
+            if self._mapper is None or self._mapper_generation != self.profile_cache.generation:
+                self._mapper = SharedItemMapper(profile, missing_ttl=self.missing_ttl)
+                self._mapper_generation = self.profile_cache.generation
+            return self._mapper
+
+    def get_migrator(self, username: str, wikibase: "Wikibase") -> SessionMigrator:
+        """
+        Get the migrator of the given user
+        :param username: name of the user
+        :param wikibase: logged in wikibase instance of the user
+        :return:
+        """
+        if wikibase.auth_config is None:
+            raise ValueError("Authentication configuration not provided. Please ensure that you are logged in")
+        mapper = self.get_mapper()
+        generation = self.profile_cache.generation
+        with self._lock:
+            entry = self._migrators.get(username)
+            if entry is not None and entry[0] == generation and entry[1].wikibase is wikibase:
+                self._migrators.move_to_end(username)
+                self._stats.migrators_reused += 1
+                return entry[1]
+        profile = get_user_profile(self.profile_cache.get(), wikibase.auth_config)
+        migrator = SessionMigrator(profile, mapper, wikibase)
+        with self._lock:
+            self._migrators[username] = (generation, migrator)
+            self._migrators.move_to_end(username)
+            while len(self._migrators) > self.max_migrators:
+                self._migrators.popitem(last=False)
+            self._stats.migrators_created += 1
+        return migrator
+
+    def stats(self) -> MigrationStats:
+        """
+        Get the counters and the size of the pool
+        :return:
+        """
+        with self._lock:
+            return self._stats.model_copy(
+                update={
+                    "profile_loads": self.profile_cache.loads,
+                    "profile_generation": self.profile_cache.generation,
+                    "migrators": len(self._migrators),
+                    "mappings": len(self._mapper.mappings) if self._mapper is not None else 0,
+                }
+            )
+
+
+_migrator_pool: MigratorPool | None = None
+_migrator_pool_lock = threading.Lock()
+
+
+def get_migrator_pool() -> MigratorPool:
+    """Get the process wide migrator pool"""
+    global _migrator_pool
+    with _migrator_pool_lock:
+        if _migrator_pool is None:
+            _migrator_pool = MigratorPool()
+        return _migrator_pool
+
+
+def set_migrator_pool(migrator_pool: MigratorPool | None):
+    """Set the process wide migrator pool. None resets the pool"""
+    global _migrator_pool
+    with _migrator_pool_lock:
+        _migrator_pool = migrator_pool
@@ -0,0 +1,444 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+if TYPE_CHECKING:
+    from ceur_graph.wikibase import Wikibase
+
+logger = logging.getLogger(__name__)
+
+SYNC_EPOCH = datetime(2000, 1, 1, tzinfo=UTC)
+
+
+def get_snak_key(snak_json: dict) -> str:
+    """
+    Get a string representation of the value of the given snak json that can be compared with plain values
+    e.g. the entity id for items or the text of monolingual texts
+    :param snak_json:
+    :return:
+    """
+    if snak_json.get("snaktype") != "value":
+        return snak_json.get("snaktype", "")
+    datavalue = snak_json.get("datavalue", {})
+    value = datavalue.get("value")
+    match datavalue.get("type"):
+        case "wikibase-entityid":
+            return value["id"]
+        case "string":
+            return value
+        case "monolingualtext":
+            return value["text"]
+        case "quantity":
+            return value["amount"].lstrip("+")
+        case "time":
+            return value["time"]
+        case "globecoordinate":
+            return f"{value['latitude']},{value['longitude']}"
+        case _:
+            return json.dumps(value, sort_keys=True)
+
+
+class MirrorSettings(BaseSettings):
+    """
+    Settings of the local mirror of the API.
+    Can be set with environment variables prefixed with CEUR_GRAPH_MIRROR_, e.g. CEUR_GRAPH_MIRROR_ENABLED=true
+    """
+
+    model_config = SettingsConfigDict(env_prefix="CEUR_GRAPH_MIRROR_")
+
+    enabled: bool = False
+    path: Path = Path.home().joinpath(".ceur-graph", "mirror.sqlite")
+    max_staleness: float = 600
+    sync_interval: float = 60
+
+
+class MirrorSyncResult(BaseModel):
+    """
+    Result of a mirror synchronization
+    """
+
+    updated: int = 0
+    deleted: int = 0
+    watermark: datetime
+    duration: float = 0
+
+
+class MirrorStore:
+    """
+    SQLite store of entity json and the claims and qualifiers derived from it
+    """
+
+    def __init__(self, path: Path | str = ":memory:"):
+        """
+        constructor
+        :param path: path of the database file. Defaults to an in-memory database
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._con = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS entities (
+                entity_id TEXT PRIMARY KEY,
+                lastrevid INTEGER NOT NULL,
+                entity_json TEXT NOT NULL,
+                synced_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS claims (
+                entity_id TEXT NOT NULL,
+                statement_id TEXT NOT NULL,
+                property TEXT NOT NULL,
+                value TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS claims_value ON claims(property, value);
+            CREATE INDEX IF NOT EXISTS claims_entity ON claims(entity_id);
+            CREATE TABLE IF NOT EXISTS qualifiers (
+                entity_id TEXT NOT NULL,
+                statement_id TEXT NOT NULL,
+                property TEXT NOT NULL,
+                value TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS qualifiers_statement ON qualifiers(statement_id);
+            CREATE INDEX IF NOT EXISTS qualifiers_entity ON qualifiers(entity_id);
+            CREATE TABLE IF NOT EXISTS pending_entities (entity_id TEXT PRIMARY KEY, version INTEGER NOT NULL);
+            CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            """
+        )
+        pending_columns = [row[1] for row in self._con.execute("PRAGMA table_info(pending_entities)").fetchall()]
+        if "version" not in pending_columns:
+            # store created before the pending entities were versioned
+            self._con.execute("ALTER TABLE pending_entities ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+
+    def upsert_entities(self, entities: Iterable[dict]):
+        """
+        Store the given entities and replace their derived claims
+        :param entities: entity json as returned by wbgetentities
+        :return:
+        """
+        with self._lock:
+            self._con.execute("BEGIN")
+            try:
+                for entity_json in entities:
+                    self._upsert_entity(entity_json)
+                self._con.execute("COMMIT")
+            except Exception:
+                self._con.execute("ROLLBACK")
+                raise
+
+    def _upsert_entity(self, entity_json: dict):
+        entity_id = entity_json["id"]
+        self._delete_entity(entity_id)
+        self._con.execute(
+            "INSERT INTO entities VALUES (?, ?, ?, ?)",
+            (entity_id, int(entity_json.get("lastrevid", 0)), json.dumps(entity_json), time.time()),
+        )
+        claim_rows = []
+        qualifier_rows = []
+        for prop_nr, claims in entity_json.get("claims", {}).items():
+            for claim in claims:
+                statement_id = claim.get("id", "")
+                claim_rows.append((entity_id, statement_id, prop_nr, get_snak_key(claim["mainsnak"])))
+                for qualifier_prop_nr, snaks in claim.get("qualifiers", {}).items():
+                    for snak in snaks:
+                        qualifier_rows.append((entity_id, statement_id, qualifier_prop_nr, get_snak_key(snak)))
+        self._con.executemany("INSERT INTO claims VALUES (?, ?, ?, ?)", claim_rows)
+        self._con.executemany("INSERT INTO qualifiers VALUES (?, ?, ?, ?)", qualifier_rows)
+
+    def delete_entities(self, entity_ids: Iterable[str]):
+        """
+        Remove the given entities from the store
+        :param entity_ids:
+        :return:
+        """
+        with self._lock:
+            for entity_id in entity_ids:
+                self._delete_entity(entity_id)
+
+    def _delete_entity(self, entity_id: str):
+        for table in ("entities", "claims", "qualifiers"):
+            self._con.execute(f"DELETE FROM {table} WHERE entity_id = ?", (entity_id,))
+
+    def get_entity_json(self, entity_id: str) -> dict | None:
+        """
+        Get the stored json of the given entity
+        :param entity_id:
+        :return: entity json or None if the entity is not stored
+        """
+        with self._lock:
+            row = self._con.execute("SELECT entity_json FROM entities WHERE entity_id = ?", (entity_id,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def find_entities(self, prop_nr: str, value: str, qualifier: tuple[str, str] | None = None) -> list[str]:
+        """
+        Find the entities having a claim with the given property and value
+        :param prop_nr: property of the claim
+        :param value: value of the claim. Items are compared by their id
+        :param qualifier: property and value of a qualifier the claim must have
+        :return: ids of the matching entities
+        """
+        if qualifier is None:
+            query = "SELECT DISTINCT entity_id FROM claims WHERE property = ? AND value = ? ORDER BY entity_id"
+            params: tuple = (prop_nr, value)
+        else:
+            query = """
+                SELECT DISTINCT c.entity_id FROM claims c
+                JOIN qualifiers q ON q.entity_id = c.entity_id AND q.statement_id = c.statement_id
+                WHERE c.property = ? AND c.value = ? AND q.property = ? AND q.value = ?
+                ORDER BY c.entity_id
+            """
+            params = (prop_nr, value, *qualifier)
+        with self._lock:
+            return [row[0] for row in self._con.execute(query, params).fetchall()]
+
+    def add_pending(self, entity_ids: Iterable[str]):
+        """
+        Mark the given entities as modified so that they are refreshed by the next synchronization.
+        Each mark gets a new version so that a synchronization running concurrently does not remove it.
+        :param entity_ids:
+        :return:
+        """
+        with self._lock:
+            self._con.executemany(
+                """
+                INSERT INTO pending_entities
+                VALUES (?, (SELECT COALESCE(MAX(version), 0) + 1 FROM pending_entities))
+                ON CONFLICT(entity_id) DO UPDATE SET version = excluded.version
+                """,
+                [(entity_id,) for entity_id in entity_ids],
+            )
+
+    def get_pending(self) -> dict[str, int]:
+        """
+        Get the entities marked as modified
+        :return: version of the mark by entity id
+        """
+        with self._lock:
+            return dict(self._con.execute("SELECT entity_id, version FROM pending_entities").fetchall())
+
+    def is_pending(self, entity_id: str) -> bool:
+        """
+        Check if the given entity is marked as modified
+        :param entity_id:
+        :return:
+        """
+        with self._lock:
+            row = self._con.execute("SELECT 1 FROM pending_entities WHERE entity_id = ?", (entity_id,)).fetchone()
+        return row is not None
+
+    def remove_pending(self, pending: dict[str, int]):
+        """
+        Unmark the given entities as modified. Entities marked again since the given versions stay marked
+        :param pending: version of the mark by entity id as returned by get_pending
+        :return:
+        """
+        with self._lock:
+            self._con.executemany(
+                "DELETE FROM pending_entities WHERE entity_id = ? AND version <= ?", list(pending.items())
+            )
+
+    def get_state(self, key: str) -> str | None:
+        """
+        Get the sync state value of the given key
+        :param key:
+        :return:
+        """
+        with self._lock:
+            row = self._con.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row is not None else None
+
+    def set_state(self, key: str, value: str):
+        """
+        Set the sync state value of the given key
+        :param key:
+        :param value:
+        :return:
+        """
+        with self._lock:
+            self._con.execute("INSERT OR REPLACE INTO sync_state VALUES (?, ?)", (key, value))
+
+    def count_entities(self) -> int:
+        """
+        Get the number of stored entities
+        :return:
+        """
+        with self._lock:
+            return self._con.execute("SELECT COUNT(*) FROM entities").fetchone()[0]
+
+    def close(self):
+        self._con.close()
+
+
+class WikibaseMirror:
+    """
+    Local mirror of the items of a wikibase instance.
+    The mirror is refreshed incrementally with the items reported as modified by the query service and answers reads
+    only while the last synchronization is within the staleness bound. It serves the item reads of Wikibase.get_item,
+    the volume lookups of the ceur-ws routes are served by the VolumeIndex.
+    """
+
+    WATERMARK_KEY = "watermark"
+    LAST_SYNC_KEY = "last_sync"
+
+    def __init__(
+        self,
+        wikibase: "Wikibase",
+        store: MirrorStore | None = None,
+        max_staleness: float = 600,
+        sync_overlap: timedelta = timedelta(minutes=10),
+    ):
+        """
+        constructor
+        :param wikibase: wikibase to mirror
+        :param store: store of the mirrored entities. Defaults to an in-memory store
+        :param max_staleness: number of seconds since the last synchronization during which the mirror answers reads
+        :param sync_overlap: overlap of the synchronized modification range to account for the query service lag
+        """
+        self.wikibase = wikibase
+        self.store = store if store is not None else MirrorStore()
+        self.max_staleness = max_staleness
+        self.sync_overlap = sync_overlap
+        self._sync_lock = threading.Lock()
+        self._stop_event: threading.Event | None = None
+
+    @property
+    def mediawiki_api_url(self) -> str:
+        return self.wikibase.mediawiki_api_url.unicode_string()
+
+    def get_watermark(self) -> datetime | None:
+        """
+        Get the end of the last synchronized modification range
+        :return:
+        """
+        watermark = self.store.get_state(self.WATERMARK_KEY)
+        return datetime.fromisoformat(watermark) if watermark is not None else None
+
+    def get_last_sync(self) -> float | None:
+        """
+        Get the timestamp of the last successful synchronization
+        :return:
+        """
+        last_sync = self.store.get_state(self.LAST_SYNC_KEY)
+        return float(last_sync) if last_sync is not None else None
+
+    def is_fresh(self) -> bool:
+        """
+        Check if the mirror can answer reads. This is the case if the last synchronization is within the staleness
+        bound. Entities written since the last synchronization are not answered from the mirror until they are
+        refreshed.
+        :return:
+        """
+        last_sync = self.get_last_sync()
+        return last_sync is not None and time.time() - last_sync <= self.max_staleness
+
+    def get_entity_json(self, entity_id: str) -> dict | None:
+        """
+        Get the mirrored json of the given entity
+        :param entity_id:
+        :return: entity json or None if the mirror is stale, the entity was written since the last synchronization or
+        the mirror does not contain the entity
+        """
+        if not self.is_fresh() or self.store.is_pending(entity_id):
+            return None
+        return self.store.get_entity_json(entity_id)
+
+    def find_entities(self, prop_nr: str, value: str, qualifier: tuple[str, str] | None = None) -> list[str] | None:
+        """
+        Find the entities having a claim with the given property and value
+        :param prop_nr:
+        :param value:
+        :param qualifier: property and value of a qualifier the claim must have
+        :return: ids of the matching entities or None if the mirror is stale or entities written since the last
+        synchronization might change the result
+        """
+        if not self.is_fresh() or self.store.get_pending():
+            return None
+        return self.store.find_entities(prop_nr, value, qualifier)
+
+    def mark_modified(self, entity_id: str | None):
+        """
+        Mark the given entity as modified e.g. after it was written
+        :param entity_id:
+        :return:
+        """
+        if entity_id is not None:
+            self.store.add_pending([self.wikibase.get_entity_id(entity_id)])
+
+    def sync(self, until: datetime | None = None) -> MirrorSyncResult:
+        """
+        Refresh all items modified since the last synchronization and the items marked as modified
+        :param until: end of the modification range. Defaults to now
+        :return:
+        """
+        with self._sync_lock:
+            start_time = time.time()
+            if until is None:
+                until = datetime.now(UTC)
+            watermark = self.get_watermark()
+            start = watermark - self.sync_overlap if watermark is not None else SYNC_EPOCH
+            pending = self.store.get_pending()
+            modified_ids = {
+                self.wikibase.get_entity_id(uri) for uri in self.wikibase.get_items_modified_at(start, until)
+            }
+            entity_ids = sorted(modified_ids.union(pending.keys()))
+            entities = self.wikibase.get_entities_json(entity_ids)
+            updated = [
+                entity_json
+                for entity_id in entity_ids
+                if (entity_json := entities.get(entity_id)) is not None and "missing" not in entity_json
+            ]
+            updated_ids = {entity_json["id"] for entity_json in updated}
+            deleted = [entity_id for entity_id in entity_ids if entity_id not in updated_ids]
+            self.store.upsert_entities(updated)
+            self.store.delete_entities(deleted)
+            self.store.remove_pending(pending)
+            self.store.set_state(self.WATERMARK_KEY, until.isoformat())
+            self.store.set_state(self.LAST_SYNC_KEY, str(time.time()))
+            result = MirrorSyncResult(
+                updated=len(updated),
+                deleted=len(deleted),
+                watermark=until,
+                duration=time.time() - start_time,
+            )
+            logger.info(f"Synchronized mirror of {self.mediawiki_api_url}: {result}")
+            return result
+
+    def start_periodic_sync(self, interval: float):
+        """
+        Synchronize the mirror in a background thread in the given interval
+        :param interval: seconds between two synchronizations. Should be below the staleness bound
+        :return:
+        """
+        if self._stop_event is not None:
+            return
+        stop_event = threading.Event()
+        self._stop_event = stop_event
+
+        def run():
+            while not stop_event.is_set():
+                try:
+                    self.sync()
+                except Exception as e:
+                    logger.error(f"Failed to synchronize mirror of {self.mediawiki_api_url}: {e}")
+                stop_event.wait(interval)
+
+        threading.Thread(target=run, name="wikibase-mirror-sync", daemon=True).start()
+
+    def stop_periodic_sync(self):
+        """
+        Stop the background synchronization
+        :return:
+        """
+        if self._stop_event is not None:
+            self._stop_event.set()
+            self._stop_event = None
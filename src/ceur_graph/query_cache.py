@@ -0,0 +1,378 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel, HttpUrl
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCacheStats(BaseModel):
+    """
+    Counters of a query cache
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+
+
+class CacheEntry(BaseModel):
+    """
+    Serialized query result stored in a cache backend
+    """
+
+    endpoint: str
+    value: str
+    expires_at: float
+
+    @property
+    def size(self) -> int:
+        return len(self.value)
+
+
+class QueryCacheBackend(ABC):
+    """
+    Storage backend of the query cache
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        constructor
+        :param max_bytes: memory cap of the stored results. Least recently used entries are evicted above the cap.
+        """
+        self.max_bytes = max_bytes
+        self.evictions = 0
+
+    @abstractmethod
+    def get(self, key: str) -> CacheEntry | None:
+        """
+        Get the entry of the given key and mark it as recently used
+        :param key:
+        :return:
+        """
+
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry):
+        """
+        Store the given entry
+        :param key:
+        :param entry:
+        :return:
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> int:
+        """
+        Delete the entry of the given key
+        :param key:
+        :return: number of deleted entries
+        """
+
+    @abstractmethod
+    def delete_endpoint(self, endpoint: str) -> int:
+        """
+        Delete all entries of the given endpoint
+        :param endpoint:
+        :return: number of deleted entries
+        """
+
+    @abstractmethod
+    def clear(self) -> int:
+        """
+        Delete all entries
+        :return: number of deleted entries
+        """
+
+    @abstractmethod
+    def usage(self) -> tuple[int, int]:
+        """
+        Get the number of entries and the size of all entries in bytes
+        :return:
+        """
+
+
+class MemoryCacheBackend(QueryCacheBackend):
+    """
+    In-memory LRU backend
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        super().__init__(max_bytes)
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry):
+        if entry.size > self.max_bytes:
+            logger.debug(f"Query result of size {entry.size} exceeds the cache limit → not cached")
+            return
+        with self._lock:
+            old_entry = self._entries.pop(key, None)
+            if old_entry is not None:
+                self._size -= old_entry.size
+            self._entries[key] = entry
+            self._size += entry.size
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+                self.evictions += 1
+
+    def delete(self, key: str) -> int:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return 0
+            self._size -= entry.size
+            return 1
+
+    def delete_endpoint(self, endpoint: str) -> int:
+        with self._lock:
+            keys = [key for key, entry in self._entries.items() if entry.endpoint == endpoint]
+            for key in keys:
+                self._size -= self._entries.pop(key).size
+            return len(keys)
+
+    def clear(self) -> int:
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self._size = 0
+            return count
+
+    def usage(self) -> tuple[int, int]:
+        with self._lock:
+            return len(self._entries), self._size
+
+
+class SqliteCacheBackend(QueryCacheBackend):
+    """
+    On-disk LRU backend stored in a SQLite database
+    """
+
+    def __init__(self, path: Path | str, max_bytes: int = 512 * 1024 * 1024):
+        super().__init__(max_bytes)
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._con = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.execute(
+            """
+            CREATE TABLE IF NOT EXISTS query_cache (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._con.execute("CREATE INDEX IF NOT EXISTS query_cache_accessed ON query_cache(accessed_at)")
+        self._con.execute("CREATE INDEX IF NOT EXISTS query_cache_endpoint ON query_cache(endpoint)")
+
+    def get(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            row = self._con.execute(
+                "SELECT endpoint, value, expires_at FROM query_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._con.execute("UPDATE query_cache SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        endpoint, value, expires_at = row
+        return CacheEntry(endpoint=endpoint, value=value, expires_at=expires_at)
+
+    def set(self, key: str, entry: CacheEntry):
+        if entry.size > self.max_bytes:
+            logger.debug(f"Query result of size {entry.size} exceeds the cache limit → not cached")
+            return
+        with self._lock:
+            self._con.execute(
+                "INSERT OR REPLACE INTO query_cache VALUES (?, ?, ?, ?, ?, ?)",
+                (key, entry.endpoint, entry.value, entry.size, entry.expires_at, time.time()),
+            )
+            self._evict()
+
+    def _evict(self):
+        """
+        Delete expired entries and evict least recently used entries until the size is below the cap
+        """
+        self._con.execute("DELETE FROM query_cache WHERE expires_at < ?", (time.time(),))
+        (size,) = self._con.execute("SELECT COALESCE(SUM(size), 0) FROM query_cache").fetchone()
+        if size <= self.max_bytes:
+            return
+        rows = self._con.execute("SELECT key, size FROM query_cache ORDER BY accessed_at").fetchall()
+        evict_keys = []
+        for key, entry_size in rows:
+            if size <= self.max_bytes:
+                break
+            evict_keys.append((key,))
+            size -= entry_size
+        self._con.executemany("DELETE FROM query_cache WHERE key = ?", evict_keys)
+        self.evictions += len(evict_keys)
+
+    def delete(self, key: str) -> int:
+        with self._lock:
+            return self._con.execute("DELETE FROM query_cache WHERE key = ?", (key,)).rowcount
+
+    def delete_endpoint(self, endpoint: str) -> int:
+        with self._lock:
+            return self._con.execute("DELETE FROM query_cache WHERE endpoint = ?", (endpoint,)).rowcount
+
+    def clear(self) -> int:
+        with self._lock:
+            return self._con.execute("DELETE FROM query_cache").rowcount
+
+    def usage(self) -> tuple[int, int]:
+        with self._lock:
+            count, size = self._con.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM query_cache").fetchone()
+        return count, size
+
+    def close(self):
+        self._con.close()
+
+
+class QueryCache:
+    """
+    SPARQL result cache keyed by the normalized query and the endpoint.
+    By default results are only cached if the caller opts in with a ttl. As the query service lags behind the writes,
+    results of an endpoint are not cached within the invalidation window after its results were invalidated.
+    """
+
+    def __init__(
+        self,
+        backend: QueryCacheBackend | None = None,
+        default_ttl: float = 0,
+        invalidation_window: float = 60,
+    ):
+        """
+        constructor
+        :param backend: storage backend. Defaults to an in-memory LRU backend
+        :param default_ttl: time to live of the cached results in seconds if the caller gives no ttl. 0 disables caching
+        :param invalidation_window: seconds after an invalidation in which results of the endpoint are not cached
+        """
+        if backend is None:
+            backend = MemoryCacheBackend()
+        self.backend = backend
+        self.default_ttl = default_ttl
+        self.invalidation_window = invalidation_window
+        self._invalidated_at: dict[str | None, float] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """
+        Normalize the given query by removing indentation and blank lines
+        :param query:
+        :return:
+        """
+        return "\n".join(line.strip() for line in query.splitlines() if line.strip())
+
+    @classmethod
+    def get_key(cls, query: str, endpoint_url: HttpUrl | str) -> str:
+        """
+        Get the cache key of the given query and endpoint
+        :param query:
+        :param endpoint_url:
+        :return: SHA-512 hash of the normalized query and endpoint
+        """
+        key_source = f"{endpoint_url}\n{cls.normalize_query(query)}"
+        return hashlib.sha512(key_source.encode("utf-8")).hexdigest()
+
+    def get(self, query: str, endpoint_url: HttpUrl | str) -> Any | None:
+        """
+        Get the cached result of the given query
+        :param query:
+        :param endpoint_url:
+        :return: cached result or None if the query result is not cached or expired
+        """
+        key = self.get_key(query, endpoint_url)
+        entry = self.backend.get(key)
+        if entry is not None and entry.expires_at < time.time():
+            self.backend.delete(key)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(entry.value)
+
+    def set(self, query: str, endpoint_url: HttpUrl | str, value: Any, ttl: float | None = None):
+        """
+        Cache the result of the given query
+        :param query:
+        :param endpoint_url:
+        :param value: json serializable query result
+        :param ttl: time to live in seconds. If None the default ttl is used
+        :return:
+        """
+        if ttl is None:
+            ttl = self.default_ttl
+        if ttl <= 0 or self.is_invalidated_recently(endpoint_url):
+            return
+        entry = CacheEntry(endpoint=str(endpoint_url), value=json.dumps(value), expires_at=time.time() + ttl)
+        self.backend.set(self.get_key(query, endpoint_url), entry)
+
+    def invalidate(self, query: str | None = None, endpoint_url: HttpUrl | str | None = None) -> int:
+        """
+        Invalidate cached results.
+        If a query is given only the result of this query is removed, if only the endpoint is given all results of the
+        endpoint are removed, otherwise the whole cache is cleared.
+        :param query:
+        :param endpoint_url:
+        :return: number of removed entries
+        """
+        if query is not None and endpoint_url is None:
+            raise ValueError("The endpoint is required to invalidate the result of a query")
+        self._invalidated_at[str(endpoint_url) if endpoint_url is not None else None] = time.time()
+        if query is not None:
+            count = self.backend.delete(self.get_key(query, endpoint_url))
+        elif endpoint_url is not None:
+            count = self.backend.delete_endpoint(str(endpoint_url))
+        else:
+            count = self.backend.clear()
+        self.invalidations += count
+        return count
+
+    def is_invalidated_recently(self, endpoint_url: HttpUrl | str) -> bool:
+        """
+        Check if the results of the given endpoint were invalidated within the invalidation window
+        :param endpoint_url:
+        :return:
+        """
+        invalidated_at = max(self._invalidated_at.get(str(endpoint_url), 0), self._invalidated_at.get(None, 0))
+        return time.time() - invalidated_at < self.invalidation_window
+
+    def stats(self) -> QueryCacheStats:
+        """
+        Get the hit/miss counters of the cache
+        :return:
+        """
+        entries, size = self.backend.usage()
+        return QueryCacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.backend.evictions,
+            invalidations=self.invalidations,
+            entries=entries,
+            size_bytes=size,
+        )
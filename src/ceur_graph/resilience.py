@@ -0,0 +1,492 @@
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from email.utils import parsedate_to_datetime
+from enum import Enum
+
+import httpx
+import requests
+from pydantic import BaseModel, HttpUrl
+from wikibaseintegrator.wbi_exceptions import MaxRetriesReachedException
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(Enum):
+    """
+    State of a circuit breaker
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling an endpoint while its circuit breaker is open
+    """
+
+    def __init__(self, endpoint_url: str, retry_after: float):
+        super().__init__(f"Circuit of {endpoint_url} is open. Retry in {retry_after:.1f}s")
+        self.endpoint_url = endpoint_url
+        self.retry_after = retry_after
+
+
+class CallFailure(BaseModel):
+    """
+    Classification of a failed call
+    """
+
+    retryable: bool
+    throttled: bool = False
+    retry_after: float | None = None
+    # whether the failure indicates that the endpoint is unhealthy
+    unhealthy: bool = True
+
+
+class ResilienceMetrics(BaseModel):
+    """
+    Counters of the calls to one endpoint
+    """
+
+    attempts: int = 0
+    successes: int = 0
+    failures: int = 0
+    retries: int = 0
+    throttled: int = 0
+    rate_limited: int = 0
+    rate_limit_wait: float = 0
+    backoff_wait: float = 0
+    circuit_rejections: int = 0
+    circuit_trips: int = 0
+    circuit_state: CircuitState = CircuitState.CLOSED
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. Callers reserve a token and wait the returned delay so that waiting callers are served in
+    the order of their reservations.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        constructor
+        :param rate: tokens added per second
+        :param capacity: maximum number of tokens i.e. the allowed burst
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take a token
+        :return: seconds to wait until the token is available
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= 1
+            return 0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class CircuitBreaker:
+    """
+    Opens after consecutive failures and rejects calls until the reset timeout passed. Afterwards a single trial call
+    decides whether the circuit closes again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        """
+        constructor
+        :param failure_threshold: number of consecutive failures opening the circuit
+        :param reset_timeout: seconds the circuit stays open before a trial call is allowed
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> float | None:
+        """
+        Check if a call is allowed
+        :return: None if the call is allowed otherwise the seconds until the next trial call
+        """
+        with self._lock:
+            if self.state is CircuitState.CLOSED:
+                return None
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if self.state is CircuitState.OPEN and remaining <= 0:
+                self.state = CircuitState.HALF_OPEN
+            if self.state is CircuitState.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return None
+            return max(remaining, 0)
+
+    def release_trial(self):
+        """
+        End a trial call without an outcome, e.g. if it was throttled or cancelled, so that the next call is the trial
+        """
+        with self._lock:
+            if self.state is CircuitState.HALF_OPEN:
+                self._trial_running = False
+
+    def record_success(self):
+        with self._lock:
+            self.state = CircuitState.CLOSED
+            self._failures = 0
+            self._trial_running = False
+
+    def record_failure(self) -> bool:
+        """
+        Record a failed call
+        :return: True if the failure opened the circuit
+        """
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self.state is CircuitState.HALF_OPEN or (
+                self.state is CircuitState.CLOSED and self._failures >= self.failure_threshold
+            ):
+                self.state = CircuitState.OPEN
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+
+class EndpointGuard:
+    """
+    Resilience layer of one endpoint combining rate limiting, retries with jittered exponential backoff and a circuit
+    breaker
+    """
+
+    def __init__(
+        self,
+        endpoint_url: str,
+        rate: float = 10,
+        burst: float = 20,
+        max_retries: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 30,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30,
+        request_timeout: float = 60,
+    ):
+        """
+        constructor
+        :param endpoint_url:
+        :param rate: requests per second
+        :param burst: number of requests that can be sent at once
+        :param max_retries: number of retries of a retryable failure
+        :param base_delay: backoff delay of the first retry in seconds
+        :param max_delay: maximum backoff delay in seconds. Delays requested by the server are honoured as they are
+        :param failure_threshold: number of consecutive failures opening the circuit
+        :param reset_timeout: seconds the circuit stays open
+        :param request_timeout: timeout of a single request in seconds
+        """
+        self.endpoint_url = endpoint_url
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.request_timeout = request_timeout
+        self._metrics = ResilienceMetrics()
+        self._lock = threading.Lock()
+
+    def get_backoff_delay(self, attempt: int) -> float:
+        """
+        Get the backoff delay of the given retry with full jitter
+        :param attempt: number of the failed attempt starting with 0
+        :return:
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    def _before_attempt(self) -> float:
+        """
+        Check the circuit and reserve a token
+        :return: seconds to wait before the attempt
+        """
+        retry_after = self.breaker.allow()
+        with self._lock:
+            if retry_after is not None:
+                self._metrics.circuit_rejections += 1
+                raise CircuitOpenError(self.endpoint_url, retry_after)
+            self._metrics.attempts += 1
+            wait = self.bucket.reserve()
+            if wait > 0:
+                self._metrics.rate_limited += 1
+                self._metrics.rate_limit_wait += wait
+            return wait
+
+    def _on_success(self):
+        self.breaker.record_success()
+        with self._lock:
+            self._metrics.successes += 1
+
+    def _on_failure(self, failure: CallFailure | None, attempt: int, max_retries: int) -> float | None:
+        """
+        Record a failed attempt
+        :param failure: classification of the failure. None if the failure is not related to the endpoint
+        :param attempt: number of the failed attempt starting with 0
+        :param max_retries:
+        :return: seconds to wait before retrying or None if the call must not be retried
+        """
+        if failure is None:
+            # the endpoint answered properly e.g. with a client error
+            self.breaker.record_success()
+            return None
+        if failure.unhealthy:
+            tripped = self.breaker.record_failure()
+        else:
+            # throttling and query timeouts say nothing about the health of the endpoint
+            self.breaker.release_trial()
+            tripped = False
+        with self._lock:
+            self._metrics.failures += 1
+            if failure.throttled:
+                self._metrics.throttled += 1
+            if tripped:
+                self._metrics.circuit_trips += 1
+                logger.warning(f"Opened circuit of {self.endpoint_url} after repeated failures")
+            if not failure.retryable or attempt >= max_retries:
+                return None
+            delay = self.get_backoff_delay(attempt)
+            if failure.retry_after is not None:
+                delay = max(delay, failure.retry_after)
+            self._metrics.retries += 1
+            self._metrics.backoff_wait += delay
+            return delay
+
+    def call[T](
+        self,
+        func: Callable[[], T],
+        classify: Callable[[Exception], CallFailure | None],
+        max_retries: int | None = None,
+    ) -> T:
+        """
+        Call the given function with rate limiting, retries and the circuit breaker
+        :param func: function sending the request
+        :param classify: classification of the raised errors
+        :param max_retries: number of retries. Defaults to the retries of the guard
+        :return: result of the function
+        """
+        max_retries = self.max_retries if max_retries is None else max_retries
+        attempt = 0
+        while True:
+            wait = self._before_attempt()
+            try:
+                if wait > 0:
+                    time.sleep(wait)
+                result = func()
+            except Exception as e:
+                delay = self._on_failure(classify(e), attempt, max_retries)
+                if delay is None:
+                    raise e
+                logger.debug(f"Retrying call to {self.endpoint_url} in {delay:.2f}s after {e!r}")
+                time.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                # e.g. KeyboardInterrupt
+                self.breaker.release_trial()
+                raise
+            self._on_success()
+            return result
+
+    async def acall[T](
+        self,
+        func: Callable[[], Awaitable[T]],
+        classify: Callable[[Exception], CallFailure | None],
+        max_retries: int | None = None,
+    ) -> T:
+        """
+        Await the given function with rate limiting, retries and the circuit breaker
+        :param func: async function sending the request
+        :param classify: classification of the raised errors
+        :param max_retries: number of retries. Defaults to the retries of the guard
+        :return: result of the function
+        """
+        max_retries = self.max_retries if max_retries is None else max_retries
+        attempt = 0
+        while True:
+            wait = self._before_attempt()
+            try:
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                result = await func()
+            except Exception as e:
+                delay = self._on_failure(classify(e), attempt, max_retries)
+                if delay is None:
+                    raise e
+                logger.debug(f"Retrying call to {self.endpoint_url} in {delay:.2f}s after {e!r}")
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                # e.g. the cancellation of the task
+                self.breaker.release_trial()
+                raise
+            self._on_success()
+            return result
+
+    def metrics(self) -> ResilienceMetrics:
+        """
+        Get the counters of the calls to the endpoint
+        :return:
+        """
+        with self._lock:
+            return self._metrics.model_copy(update={"circuit_state": self.breaker.state})
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parse the value of a Retry-After header
+    :param value: delay in seconds or a http date
+    :return: seconds to wait
+    """
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_sparql_error(error: Exception) -> CallFailure | None:
+    """
+    Classify an error of a SPARQL request.
+    Query timeouts are not retried as the same query would time out again. They are also not counted as failures of
+    the endpoint as they are caused by the query, e.g. a too large chunk of a VALUES query that is split and retried
+    by the caller.
+    :param error:
+    :return:
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        status_code = error.response.status_code
+        retry_after = parse_retry_after(error.response.headers.get("Retry-After"))
+        if status_code == 429 or (status_code == 503 and retry_after is not None):
+            return CallFailure(retryable=True, throttled=True, retry_after=retry_after, unhealthy=False)
+        if status_code in (502, 503, 504):
+            return CallFailure(retryable=False, unhealthy=False)
+        return None
+    if isinstance(error, httpx.ConnectError | httpx.ConnectTimeout | httpx.RemoteProtocolError):
+        return CallFailure(retryable=True)
+    return None
+
+
+class _MediawikiThrottling(threading.local):
+    """Throttling reported by the last MediaWiki response received by the current thread"""
+
+    failure: CallFailure | None = None
+
+
+_mediawiki_throttling = _MediawikiThrottling()
+
+
+def get_mediawiki_failure(response: requests.Response) -> CallFailure | None:
+    """
+    Get the throttling or unavailability reported by the given MediaWiki API response.
+    The API reports maxlag and rate limits with status 200 and an error object.
+    :param response:
+    :return:
+    """
+    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+    if response.status_code == 429:
+        return CallFailure(retryable=True, throttled=True, retry_after=retry_after, unhealthy=False)
+    if response.status_code in (500, 502, 503, 504):
+        return CallFailure(retryable=True, retry_after=retry_after)
+    if response.status_code != 200 or not response.content.startswith(b'{"error"'):
+        return None
+    try:
+        error = response.json().get("error", {})
+    except json.JSONDecodeError:
+        return None
+    if error.get("code") == "maxlag":
+        return CallFailure(retryable=True, throttled=True, retry_after=float(error.get("lag", 5)), unhealthy=False)
+    if error.get("code") == "readonly":
+        return CallFailure(retryable=True, throttled=True, retry_after=retry_after, unhealthy=False)
+    if "actionthrottledtext" in [message.get("name") for message in error.get("messages", [])]:
+        return CallFailure(retryable=True, throttled=True, retry_after=retry_after, unhealthy=False)
+    return None
+
+
+def record_mediawiki_throttling(response: requests.Response, *args, **kwargs):
+    """Response hook remembering the throttling reported by a MediaWiki API response"""
+    _mediawiki_throttling.failure = get_mediawiki_failure(response)
+
+
+def install_mediawiki_hook(session: requests.Session):
+    """
+    Install the throttling hook on the given session of wikibaseintegrator.
+    wikibaseintegrator handles throttling internally and only reports that it gave up. The hook keeps the reason and
+    the requested delay for the retries of the resilience layer.
+    :param session:
+    :return:
+    """
+    hooks = session.hooks.setdefault("response", [])
+    if record_mediawiki_throttling not in hooks:
+        hooks.append(record_mediawiki_throttling)
+
+
+def classify_mediawiki_error(error: Exception) -> CallFailure | None:
+    """
+    Classify an error of a MediaWiki API call made with wikibaseintegrator and without its internal retries
+    :param error:
+    :return:
+    """
+    failure = _mediawiki_throttling.failure
+    _mediawiki_throttling.failure = None
+    if isinstance(error, MaxRetriesReachedException):
+        # connection errors are not reported to the response hook
+        return failure if failure is not None else CallFailure(retryable=True)
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return get_mediawiki_failure(error.response)
+    if isinstance(error, requests.Timeout):
+        # the request might have been processed → do not retry edits
+        return CallFailure(retryable=False)
+    return None
+
+
+_guards: dict[str, EndpointGuard] = {}
+_guards_lock = threading.Lock()
+
+
+def get_endpoint_guard(endpoint_url: HttpUrl | str) -> EndpointGuard:
+    """Get the long-lived resilience layer of the given endpoint"""
+    if isinstance(endpoint_url, HttpUrl):
+        endpoint_url = endpoint_url.unicode_string()
+    with _guards_lock:
+        guard = _guards.get(endpoint_url)
+        if guard is None:
+            guard = EndpointGuard(endpoint_url)
+            _guards[endpoint_url] = guard
+        return guard
+
+
+def set_endpoint_guard(guard: EndpointGuard):
+    """Set the resilience layer of an endpoint"""
+    with _guards_lock:
+        _guards[guard.endpoint_url] = guard
+
+
+def get_resilience_metrics() -> dict[str, ResilienceMetrics]:
+    """Get the call counters of all endpoints"""
+    with _guards_lock:
+        guards = list(_guards.values())
+    return {guard.endpoint_url: guard.metrics() for guard in guards}
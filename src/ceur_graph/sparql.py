@@ -0,0 +1,400 @@
+import asyncio
+import functools
+import importlib.util
+import json
+import logging
+import re
+import threading
+from collections import namedtuple
+from collections.abc import AsyncGenerator, AsyncIterator, Callable, Coroutine, Iterator
+from concurrent.futures import Future
+from typing import Any, Literal
+
+import httpx
+from pydantic import HttpUrl
+
+from ceur_graph.resilience import classify_sparql_error, get_endpoint_guard
+
+logger = logging.getLogger(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+SPARQL_RESULTS_JSON = "application/sparql-results+json"
+
+RowFormat = Literal["dict", "tuple", "namedtuple"]
+
+
+class SparqlJsonStreamParser:
+    """
+    Incremental parser of the bindings of a SPARQL JSON result.
+    The bindings are decoded one by one as soon as they are completely received so that the complete response never
+    has to be held in memory.
+    """
+
+    BINDINGS_START = re.compile(r'"bindings"\s*:\s*\[')
+    VARS_START = re.compile(r'"vars"\s*:\s*')
+    SEPARATORS = " \t\n\r,"
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._in_bindings = False
+        self.finished = False
+        self.vars: list[str] | None = None
+
+    def feed(self, text: str) -> list[dict]:
+        """
+        Feed the next part of the response
+        :param text: next part of the response text
+        :return: bindings completed by the given text
+        """
+        if self.finished:
+            return []
+        self._buffer += text
+        if not self._in_bindings:
+            match = self.BINDINGS_START.search(self._buffer)
+            if match is None:
+                return []
+            self._parse_vars(self._buffer[: match.start()])
+            self._buffer = self._buffer[match.end() :]
+            self._in_bindings = True
+        bindings = []
+        buffer = self._buffer
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in self.SEPARATORS:
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == "]":
+                self.finished = True
+                pos += 1
+                break
+            try:
+                binding, pos = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # binding is not completely received yet
+                break
+            bindings.append(binding)
+        self._buffer = buffer[pos:]
+        return bindings
+
+    def _parse_vars(self, head: str):
+        """
+        Parse the variable names from the result head
+        :param head: response text before the bindings
+        :return:
+        """
+        match = self.VARS_START.search(head)
+        if match is None:
+            return
+        try:
+            self.vars, _ = self._decoder.raw_decode(head, match.end())
+        except json.JSONDecodeError:
+            logger.debug("Unable to parse the variables of the SPARQL result head")
+
+    def close(self):
+        """
+        Check that the complete bindings array was received
+        :return:
+        """
+        if not self.finished:
+            raise ValueError("SPARQL result ended before all bindings were received")
+
+
+def get_row_converter(variables: list[str], row_format: RowFormat) -> Callable[[dict], Any]:
+    """
+    Get the converter of raw SPARQL bindings to rows of the given format
+    :param variables: variable names of the result
+    :param row_format: dict rows map the variables to the values, tuple and namedtuple rows contain the values in the
+    order of the variables with None for unbound variables
+    :return:
+    """
+    match row_format:
+        case "dict":
+            return lambda binding: {key: record.get("value", None) for key, record in binding.items()}
+        case "tuple":
+            return lambda binding: tuple(binding[var].get("value") if var in binding else None for var in variables)
+        case "namedtuple":
+            # the fields are only known at runtime which mypy can not check for namedtuple
+            row_type = namedtuple("SparqlRow", variables, rename=True)  # type: ignore[misc]
+            return lambda binding: row_type(
+                *(binding[var].get("value") if var in binding else None for var in variables)
+            )
+        case _:
+            raise ValueError(f"Unknown row format {row_format}")
+
+
+async def _next_rows(stream: AsyncGenerator[list]) -> list:
+    """Get the next rows of the given row stream"""
+    return await anext(stream)
+
+
+async def _close_stream(stream: AsyncGenerator[list]):
+    """Close the given row stream and the underlying response"""
+    await stream.aclose()
+
+
+class SparqlClient:
+    """
+    Async SPARQL client sharing one keep-alive connection pool for all queries.
+    The underlying httpx client is bound to an event loop that runs in a background thread so that sync and async
+    callers (and callers from different event loops) all reuse the same connections.
+    """
+
+    def __init__(
+        self,
+        user_agent: str | None = None,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        timeout: float = 60.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        """
+        constructor
+        :param user_agent: user agent to send with each request
+        :param max_connections: maximum number of concurrent connections of the pool
+        :param max_keepalive_connections: maximum number of idle connections kept alive
+        :param timeout: request timeout in seconds
+        :param transport: custom transport e.g. for testing
+        """
+        self.user_agent = user_agent
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self.timeout = timeout
+        self.transport = transport
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Get the event loop of the client. The loop is started on first use.
+        :return:
+        """
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="sparql-client", daemon=True)
+                thread.start()
+                self._loop = loop
+                self._thread = thread
+            return self._loop
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Get the pooled http client. Must be called from within the client loop.
+        :return:
+        """
+        if self._client is None:
+            headers = {"Accept": SPARQL_RESULTS_JSON}
+            if self.user_agent is not None:
+                headers["User-Agent"] = self.user_agent
+            self._client = httpx.AsyncClient(
+                headers=headers,
+                limits=self.limits,
+                timeout=self.timeout,
+                http2=HTTP2_AVAILABLE,
+                transport=self.transport,
+            )
+        return self._client
+
+    async def _post(self, query: str, endpoint_url: str) -> dict:
+        """
+        Send the query to the endpoint and return the decoded json response
+        :param query:
+        :param endpoint_url:
+        :return:
+        """
+        client = self._get_client()
+
+        async def post() -> httpx.Response:
+            response = await client.post(endpoint_url, data={"query": query})
+            response.raise_for_status()
+            return response
+
+        response = await get_endpoint_guard(endpoint_url).acall(post, classify=classify_sparql_error)
+        return response.json()
+
+    async def _open_stream(self, query: str, endpoint_url: str) -> httpx.Response:
+        """
+        Send the query to the endpoint without reading the response body
+        :param query:
+        :param endpoint_url:
+        :return: streamed response. Must be closed by the caller
+        """
+        client = self._get_client()
+        request = client.build_request("POST", endpoint_url, data={"query": query})
+        response = await client.send(request, stream=True)
+        if response.is_error:
+            await response.aclose()
+            response.raise_for_status()
+        return response
+
+    async def _stream_rows(self, query: str, endpoint_url: str, row_format: RowFormat) -> AsyncGenerator[list]:
+        """
+        Send the query to the endpoint and parse the rows while the response is received.
+        Must be iterated within the client loop.
+        :param query:
+        :param endpoint_url:
+        :param row_format:
+        :return: rows parsed from each received part of the response
+        """
+        parser = SparqlJsonStreamParser()
+        convert = None
+        response = await get_endpoint_guard(endpoint_url).acall(
+            functools.partial(self._open_stream, query, endpoint_url), classify=classify_sparql_error
+        )
+        try:
+            async for text in response.aiter_text():
+                bindings = parser.feed(text)
+                if not bindings:
+                    continue
+                if convert is None:
+                    variables = parser.vars if parser.vars is not None else list(bindings[0].keys())
+                    convert = get_row_converter(variables, row_format)
+                yield [convert(binding) for binding in bindings if binding]
+        finally:
+            await response.aclose()
+        parser.close()
+
+    async def aiter_query(
+        self, query: str, endpoint_url: HttpUrl | str, row_format: RowFormat = "dict"
+    ) -> AsyncIterator[Any]:
+        """
+        Execute the given query and yield the result rows as they are received
+        :param query: SPARQL query
+        :param endpoint_url: SPARQL endpoint
+        :param row_format: format of the rows. Either dict, tuple or namedtuple
+        :return: result rows
+        """
+        if isinstance(endpoint_url, HttpUrl):
+            endpoint_url = endpoint_url.unicode_string()
+        async for row in self.aiter_stream(self._stream_rows(query, endpoint_url, row_format)):
+            yield row
+
+    def iter_query(self, query: str, endpoint_url: HttpUrl | str, row_format: RowFormat = "dict") -> Iterator[Any]:
+        """
+        Execute the given query and yield the result rows as they are received
+        :param query: SPARQL query
+        :param endpoint_url: SPARQL endpoint
+        :param row_format: format of the rows. Either dict, tuple or namedtuple
+        :return: result rows
+        """
+        if isinstance(endpoint_url, HttpUrl):
+            endpoint_url = endpoint_url.unicode_string()
+        return self.iter_stream(self._stream_rows(query, endpoint_url, row_format))
+
+    async def aiter_stream(self, stream: AsyncGenerator[list]) -> AsyncIterator[Any]:
+        """
+        Iterate the given stream of item batches within the client loop and yield the items.
+        The stream is closed within the client loop once the iteration ends.
+        :param stream: async generator yielding lists of items
+        :return: items of the batches
+        """
+        try:
+            while True:
+                try:
+                    items = await self.arun(_next_rows(stream))
+                except StopAsyncIteration:
+                    break
+                for item in items:
+                    yield item
+        finally:
+            await self.arun(_close_stream(stream))
+
+    def iter_stream(self, stream: AsyncGenerator[list]) -> Iterator[Any]:
+        """
+        Iterate the given stream of item batches within the client loop and yield the items to synchronous code.
+        The stream is closed within the client loop once the iteration ends.
+        :param stream: async generator yielding lists of items
+        :return: items of the batches
+        """
+        try:
+            while True:
+                try:
+                    items = self.run(_next_rows(stream))
+                except StopAsyncIteration:
+                    break
+                yield from items
+        finally:
+            self.run(_close_stream(stream))
+
+    def submit[T](self, coro: Coroutine[Any, Any, T]) -> Future[T]:
+        """
+        Schedule the given coroutine on the client loop
+        :param coro:
+        :return: future of the coroutine result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run[T](self, coro: Coroutine[Any, Any, T]) -> T:
+        """
+        Run the given coroutine on the client loop and block until it is finished
+        :param coro:
+        :return: result of the coroutine
+        """
+        if self._in_client_loop():
+            coro.close()
+            raise RuntimeError("SparqlClient.run can not be called from within the client loop. Use await instead.")
+        return self.submit(coro).result()
+
+    async def arun[T](self, coro: Coroutine[Any, Any, T]) -> T:
+        """
+        Await the given coroutine on the client loop independent of the loop of the caller
+        :param coro:
+        :return: result of the coroutine
+        """
+        if self._in_client_loop():
+            return await coro
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def _in_client_loop(self) -> bool:
+        """
+        Check if the caller is running inside the client loop
+        :return:
+        """
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    async def aquery(self, query: str, endpoint_url: HttpUrl | str) -> dict:
+        """
+        Execute the given query against the given endpoint
+        :param query: SPARQL query
+        :param endpoint_url: SPARQL endpoint
+        :return: decoded SPARQL json result
+        """
+        if isinstance(endpoint_url, HttpUrl):
+            endpoint_url = endpoint_url.unicode_string()
+        return await self.arun(self._post(query, endpoint_url))
+
+    def query(self, query: str, endpoint_url: HttpUrl | str) -> dict:
+        """
+        Execute the given query against the given endpoint
+        :param query: SPARQL query
+        :param endpoint_url: SPARQL endpoint
+        :return: decoded SPARQL json result
+        """
+        return self.run(self.aquery(query, endpoint_url))
+
+    def close(self):
+        """
+        Close the connection pool and stop the client loop
+        :return:
+        """
+        with self._lock:
+            loop, thread, client = self._loop, self._thread, self._client
+            self._loop, self._thread, self._client = None, None, None
+        if loop is None:
+            return
+        if client is not None:
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join()
+        loop.close()
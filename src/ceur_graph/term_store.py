@@ -0,0 +1,340 @@
+import logging
+import sqlite3
+import threading
+from collections.abc import Iterable
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+if TYPE_CHECKING:
+    from ceur_graph.wikibase import Wikibase
+
+logger = logging.getLogger(__name__)
+
+
+class TermDictionarySettings(BaseSettings):
+    """
+    Settings of the term dictionary of the API.
+    Can be set with environment variables prefixed with CEUR_GRAPH_TERM_DICTIONARY_, e.g.
+    CEUR_GRAPH_TERM_DICTIONARY_ENABLED=true
+    """
+
+    model_config = SettingsConfigDict(env_prefix="CEUR_GRAPH_TERM_DICTIONARY_")
+
+    enabled: bool = False
+    path: Path = Path.home().joinpath(".ceur-graph", "terms.sqlite")
+    sync_interval: float = 300
+    preload_property_types: bool = True
+
+
+class TermDictionaryStats(BaseModel):
+    """
+    Counters of a term dictionary
+    """
+
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    labels: int = 0
+    property_types: int = 0
+
+
+class TermStore:
+    """
+    SQLite store of entity labels and property types.
+    Labels are keyed by entity URI and language. Entities without a label in a language are stored with a NULL label so
+    that they are not queried again.
+    """
+
+    def __init__(self, path: Path | str = ":memory:"):
+        """
+        constructor
+        :param path: path of the database file. Defaults to an in-memory database
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._con = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS labels (
+                entity TEXT NOT NULL,
+                language TEXT NOT NULL,
+                label TEXT,
+                PRIMARY KEY (entity, language)
+            );
+            CREATE TABLE IF NOT EXISTS property_types (property TEXT PRIMARY KEY, type TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            """
+        )
+
+    def get_labels(self, entities: Iterable[str], language: str) -> dict[str, str | None]:
+        """
+        Get the stored labels of the given entities
+        :param entities: entity URIs
+        :param language:
+        :return: labels of the stored entities. None if the entity is known to have no label in the language
+        """
+        labels = {}
+        with self._lock:
+            for entity in entities:
+                row = self._con.execute(
+                    "SELECT label FROM labels WHERE entity = ? AND language = ?", (entity, language)
+                ).fetchone()
+                if row is not None:
+                    labels[entity] = row[0]
+        return labels
+
+    def set_labels(self, labels: dict[str, str | None], language: str):
+        """
+        Store the given labels
+        :param labels: labels by entity URI. None marks entities without a label in the language
+        :param language:
+        :return:
+        """
+        with self._lock:
+            self._con.executemany(
+                "INSERT OR REPLACE INTO labels VALUES (?, ?, ?)",
+                [(entity, language, label) for entity, label in labels.items()],
+            )
+
+    def get_property_types(self, properties: Iterable[str]) -> dict[str, str]:
+        """
+        Get the stored types of the given properties
+        :param properties: property URIs
+        :return: types of the stored properties
+        """
+        property_types = {}
+        with self._lock:
+            for prop in properties:
+                row = self._con.execute("SELECT type FROM property_types WHERE property = ?", (prop,)).fetchone()
+                if row is not None:
+                    property_types[prop] = row[0]
+        return property_types
+
+    def set_property_types(self, property_types: dict[str, str]):
+        """
+        Store the given property types
+        :param property_types: types by property URI
+        :return:
+        """
+        with self._lock:
+            self._con.executemany("INSERT OR REPLACE INTO property_types VALUES (?, ?)", property_types.items())
+
+    def invalidate(self, entities: Iterable[str]) -> int:
+        """
+        Remove the labels and property types of the given entities
+        :param entities: entity URIs
+        :return: number of removed entries
+        """
+        params = [(entity,) for entity in entities]
+        with self._lock:
+            self._con.execute("BEGIN")
+            try:
+                removed = self._con.executemany("DELETE FROM labels WHERE entity = ?", params).rowcount
+                removed += self._con.executemany("DELETE FROM property_types WHERE property = ?", params).rowcount
+                self._con.execute("COMMIT")
+            except Exception:
+                self._con.execute("ROLLBACK")
+                raise
+        return removed
+
+    def clear(self):
+        """
+        Remove all labels and property types
+        :return:
+        """
+        with self._lock:
+            self._con.execute("DELETE FROM labels")
+            self._con.execute("DELETE FROM property_types")
+
+    def get_state(self, key: str) -> str | None:
+        """
+        Get the sync state value of the given key
+        :param key:
+        :return:
+        """
+        with self._lock:
+            row = self._con.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row is not None else None
+
+    def set_state(self, key: str, value: str):
+        """
+        Set the sync state value of the given key
+        :param key:
+        :param value:
+        :return:
+        """
+        with self._lock:
+            self._con.execute("INSERT OR REPLACE INTO sync_state VALUES (?, ?)", (key, value))
+
+    def count(self) -> tuple[int, int]:
+        """
+        Get the number of stored labels and property types
+        :return: number of labels, number of property types
+        """
+        with self._lock:
+            labels = self._con.execute("SELECT COUNT(*) FROM labels").fetchone()[0]
+            property_types = self._con.execute("SELECT COUNT(*) FROM property_types").fetchone()[0]
+        return labels, property_types
+
+    def close(self):
+        self._con.close()
+
+
+class TermDictionary:
+    """
+    Persistent dictionary of the entity labels and property types of a wikibase instance.
+    Lookups are answered from the store and only the missing entries are queried. Entries of entities reported as
+    modified by the query service are invalidated by sync().
+    """
+
+    WATERMARK_KEY = "watermark"
+
+    def __init__(
+        self,
+        wikibase: "Wikibase",
+        store: TermStore | None = None,
+        sync_overlap: timedelta = timedelta(minutes=10),
+    ):
+        """
+        constructor
+        :param wikibase: wikibase to query the missing entries from
+        :param store: store of the entries. Defaults to an in-memory store
+        :param sync_overlap: overlap of the synchronized modification range to account for the query service lag
+        """
+        self.wikibase = wikibase
+        self.store = store if store is not None else TermStore()
+        self.sync_overlap = sync_overlap
+        self._sync_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = TermDictionaryStats()
+        self._stop_event: threading.Event | None = None
+
+    @property
+    def mediawiki_api_url(self) -> str:
+        return self.wikibase.mediawiki_api_url.unicode_string()
+
+    def _count(self, hits: int, misses: int):
+        with self._stats_lock:
+            self._stats.hits += hits
+            self._stats.misses += misses
+
+    def get_labels(self, entities: list[str], language: str) -> dict[str, str]:
+        """
+        Get the labels of the given entities
+        :param entities: entity URIs
+        :param language:
+        :return: labels by entity URI. Entities without a label in the language are omitted
+        """
+        entities = list(dict.fromkeys(entities))
+        labels = self.store.get_labels(entities, language)
+        missing = [entity for entity in entities if entity not in labels]
+        self._count(len(labels), len(missing))
+        if missing:
+            fetched: dict[str, str | None] = dict.fromkeys(missing)
+            fetched.update(self.wikibase.query_entity_labels(missing, language))
+            self.store.set_labels(fetched, language)
+            labels.update(fetched)
+        return {entity: label for entity, label in labels.items() if label is not None}
+
+    def get_property_types(self, properties: list[str]) -> dict[str, str]:
+        """
+        Get the types of the given properties
+        :param properties: property URIs
+        :return: types by property URI. Unknown properties are omitted
+        """
+        properties = list(dict.fromkeys(properties))
+        property_types = self.store.get_property_types(properties)
+        missing = [prop for prop in properties if prop not in property_types]
+        self._count(len(property_types), len(missing))
+        if missing:
+            fetched = self.wikibase.query_property_types(missing)
+            self.store.set_property_types(fetched)
+            property_types.update(fetched)
+        return property_types
+
+    def preload_property_types(self) -> int:
+        """
+        Load the types of all properties of the wikibase into the store
+        :return: number of loaded properties
+        """
+        property_types = self.wikibase.query_all_property_types()
+        self.store.set_property_types(property_types)
+        logger.info(f"Preloaded {len(property_types)} property types of {self.mediawiki_api_url}")
+        return len(property_types)
+
+    def invalidate(self, entities: Iterable[str]) -> int:
+        """
+        Invalidate the entries of the given entities
+        :param entities: entity URIs
+        :return: number of removed entries
+        """
+        removed = self.store.invalidate(entities)
+        with self._stats_lock:
+            self._stats.invalidations += removed
+        return removed
+
+    def sync(self, until: datetime | None = None) -> int:
+        """
+        Invalidate the entries of the entities modified since the last synchronization.
+        Without a previous synchronization the modification range is unknown and all entries are removed.
+        :param until: end of the modification range. Defaults to now
+        :return: number of removed entries
+        """
+        with self._sync_lock:
+            if until is None:
+                until = datetime.now(UTC)
+            watermark = self.store.get_state(self.WATERMARK_KEY)
+            if watermark is None:
+                self.store.clear()
+                removed = 0
+            else:
+                start = datetime.fromisoformat(watermark) - self.sync_overlap
+                removed = self.invalidate(self.wikibase.get_items_modified_at(start, until))
+            self.store.set_state(self.WATERMARK_KEY, until.isoformat())
+            logger.debug(f"Synchronized term dictionary of {self.mediawiki_api_url}: {removed} entries invalidated")
+            return removed
+
+    def start_periodic_sync(self, interval: float):
+        """
+        Synchronize the dictionary in a background thread in the given interval
+        :param interval: seconds between two synchronizations
+        :return:
+        """
+        if self._stop_event is not None:
+            return
+        stop_event = threading.Event()
+        self._stop_event = stop_event
+
+        def run():
+            while not stop_event.is_set():
+                try:
+                    self.sync()
+                except Exception as e:
+                    logger.error(f"Failed to synchronize term dictionary of {self.mediawiki_api_url}: {e}")
+                stop_event.wait(interval)
+
+        threading.Thread(target=run, name="term-dictionary-sync", daemon=True).start()
+
+    def stop_periodic_sync(self):
+        """
+        Stop the background synchronization
+        :return:
+        """
+        if self._stop_event is not None:
+            self._stop_event.set()
+            self._stop_event = None
+
+    def stats(self) -> TermDictionaryStats:
+        """
+        Get the counters and the size of the dictionary
+        :return:
+        """
+        labels, property_types = self.store.count()
+        with self._stats_lock:
+            return self._stats.model_copy(update={"labels": labels, "property_types": property_types})
@@ -0,0 +1,238 @@
+import logging
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+
+from pydantic import BaseModel
+
+from ceur_graph.ceur_dev import CeurDev, get_ceur_dev
+
+logger = logging.getLogger(__name__)
+
+
+class VolumeIds(BaseModel):
+    """
+    Ids of a ceur-ws volume
+    """
+
+    volume_number: int
+    proceedings: str | None = None
+    papers: list[str] = []
+
+
+class VolumeIndex:
+    """
+    In-memory index of the ceur-ws volume numbers to the QIDs of the proceedings and their documents.
+    The index is loaded with a few paged SPARQL queries and refreshed incrementally with the items modified since the
+    last refresh.
+    """
+
+    def __init__(
+        self,
+        ceur_dev: CeurDev | None = None,
+        page_size: int = 10000,
+        refresh_interval: float = 300,
+        refresh_overlap: timedelta = timedelta(minutes=10),
+        chunk_size: int = 200,
+    ):
+        """
+        constructor
+        :param ceur_dev: wikibase to load the volumes from. Defaults to the shared anonymous instance
+        :param page_size: number of rows per query page of the full load
+        :param refresh_interval: seconds after which lookups trigger an incremental refresh
+        :param refresh_overlap: overlap of the refreshed modification range to account for the query service lag
+        :param chunk_size: number of modified items per query of the incremental refresh
+        """
+        self.ceur_dev = ceur_dev if ceur_dev is not None else get_ceur_dev()
+        self.page_size = page_size
+        self.refresh_interval = refresh_interval
+        self.refresh_overlap = refresh_overlap
+        self.chunk_size = chunk_size
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._proceedings_by_volume: dict[int, str] = {}
+        self._volume_by_proceedings: dict[str, int] = {}
+        self._papers_by_proceedings: dict[str, list[str]] = {}
+        self._proceedings_by_paper: dict[str, str] = {}
+        self.loaded_at: datetime | None = None
+        self.refreshed_at: float | None = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    def __len__(self) -> int:
+        return len(self._proceedings_by_volume)
+
+    def load(self):
+        """
+        Load all volumes with paged queries and replace the current index
+        :return:
+        """
+        start = datetime.now(UTC)
+        rows: list[dict] = []
+        offset = 0
+        while True:
+            query = self.ceur_dev.get_volumes_query(limit=self.page_size, offset=offset)
+            page = self.ceur_dev.execute_query(query, self.ceur_dev.sparql_endpoint, ttl=0)
+            rows.extend(page)
+            if len(page) < self.page_size:
+                break
+            offset += self.page_size
+        with self._lock:
+            self._proceedings_by_volume = {}
+            self._volume_by_proceedings = {}
+            self._papers_by_proceedings = {}
+            self._proceedings_by_paper = {}
+            self._add_rows(rows)
+        self.loaded_at = start
+        self.refreshed_at = time.time()
+        logger.info(f"Loaded {len(self)} volumes in {(datetime.now(UTC) - start).total_seconds()}s")
+
+    def refresh(self) -> int:
+        """
+        Update the volumes related to the items modified since the last load or refresh
+        :return: number of modified items
+        """
+        loaded_at = self.loaded_at
+        if loaded_at is None:
+            self.load()
+            return len(self)
+        start = datetime.now(UTC)
+        modified_uris = sorted(self.ceur_dev.get_items_modified_at(loaded_at - self.refresh_overlap, start))
+        rows = []
+        for uri_chunk in self.ceur_dev.chunks(modified_uris, self.chunk_size):
+            query = self.ceur_dev.get_volumes_of_items_query(uri_chunk)
+            rows.extend(self.ceur_dev.execute_query(query, self.ceur_dev.sparql_endpoint, ttl=0))
+        with self._lock:
+            for uri in modified_uris:
+                self._remove_item(self.ceur_dev.get_entity_id(uri))
+            self._add_rows(rows)
+        self.loaded_at = start
+        self.refreshed_at = time.time()
+        logger.debug(f"Refreshed volume index with {len(modified_uris)} modified items")
+        return len(modified_uris)
+
+    def _add_rows(self, rows: list[dict]):
+        """
+        Add the given query result rows to the index. Must be called with the lock held.
+        :param rows:
+        :return:
+        """
+        for row in rows:
+            proceedings_uri = row.get("proceedings")
+            volume_number = row.get("volume_number", "")
+            if proceedings_uri is None or not volume_number.isdigit():
+                logger.debug(f"Skipping volume with invalid volume number {volume_number} ({proceedings_uri})")
+                continue
+            proceedings_id = self.ceur_dev.get_entity_id(proceedings_uri)
+            if int(volume_number) not in self._proceedings_by_volume:
+                self._proceedings_by_volume[int(volume_number)] = proceedings_id
+            self._volume_by_proceedings[proceedings_id] = int(volume_number)
+            papers = self._papers_by_proceedings.setdefault(proceedings_id, [])
+            document_uri = row.get("document")
+            if document_uri is not None:
+                paper_id = self.ceur_dev.get_entity_id(document_uri)
+                if self._proceedings_by_paper.get(paper_id) != proceedings_id:
+                    papers.append(paper_id)
+                    self._proceedings_by_paper[paper_id] = proceedings_id
+
+    def _remove_item(self, item_id: str):
+        """
+        Remove the given proceedings or paper from the index. Must be called with the lock held.
+        :param item_id:
+        :return:
+        """
+        volume_number = self._volume_by_proceedings.pop(item_id, None)
+        if volume_number is not None:
+            if self._proceedings_by_volume.get(volume_number) == item_id:
+                del self._proceedings_by_volume[volume_number]
+            for paper_id in self._papers_by_proceedings.pop(item_id, []):
+                self._proceedings_by_paper.pop(paper_id, None)
+        proceedings_id = self._proceedings_by_paper.pop(item_id, None)
+        if proceedings_id is not None:
+            papers = self._papers_by_proceedings.get(proceedings_id, [])
+            if item_id in papers:
+                papers.remove(item_id)
+
+    def ensure_fresh(self):
+        """
+        Load the index on first use and refresh it if the refresh interval passed.
+        Only one thread refreshes the index, other threads keep using the current index meanwhile.
+        :return:
+        """
+        if not self.is_loaded:
+            with self._refresh_lock:
+                if not self.is_loaded:
+                    self.load()
+        elif time.time() - self.refreshed_at > self.refresh_interval and self._refresh_lock.acquire(blocking=False):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Failed to refresh the volume index: {e}")
+            finally:
+                self._refresh_lock.release()
+
+    def get_proceedings(self, volume_number: int) -> str | None:
+        """
+        Get the URI of the proceedings of the given volume
+        :param volume_number:
+        :return:
+        """
+        self.ensure_fresh()
+        proceedings_id = self._proceedings_by_volume.get(volume_number)
+        return self.ceur_dev.get_entity_uri(proceedings_id) if proceedings_id is not None else None
+
+    def get_papers(self, volume_number: int) -> list[str]:
+        """
+        Get the URIs of the documents published in the given volume
+        :param volume_number:
+        :return:
+        """
+        return self.get_volumes([volume_number])[0].papers
+
+    def get_volumes(self, volume_numbers: list[int]) -> list[VolumeIds]:
+        """
+        Get the ids of the given volumes
+        :param volume_numbers:
+        :return: ids in the order of the given volume numbers
+        """
+        self.ensure_fresh()
+        volumes = []
+        with self._lock:
+            for volume_number in volume_numbers:
+                proceedings_id = self._proceedings_by_volume.get(volume_number)
+                if proceedings_id is None:
+                    volumes.append(VolumeIds(volume_number=volume_number))
+                    continue
+                volumes.append(
+                    VolumeIds(
+                        volume_number=volume_number,
+                        proceedings=self.ceur_dev.get_entity_uri(proceedings_id),
+                        papers=[
+                            self.ceur_dev.get_entity_uri(paper_id)
+                            for paper_id in self._papers_by_proceedings.get(proceedings_id, [])
+                        ],
+                    )
+                )
+        return volumes
+
+
+_volume_index: VolumeIndex | None = None
+_volume_index_lock = threading.Lock()
+
+
+def get_volume_index() -> VolumeIndex:
+    """Get the process wide volume index of ceur-dev"""
+    global _volume_index
+    with _volume_index_lock:
+        if _volume_index is None:
+            _volume_index = VolumeIndex()
+        return _volume_index
+
+
+def set_volume_index(volume_index: VolumeIndex | None):
+    """Set the process wide volume index of ceur-dev. None resets the index"""
+    global _volume_index
+    with _volume_index_lock:
+        _volume_index = volume_index
@@ -1,12 +1,16 @@
+import json
 import logging
+from collections.abc import Callable
+from enum import Enum
 from typing import Any, get_origin
+from weakref import WeakKeyDictionary
 
-from pydantic import AnyHttpUrl, BaseModel
+from pydantic import AnyHttpUrl, BaseModel, ConfigDict, Field
 from pydantic.fields import FieldInfo
 from wikibaseintegrator import WikibaseIntegrator, datatypes
 from wikibaseintegrator.datatypes import BaseDataType
 from wikibaseintegrator.entities import ItemEntity
-from wikibaseintegrator.models import Claim, Snak
+from wikibaseintegrator.models import Claim, LanguageValues, Snak
 from wikibaseintegrator.wbi_enums import ActionIfExists, WikibaseSnakType
 
 from ceur_graph.datamodel.item import (
@@ -21,6 +25,206 @@ from ceur_graph.wikibase import Wikibase
 
 logger = logging.getLogger(__name__)
 
+ClaimConverter = Callable[[str, Any, str], Claim | None]
+
+
+def _monolingual_text_claim(prop_nr: str, value: Any, language: str) -> Claim:
+    return datatypes.MonolingualText(language=language, text=value, prop_nr=prop_nr)
+
+
+def _item_claim(prop_nr: str, value: Any, language: str) -> Claim:
+    return datatypes.Item(value=value, prop_nr=prop_nr)
+
+
+def _url_claim(prop_nr: str, value: Any, language: str) -> Claim:
+    if isinstance(value, AnyHttpUrl):
+        value = str(value)
+    return datatypes.URL(value=value, prop_nr=prop_nr)
+
+
+def _string_claim(prop_nr: str, value: Any, language: str) -> Claim:
+    return datatypes.String(value=str(value), prop_nr=prop_nr)
+
+
+def _time_claim(prop_nr: str, value: Any, language: str) -> Claim:
+    return datatypes.Time(time=value, prop_nr=prop_nr)
+
+
+def _external_id_claim(prop_nr: str, value: Any, language: str) -> Claim:
+    return datatypes.ExternalID(value=value, prop_nr=prop_nr)
+
+
+def _quantity_claim(prop_nr: str, value: Any, language: str) -> Claim:
+    return datatypes.Quantity(amount=value, prop_nr=prop_nr)
+
+
+def _globe_coordinate_claim(prop_nr: str, value: Any, language: str) -> Claim | None:
+    if isinstance(value, Coordinate):
+        return datatypes.GlobeCoordinate(longitude=value.longitude, latitude=value.latitude, prop_nr=prop_nr)
+    logger.debug("Value is not a Coordinate object → ignoring in claim creation")
+    return None
+
+
+CLAIM_CONVERTERS: dict[str, ClaimConverter] = {
+    datatypes.MonolingualText.DTYPE: _monolingual_text_claim,
+    datatypes.Item.DTYPE: _item_claim,
+    datatypes.URL.DTYPE: _url_claim,
+    datatypes.String.DTYPE: _string_claim,
+    datatypes.Time.DTYPE: _time_claim,
+    datatypes.ExternalID.DTYPE: _external_id_claim,
+    datatypes.Quantity.DTYPE: _quantity_claim,
+    datatypes.GlobeCoordinate.DTYPE: _globe_coordinate_claim,
+}
+
+
+class FieldRole(Enum):
+    """
+    Role of a model field in the wikibase entity
+    """
+
+    SUBJECT = "subject"
+    LABEL = "label"
+    DESCRIPTION = "description"
+    CLAIM = "claim"
+    STATEMENT = "statement"
+    QUALIFIER = "qualifier"
+
+
+class FieldMapping(BaseModel):
+    """
+    Resolved wikibase mapping of a model field
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    name: str
+    prop_id: str | None
+    prop_nr: str | None
+    datatype: str | None
+    is_list: bool
+    role: FieldRole
+    converter: ClaimConverter | None = Field(default=None, exclude=True)
+
+    def get_claim(self, value: Any, language: str = "en") -> Claim | None:
+        """
+        Convert the given value to a claim of the mapped property
+        :param value:
+        :param language:
+        :return: None if the value is None or the datatype is not supported
+        """
+        if value is None or self.converter is None or self.prop_nr is None:
+            return None
+        return self.converter(self.prop_nr, value, language)
+
+
+class ModelMappingPlan(BaseModel):
+    """
+    Wikibase mapping of all fields of a model
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    model_name: str
+    fields: dict[str, FieldMapping]
+    statement_subject: FieldMapping | None = None
+    qualifiers: tuple[FieldMapping, ...] = ()
+
+    def get_statement_subject(self) -> FieldMapping:
+        """
+        Get the mapping of the field that is the statement subject
+        :return:
+        """
+        if self.statement_subject is None:
+            raise Exception(f"Model {self.model_name} has no statement object defined for {CEUR_DEV_ID}")
+        return self.statement_subject
+
+
+def get_field_role(prop_id: str | None) -> FieldRole:
+    """
+    Get the role of the field mapped to the given property id
+    :param prop_id:
+    :return:
+    """
+    match prop_id:
+        case "rdf:subject":
+            return FieldRole.SUBJECT
+        case "rdfs:label":
+            return FieldRole.LABEL
+        case "schema:description":
+            return FieldRole.DESCRIPTION
+    id_parts = prop_id.split("/") if prop_id is not None else []
+    if len(id_parts) > 2 and id_parts[-2] == "statement":
+        return FieldRole.STATEMENT
+    elif len(id_parts) > 2 and id_parts[-2] == "qualifier":
+        return FieldRole.QUALIFIER
+    return FieldRole.CLAIM
+
+
+def get_field_mapping(field_name: str, field_metadata: FieldInfo, lookup_key: str = CEUR_DEV_ID) -> FieldMapping:
+    """
+    Resolve the wikibase mapping of the given field
+    :param field_name:
+    :param field_metadata:
+    :param lookup_key: key of the property id in the json_schema_extra of the field
+    :return:
+    """
+    json_schema_extra = field_metadata.json_schema_extra if isinstance(field_metadata.json_schema_extra, dict) else {}
+    prop_id = json_schema_extra.get(lookup_key)
+    datatype = json_schema_extra.get(WIKIBASE_TYPE)
+    role = get_field_role(prop_id)
+    prop_nr = None
+    if prop_id is not None and role not in (FieldRole.SUBJECT, FieldRole.LABEL, FieldRole.DESCRIPTION):
+        prop_nr = Wikibase.get_entity_id(prop_id)
+    return FieldMapping(
+        name=field_name,
+        prop_id=prop_id,
+        prop_nr=prop_nr,
+        datatype=datatype,
+        is_list=get_origin(field_metadata.annotation) is list,
+        role=role,
+        converter=CLAIM_CONVERTERS.get(datatype) if prop_nr is not None and datatype is not None else None,
+    )
+
+
+_mapping_plans: dict[type[BaseModel], ModelMappingPlan] = {}
+
+
+def get_mapping_plan(model: type[BaseModel]) -> ModelMappingPlan:
+    """
+    Get the wikibase mapping plan of the given model. The plan is compiled once per model class.
+    :param model:
+    :return:
+    """
+    plan = _mapping_plans.get(model)
+    if plan is None:
+        plan = _mapping_plans[model] = compile_mapping_plan(model)
+    return plan
+
+
+def compile_mapping_plan(model: type[BaseModel]) -> ModelMappingPlan:
+    """
+    Compile the wikibase mapping plan of the given model
+    :param model:
+    :return:
+    """
+    fields = {
+        field_name: get_field_mapping(field_name, field_metadata)
+        for field_name, field_metadata in model.model_fields.items()
+    }
+    statement_subject = None
+    qualifiers: tuple[FieldMapping, ...] = ()
+    if issubclass(model, StatementBase):
+        layout = model.get_statement_layout(CEUR_DEV_ID)
+        if layout.subject_field is not None:
+            statement_subject = fields[layout.subject_field]
+        qualifiers = tuple(fields[field_name] for field_name in layout.qualifier_fields)
+    return ModelMappingPlan(
+        model_name=model.__name__,
+        fields=fields,
+        statement_subject=statement_subject,
+        qualifiers=qualifiers,
+    )
+
 
 def create_item_from_model(model: BaseModel, wbi: WikibaseIntegrator) -> ItemEntity:
     """
@@ -30,83 +234,143 @@ def create_item_from_model(model: BaseModel, wbi: WikibaseIntegrator) -> ItemEnt
     """
     item: ItemEntity = wbi.item.new()
     default_language = "en"
-
-    field_name: str
-    field_metadata: FieldInfo
-    for field_name, field_metadata in model.model_fields.items():
-        field_value = getattr(model, field_name)
-        field_type = field_metadata.json_schema_extra.get(WIKIBASE_TYPE)
-        field_prop_id = field_metadata.json_schema_extra.get(CEUR_DEV_ID)
-        if field_prop_id == "rdfs:label":
+    plan = get_mapping_plan(model.__class__)
+    for field in plan.fields.values():
+        field_value = getattr(model, field.name)
+        if field.role is FieldRole.LABEL:
             item.labels.set(default_language, field_value)
-        elif field_prop_id == "schema:description":
+        elif field.role is FieldRole.DESCRIPTION:
             item.descriptions.set(default_language, field_value)
-        else:
+        elif field.role is not FieldRole.SUBJECT:
             # ToDo: Add support for qualifiers e.g. if value is an object and id has prefix p:
-            claims = []
-            if isinstance(field_value, list):
-                values = field_value
-            else:
-                values = [field_value]
-            for value in values:
-                claim = get_claim(
-                    prop_id=field_prop_id,
-                    datatype=field_type,
-                    value=value,
-                    language=default_language,
-                )
-                if claim is not None:
-                    claims.append(claim)
-            for claim in claims:
+            for claim in get_field_claims(field, field_value, default_language):
                 item.claims.add(claim)
     return item
 
 
-def update_item_from_model(model: BaseModel, item: ItemEntity):
+class ItemUpdateReport(BaseModel):
+    """
+    Fields changed or skipped by an item update
     """
-    Update ItemEntity from given object model
+
+    changed: list[str] = Field(default_factory=list)
+    unchanged: list[str] = Field(default_factory=list)
+
+    @property
+    def has_changes(self) -> bool:
+        return len(self.changed) > 0
+
+
+def update_item_from_model(model: BaseModel, item: ItemEntity) -> ItemUpdateReport:
+    """
+    Update ItemEntity from given object model.
+    Only labels, descriptions and claims that differ from the item are modified. Claims whose value is unchanged are
+    kept including their qualifiers and references.
     :param model:
     :param item:
-    :param wbi:
-    :return:
+    :return: report of the changed and unchanged fields
     """
     default_language = "en"
-    for field_name in model.model_fields_set:
+    plan = get_mapping_plan(model.__class__)
+    report = ItemUpdateReport()
+    for field_name in sorted(model.model_fields_set):
         field_value: Any = getattr(model, field_name)
-        field_metadata: FieldInfo = model.model_fields.get(field_name)
-        field_type = field_metadata.json_schema_extra.get(WIKIBASE_TYPE)
-        field_prop_id = field_metadata.json_schema_extra.get(CEUR_DEV_ID)
-        if field_prop_id == "rdfs:label":
-            item.labels.set(
-                default_language,
-                field_value,
-                action_if_exists=ActionIfExists.REPLACE_ALL,
-            )
-        elif field_prop_id == "schema:description":
-            item.descriptions.set(
-                default_language,
-                field_value,
-                action_if_exists=ActionIfExists.REPLACE_ALL,
+        field = plan.fields[field_name]
+        if field.role is FieldRole.LABEL:
+            is_changed = set_term(item.labels, default_language, field_value)
+        elif field.role is FieldRole.DESCRIPTION:
+            is_changed = set_term(item.descriptions, default_language, field_value)
+        elif field.role is not FieldRole.SUBJECT:
+            # ToDo: Add support for qualifiers e.g. if value is an object and id has prefix p:
+            claims = get_field_claims(field, field_value, default_language)
+            is_changed = (
+                bool(claims) and field.prop_nr is not None and replace_property_claims(item, field.prop_nr, claims)
             )
         else:
-            # ToDo: Add support for qualifiers e.g. if value is an object and id has prefix p:
-            claims = []
-            if isinstance(field_value, list):
-                values = field_value
-            else:
-                values = [field_value]
-            for value in values:
-                claim = get_claim(
-                    prop_id=field_prop_id,
-                    datatype=field_type,
-                    value=value,
-                    language=default_language,
-                )
-                if claim is not None:
-                    claims.append(claim)
-            if claims:
-                item.claims.remove(field_prop_id)
-                item.claims.add(claims)
+            continue
+        if is_changed:
+            report.changed.append(field_name)
+        else:
+            report.unchanged.append(field_name)
+    if report.has_changes:
+        invalidate_statement_indexes(item)
+    return report
+
+
+def set_term(terms: LanguageValues, language: str, value: str | None) -> bool:
+    """
+    Set the label or description of the given language if it differs from the current value
+    :param terms: labels or descriptions of an item
+    :param language:
+    :param value:
+    :return: True if the term was changed
+    """
+    current = terms.get(language)
+    current_value = current.value if current is not None and not current.removed else None
+    if current_value == value:
+        return False
+    terms.set(language, value, action_if_exists=ActionIfExists.REPLACE_ALL)
+    return True
+
+
+def get_claim_value_key(claim: Claim) -> str:
+    """
+    Get a key identifying the main value of the given claim
+    :param claim:
+    :return:
+    """
+    mainsnak = claim.mainsnak
+    return json.dumps([mainsnak.snaktype.value, mainsnak.datavalue], sort_keys=True)
+
+
+def replace_property_claims(item: ItemEntity, prop_nr: str, claims: list[Claim]) -> bool:
+    """
+    Replace the claims of the given property with the given claims by removing the claims with values that are no
+    longer present and adding the claims with new values
+    :param item:
+    :param prop_nr:
+    :param claims: desired claims of the property
+    :return: True if claims were added or removed
+    """
+    existing_claims: dict[str, list[Claim]] = {}
+    for claim in get_active_claims(item, prop_nr):
+        existing_claims.setdefault(get_claim_value_key(claim), []).append(claim)
+    new_claims = []
+    for claim in claims:
+        matching_claims = existing_claims.get(get_claim_value_key(claim))
+        if matching_claims:
+            matching_claims.pop(0)
+        else:
+            new_claims.append(claim)
+    outdated_claims = [claim for matching_claims in existing_claims.values() for claim in matching_claims]
+    for claim in outdated_claims:
+        if claim.id:
+            claim.remove()
+        else:
+            item.claims.claims[prop_nr].remove(claim)
+    if new_claims:
+        item.claims.add(new_claims, action_if_exists=ActionIfExists.FORCE_APPEND)
+    return bool(new_claims or outdated_claims)
+
+
+def get_field_claims(field: FieldMapping, field_value: Any, language: str = "en") -> list[Claim]:
+    """
+    Get the claims of the given field value
+    :param field: mapping of the field
+    :param field_value: single value or list of values
+    :param language:
+    :return:
+    """
+    if isinstance(field_value, list):
+        values = field_value
+    else:
+        values = [field_value]
+    claims = []
+    for value in values:
+        claim = field.get_claim(value, language)
+        if claim is not None:
+            claims.append(claim)
+    return claims
 
 
 def get_claim(prop_id: str, datatype: str, value: Any, language: str | None = None) -> Claim | None:
@@ -122,31 +386,10 @@ def get_claim(prop_id: str, datatype: str, value: Any, language: str | None = No
         language = "en"
     if value is None:
         return None
-    prop_nr = Wikibase.get_entity_id(prop_id)
-    claim = None
-    match datatype:
-        case datatypes.MonolingualText.DTYPE:
-            claim = datatypes.MonolingualText(language=language, text=value, prop_nr=prop_nr)
-        case datatypes.Item.DTYPE:
-            claim = datatypes.Item(value=value, prop_nr=prop_nr)
-        case datatypes.URL.DTYPE:
-            if isinstance(value, AnyHttpUrl):
-                value = str(value)
-            claim = datatypes.URL(value=value, prop_nr=prop_nr)
-        case datatypes.String.DTYPE:
-            claim = datatypes.String(value=str(value), prop_nr=prop_nr)
-        case datatypes.Time.DTYPE:
-            claim = datatypes.Time(time=value, prop_nr=prop_nr)
-        case datatypes.ExternalID.DTYPE:
-            claim = datatypes.ExternalID(value=value, prop_nr=prop_nr)
-        case datatypes.Quantity.DTYPE:
-            claim = datatypes.Quantity(amount=value, prop_nr=prop_nr)
-        case datatypes.GlobeCoordinate.DTYPE:
-            if isinstance(value, Coordinate):
-                claim = datatypes.GlobeCoordinate(longitude=value.longitude, latitude=value.latitude, prop_nr=prop_nr)
-            else:
-                logger.debug("Value is not a Coordinate object → ignoring in claim creation")
-    return claim
+    converter = CLAIM_CONVERTERS.get(datatype)
+    if converter is None:
+        return None
+    return converter(Wikibase.get_entity_id(prop_id), value, language)
 
 
 def get_snak_value(snak: Snak) -> Any:
@@ -177,27 +420,22 @@ def get_model_from_item(item: ItemEntity, model: type[BaseModel]) -> BaseModel:
     :return:
     """
     default_language = "en"
-    field_name: str
-    field_metadata: FieldInfo
     record = {}
-    for field_name, field_metadata in model.model_fields.items():
-        # field_type = field_metadata.json_schema_extra.get(WIKIBASE_TYPE)
-        field_prop_id = field_metadata.json_schema_extra.get(CEUR_DEV_ID)
+    for field in get_mapping_plan(model).fields.values():
         field_value = None
-        if field_prop_id == "rdf:subject":
+        if field.role is FieldRole.SUBJECT:
             field_value = item.id
-        elif field_prop_id == "rdfs:label":
+        elif field.role is FieldRole.LABEL:
             label = item.labels.get(default_language)
             if label is not None:
                 field_value = label.value
-        elif field_prop_id == "schema:description":
+        elif field.role is FieldRole.DESCRIPTION:
             description = item.descriptions.get(default_language)
             if description is not None:
                 field_value = description.value
-        else:
-            prop_nr = Wikibase.get_entity_id(field_prop_id)
-            claims: list[Claim] = item.claims.get(prop_nr)
-            if get_origin(field_metadata.annotation) is list:
+        elif field.prop_nr is not None:
+            claims: list[Claim] = get_active_claims(item, field.prop_nr)
+            if field.is_list:
                 values = [get_snak_value(claim.mainsnak) for claim in claims]
                 values = [value for value in values if value is not None]
                 field_value = values
@@ -206,7 +444,7 @@ def get_model_from_item(item: ItemEntity, model: type[BaseModel]) -> BaseModel:
                 if claim is not None:
                     field_value = get_snak_value(claim.mainsnak)
         if field_value is not None:
-            record[field_name] = field_value
+            record[field.name] = field_value
     return model.model_validate(record)
 
 
@@ -218,10 +456,8 @@ def get_models_from_qualified_statement[T: StatementBase](item: ItemEntity, mode
     :param model:
     :return:
     """
-    subject_field = model.get_statement_subject(CEUR_DEV_ID)
-    subject_prop_id = model.model_fields.get(subject_field).json_schema_extra.get(CEUR_DEV_ID)
-    subject_prop_nr = Wikibase.get_entity_id(subject_prop_id)
-    claims: list[Claim] = item.claims.get(subject_prop_nr)
+    plan = get_mapping_plan(model)
+    claims: list[Claim] = item.claims.get(plan.get_statement_subject().prop_nr)
     statements: list[StatementBase] = []
     for claim in claims:
         model_obj = get_model_from_qualified_statement(claim, model)
@@ -238,7 +474,8 @@ def get_model_from_qualified_statement(claim: Claim, model: type[StatementBase])
     :return:
     """
     record = {}
-    subject_field = model.get_statement_subject(CEUR_DEV_ID)
+    plan = get_mapping_plan(model)
+    subject_field = plan.get_statement_subject().name
     if claim.mainsnak.snaktype is WikibaseSnakType.UNKNOWN_VALUE:
         record[subject_field] = WikibaseSnakType.UNKNOWN_VALUE.value
     elif claim.mainsnak.snaktype is WikibaseSnakType.NO_VALUE:
@@ -247,31 +484,184 @@ def get_model_from_qualified_statement(claim: Claim, model: type[StatementBase])
         record[subject_field] = get_snak_value(claim.mainsnak)
     if issubclass(model, Statement):
         record["statement_id"] = claim.id
-    qualifier_fields = model.get_qualifier_fields(CEUR_DEV_ID)
-    for qualifier_field in qualifier_fields:
-        field_metadata: FieldInfo = model.model_fields.get(qualifier_field)
-        field_prop_id = field_metadata.json_schema_extra.get(CEUR_DEV_ID)
-        field_prop_nr = Wikibase.get_entity_id(field_prop_id)
-        if field_prop_nr is None:
+    for field in plan.qualifiers:
+        if field.prop_nr is None:
             continue
         else:
-            qualifier: list[Snak] = claim.qualifiers.get(field_prop_nr)
+            qualifier: list[Snak] = claim.qualifiers.get(field.prop_nr)
             if qualifier is None or len(qualifier) == 0:
                 continue
-            elif get_origin(field_metadata.annotation) is list:
+            elif field.is_list:
                 values = [get_snak_value(snak) for snak in qualifier]
-                record[qualifier_field] = values
+                record[field.name] = values
             else:
                 if len(qualifier) > 1:
                     logger.debug(
-                        f"Statement {claim.id} has multiple qualifier values for {field_prop_nr} but the model only "
+                        f"Statement {claim.id} has multiple qualifier values for {field.prop_nr} but the model only "
                         f"supports one value"
                     )
-                record[qualifier_field] = get_snak_value(qualifier[0])
+                record[field.name] = get_snak_value(qualifier[0])
     model_obj = model.model_validate(record)
     return model_obj
 
 
+class StatementIndex:
+    """
+    Index of the statements of one statement model on an item.
+    Lookups follow the ExtractedStatement equality: statements match by object_named_as if both define it, otherwise
+    by the statement subject value.
+    """
+
+    def __init__(self, model: type[StatementBase]):
+        """
+        constructor
+        :param model: statement model the claims are parsed into
+        """
+        self.model = model
+        self.subject_field = get_mapping_plan(model).get_statement_subject()
+        if self.subject_field.prop_nr is None:
+            raise Exception(f"Statement subject of {model.__name__} is not mapped to a property of {CEUR_DEV_ID}")
+        self.prop_nr: str = self.subject_field.prop_nr
+        self.claim_count = 0
+        self._position = 0
+        self._by_subject: dict[Any, list[tuple[int, StatementBase, Claim]]] = {}
+        self._by_named_as: dict[str, list[tuple[int, StatementBase, Claim]]] = {}
+
+    @classmethod
+    def from_item(cls, item: ItemEntity, model: type[StatementBase]) -> "StatementIndex":
+        """
+        Build the index of the given model from the claims of the given item
+        :param item:
+        :param model:
+        :return:
+        """
+        index = cls(model)
+        for claim in get_active_claims(item, index.prop_nr):
+            index.add(get_model_from_qualified_statement(claim, model), claim)
+        return index
+
+    def is_current(self, item: ItemEntity) -> bool:
+        """
+        Check if the index still covers all claims of the indexed property of the given item
+        :param item:
+        :return:
+        """
+        return self.claim_count == len(get_active_claims(item, self.prop_nr))
+
+    def add(self, statement: StatementBase | None, claim: Claim):
+        """
+        Add the given statement to the index
+        :param statement: statement parsed from the claim. None if the claim can not be represented by the model
+        :param claim:
+        :return:
+        """
+        self.claim_count += 1
+        if statement is None:
+            return
+        entry = (self._position, statement, claim)
+        self._position += 1
+        self._by_subject.setdefault(getattr(statement, self.subject_field.name), []).append(entry)
+        named_as = getattr(statement, "object_named_as", None)
+        if named_as is not None:
+            self._by_named_as.setdefault(named_as, []).append(entry)
+
+    def discard(self, claim: Claim):
+        """
+        Remove the statement of the given claim from the index
+        :param claim:
+        :return:
+        """
+        if claim.mainsnak.property_number != self.prop_nr:
+            return
+        self.claim_count -= 1
+        for bucket_map in (self._by_subject, self._by_named_as):
+            for key, entries in list(bucket_map.items()):
+                remaining = [entry for entry in entries if entry[2] is not claim]
+                if not remaining:
+                    del bucket_map[key]
+                elif len(remaining) != len(entries):
+                    bucket_map[key] = remaining
+
+    def find_entry(self, model: StatementBase) -> tuple[StatementBase, Claim] | None:
+        """
+        Find the first indexed statement that equals the given model
+        :param model:
+        :return: statement and its claim or None if no statement matches
+        """
+        subject_value = getattr(model, self.subject_field.name, None)
+        subject_entries = self._by_subject.get(subject_value, [])
+        if not issubclass(self.model, ExtractedStatement):
+            candidates = [entry for entry in subject_entries if entry[1] == model]
+        elif getattr(model, "object_named_as", None) is None:
+            candidates = subject_entries
+        else:
+            candidates = self._by_named_as.get(model.object_named_as, []) + [
+                entry for entry in subject_entries if entry[1].object_named_as is None
+            ]
+        if not candidates:
+            return None
+        _, statement, claim = min(candidates, key=lambda entry: entry[0])
+        return statement, claim
+
+    def find(self, model: StatementBase) -> StatementBase | None:
+        """
+        Find the first indexed statement that equals the given model
+        :param model:
+        :return:
+        """
+        entry = self.find_entry(model)
+        return entry[0] if entry is not None else None
+
+
+_statement_indexes: WeakKeyDictionary[ItemEntity, dict[type[StatementBase], StatementIndex]] = WeakKeyDictionary()
+
+
+def get_active_claims(item: ItemEntity, prop_nr: str) -> list[Claim]:
+    """
+    Get the claims of the given property that are not marked as removed
+    :param item:
+    :param prop_nr:
+    :return:
+    """
+    return [claim for claim in item.claims.get(prop_nr) if not claim.removed]
+
+
+def get_statement_index(item: ItemEntity, model: type[StatementBase]) -> StatementIndex:
+    """
+    Get the statement index of the given model for the given item.
+    The index is built once per loaded item and rebuilt if the claims were modified without updating the index.
+    :param item:
+    :param model:
+    :return:
+    """
+    indexes = _statement_indexes.setdefault(item, {})
+    index = indexes.get(model)
+    if index is None or not index.is_current(item):
+        index = StatementIndex.from_item(item, model)
+        indexes[model] = index
+    return index
+
+
+def discard_claim_from_indexes(item: ItemEntity, claim: Claim):
+    """
+    Remove the given claim from all statement indexes of the item
+    :param item:
+    :param claim:
+    :return:
+    """
+    for index in _statement_indexes.get(item, {}).values():
+        index.discard(claim)
+
+
+def invalidate_statement_indexes(item: ItemEntity):
+    """
+    Drop all statement indexes of the given item
+    :param item:
+    :return:
+    """
+    _statement_indexes.pop(item, None)
+
+
 def add_statement_from_model(item: ItemEntity, model: StatementBase):
     """
     Add model as statement to given item
@@ -279,11 +669,13 @@ def add_statement_from_model(item: ItemEntity, model: StatementBase):
     :param model:
     :return:
     """
-    existing_statement = get_item_statement_by_model(item, model)
+    index = get_statement_index(item, model.__class__)
+    existing_statement = index.find(model)
     if existing_statement is not None:
         raise ValueError(f"Statement already exists ({existing_statement}) ")
     claim = create_qualified_statement_from_model(model)
     item.claims.add(claim, action_if_exists=ActionIfExists.FORCE_APPEND)
+    index.add(model, claim)
 
 
 def get_item_statement_by_model(
@@ -300,11 +692,7 @@ def get_item_statement_by_model(
     """
     if target_model is None:
         target_model = model.__class__
-    statements = get_models_from_qualified_statement(item, target_model)
-    for statement in statements:
-        if statement == model:
-            return statement
-    return None
+    return get_statement_index(item, target_model).find(model)
 
 
 def get_item_statement_by_id(item: ItemEntity, statement_id: str, target_model: type[Statement]) -> Statement | None:
@@ -323,19 +711,13 @@ def get_item_statement_by_id(item: ItemEntity, statement_id: str, target_model:
 
 
 def create_qualified_statement_from_model(model: StatementBase) -> Claim:
-    subject_field = model.get_statement_subject(CEUR_DEV_ID)
-    subject_prop_id = model.model_fields.get(subject_field).json_schema_extra.get(CEUR_DEV_ID)
-    subject_prop_nr = Wikibase.get_entity_id(subject_prop_id)
+    subject_field = get_mapping_plan(model.__class__).get_statement_subject()
+    subject_value = getattr(model, subject_field.name)
     claim: Claim
-    print(getattr(model, subject_field))
-    if getattr(model, subject_field) == WikibaseSnakType.UNKNOWN_VALUE.value:
-        claim = BaseDataType(prop_nr=subject_prop_nr, snaktype=WikibaseSnakType.UNKNOWN_VALUE)
+    if subject_value == WikibaseSnakType.UNKNOWN_VALUE.value:
+        claim = BaseDataType(prop_nr=subject_field.prop_nr, snaktype=WikibaseSnakType.UNKNOWN_VALUE)
     else:
-        claim = get_claim(
-            prop_id=subject_prop_nr,
-            datatype=model.model_fields.get(subject_field).json_schema_extra.get(WIKIBASE_TYPE),
-            value=getattr(model, subject_field),
-        )
+        claim = subject_field.get_claim(subject_value)
     add_qualifier_values_to_statement(claim, model)
     return claim
 
@@ -347,25 +729,12 @@ def add_qualifier_values_to_statement(claim: Claim, model: StatementBase):
     :param model:
     :return:
     """
-    qualifier_fields = model.get_qualifier_fields(CEUR_DEV_ID)
-    for qualifier_field in qualifier_fields:
-        qualifier_metadata: FieldInfo = model.model_fields.get(qualifier_field)
-        qualifier_prop_id = qualifier_metadata.json_schema_extra.get(CEUR_DEV_ID)
-        qualifier_type = qualifier_metadata.json_schema_extra.get(WIKIBASE_TYPE)
-        qualifier_prop_nr = Wikibase.get_entity_id(qualifier_prop_id)
-        qualifiers = []
-        if qualifier_prop_nr is None or getattr(model, qualifier_field) is None:
+    for field in get_mapping_plan(model.__class__).qualifiers:
+        field_value = getattr(model, field.name)
+        if field.prop_nr is None or field_value is None:
             continue
-        elif isinstance(getattr(model, qualifier_field), list):
-            qualifier_values = getattr(model, qualifier_field)
-        else:
-            qualifier_values = [getattr(model, qualifier_field)]
-        for value in qualifier_values:
-            qualifier = get_claim(prop_id=qualifier_prop_nr, datatype=qualifier_type, value=value)
-            qualifiers.append(qualifier)
-        for snak in qualifiers:
-            if snak is not None:
-                claim.qualifiers.add(snak, action_if_exists=ActionIfExists.FORCE_APPEND)
+        for snak in get_field_claims(field, field_value):
+            claim.qualifiers.add(snak, action_if_exists=ActionIfExists.FORCE_APPEND)
 
 
 def delete_property_statement_by_id(item: ItemEntity, statement_id: str, model_type: type[Statement]) -> bool:
@@ -376,12 +745,11 @@ def delete_property_statement_by_id(item: ItemEntity, statement_id: str, model_t
     :param model_type:
     :return: True if the statement was deleted otherwise False if the statement was not found
     """
-    subject_field = model_type.get_statement_subject(CEUR_DEV_ID)
-    subject_prop_id = model_type.model_fields.get(subject_field).json_schema_extra.get(CEUR_DEV_ID)
-    subject_prop_nr = Wikibase.get_entity_id(subject_prop_id)
-    for claim in item.claims.get(subject_prop_nr):
+    subject_field = get_mapping_plan(model_type).get_statement_subject()
+    for claim in item.claims.get(subject_field.prop_nr):
         if claim.id == statement_id:
             claim.remove()
+            discard_claim_from_indexes(item, claim)
             return True
     return False
 
@@ -393,15 +761,13 @@ def delete_statement_by_matching_model(item: ItemEntity, model: StatementBase) -
     :param model:
     :return:
     """
-    subject_field = model.get_statement_subject(CEUR_DEV_ID)
-    subject_prop_id = model.model_fields.get(subject_field).json_schema_extra.get(CEUR_DEV_ID)
-    subject_prop_nr = Wikibase.get_entity_id(subject_prop_id)
-    for claim in item.claims.get(subject_prop_nr):
-        claim_model = get_model_from_qualified_statement(claim, model.__class__)
-        if claim_model == model:
-            claim.remove()
-            return True
-    return False
+    entry = get_statement_index(item, model.__class__).find_entry(model)
+    if entry is None:
+        return False
+    _, claim = entry
+    claim.remove()
+    discard_claim_from_indexes(item, claim)
+    return True
 
 
 def get_calim_by_statement_id(item: ItemEntity, statement_id: str) -> Claim | None:
@@ -428,33 +794,23 @@ def update_qualified_statement_from_model(item: ItemEntity, statement_id: str, m
     claim = get_calim_by_statement_id(item, statement_id)
     if claim is None:
         raise ValueError("Statement not found")
-    statement_object_field = model.get_statement_subject(CEUR_DEV_ID)
-    statement_object_value = getattr(model, statement_object_field)
-    statement_metadata = model.model_fields.get(statement_object_field)
-    statement_prop_id = statement_metadata.json_schema_extra.get(CEUR_DEV_ID)
-    statement_prop_nr = Wikibase.get_entity_id(statement_prop_id)
-    statement_type = statement_metadata.json_schema_extra.get(WIKIBASE_TYPE)
+    invalidate_statement_indexes(item)
+    plan = get_mapping_plan(model.__class__)
+    statement_field = plan.get_statement_subject()
+    statement_object_value = getattr(model, statement_field.name)
     if statement_object_value is not None:
         if (
             issubclass(model.__class__, ExtractedStatement)
             and statement_object_value == WikibaseSnakType.UNKNOWN_VALUE.value
         ):
-            new_mainsnak = BaseDataType(prop_nr=statement_prop_nr, snaktype=WikibaseSnakType.UNKNOWN_VALUE)
+            new_mainsnak = BaseDataType(prop_nr=statement_field.prop_nr, snaktype=WikibaseSnakType.UNKNOWN_VALUE)
         else:
-            new_mainsnak = get_claim(
-                prop_id=statement_prop_id,
-                datatype=statement_type,
-                value=statement_object_value,
-            )
+            new_mainsnak = statement_field.get_claim(statement_object_value)
         claim.mainsnak = new_mainsnak.mainsnak
-    qualifier_fields = model.get_qualifier_fields(CEUR_DEV_ID)
-    for model_field in model.model_fields_set:
-        if model_field not in qualifier_fields:
+    for field in plan.qualifiers:
+        if field.name not in model.model_fields_set:
             continue
-        qualifier_metadata = model.model_fields.get(model_field)
-        qualifier_prop_id = qualifier_metadata.json_schema_extra.get(CEUR_DEV_ID)
-        qualifier_prop_nr = Wikibase.get_entity_id(qualifier_prop_id)
         # remove existing values
-        for qualifier_snak in claim.qualifiers.get(qualifier_prop_nr):
+        for qualifier_snak in claim.qualifiers.get(field.prop_nr):
             claim.qualifiers.remove(qualifier_snak)
     add_qualifier_values_to_statement(claim, model)
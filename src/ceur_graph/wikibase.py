@@ -1,18 +1,30 @@
+import asyncio
 import functools
-import hashlib
 import logging
+import threading
 import time
+from collections import deque
+from collections.abc import AsyncGenerator, AsyncIterator, Callable, Iterator
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date, datetime, timedelta
 from string import Template
+from typing import Any
 
 from pydantic import BaseModel, HttpUrl
-from SPARQLWrapper import JSON, POST, SPARQLWrapper
-from wikibaseintegrator import WikibaseIntegrator, wbi_login
+from wikibaseintegrator import WikibaseIntegrator, wbi_helpers, wbi_login
 from wikibaseintegrator.entities import ItemEntity, PropertyEntity
 from wikibaseintegrator.models import Snak
+from wikibaseintegrator.wbi_helpers import mediawiki_api_call_helper
 
+from ceur_graph.chunk_scheduler import get_chunk_scheduler, is_timeout_error
 from ceur_graph.datamodel.auth import WikibaseAuthorizationConfig, WikibaseLoginTypes
+from ceur_graph.entity_cache import EntityCache
+from ceur_graph.mirror import WikibaseMirror
+from ceur_graph.query_cache import QueryCache
+from ceur_graph.resilience import classify_mediawiki_error, get_endpoint_guard, install_mediawiki_hook
+from ceur_graph.sparql import RowFormat, SparqlClient
+from ceur_graph.term_store import TermDictionary
+from ceur_graph.write_queue import get_write_queue
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +34,102 @@ def get_default_user_agent() -> str:
     return f"FactGridSyncWdBot 1.0 ({date.today()})"
 
 
+_sparql_client: SparqlClient | None = None
+_sparql_client_lock = threading.Lock()
+
+
+def get_sparql_client() -> SparqlClient:
+    """Get the process wide SPARQL client which holds the shared connection pool"""
+    global _sparql_client
+    with _sparql_client_lock:
+        if _sparql_client is None:
+            _sparql_client = SparqlClient(user_agent=get_default_user_agent())
+        return _sparql_client
+
+
+def close_sparql_client():
+    """Close the connection pool of the process wide SPARQL client. A later query creates a new client"""
+    global _sparql_client
+    with _sparql_client_lock:
+        client, _sparql_client = _sparql_client, None
+    if client is not None:
+        client.close()
+
+
+_query_cache: QueryCache | None = QueryCache()
+# the datatype of a property can not be changed
+PROPERTY_TYPES_TTL = 24 * 60 * 60
+
+
+def get_query_cache() -> QueryCache | None:
+    """Get the process wide SPARQL result cache or None if caching is disabled"""
+    return _query_cache
+
+
+def set_query_cache(cache: QueryCache | None):
+    """Set the process wide SPARQL result cache. Use None to disable caching"""
+    global _query_cache
+    _query_cache = cache
+
+
+_entity_cache: EntityCache | None = EntityCache()
+
+
+def get_entity_cache() -> EntityCache | None:
+    """Get the process wide entity cache or None if caching is disabled"""
+    return _entity_cache
+
+
+def set_entity_cache(cache: EntityCache | None):
+    """Set the process wide entity cache. Use None to disable caching"""
+    global _entity_cache
+    _entity_cache = cache
+
+
+_mirrors: dict[str, WikibaseMirror] = {}
+
+
+def get_mirror(mediawiki_api_url: HttpUrl | str) -> WikibaseMirror | None:
+    """Get the local mirror of the given wikibase instance or None if the instance is not mirrored"""
+    if isinstance(mediawiki_api_url, HttpUrl):
+        mediawiki_api_url = mediawiki_api_url.unicode_string()
+    return _mirrors.get(mediawiki_api_url)
+
+
+def set_mirror(mirror: WikibaseMirror):
+    """Register the local mirror of a wikibase instance"""
+    _mirrors[mirror.mediawiki_api_url] = mirror
+
+
+def remove_mirror(mediawiki_api_url: HttpUrl | str):
+    """Remove the local mirror of the given wikibase instance"""
+    if isinstance(mediawiki_api_url, HttpUrl):
+        mediawiki_api_url = mediawiki_api_url.unicode_string()
+    _mirrors.pop(mediawiki_api_url, None)
+
+
+_term_dictionaries: dict[str, TermDictionary] = {}
+
+
+def get_term_dictionary(mediawiki_api_url: HttpUrl | str) -> TermDictionary | None:
+    """Get the term dictionary of the given wikibase instance or None if labels and property types are not stored"""
+    if isinstance(mediawiki_api_url, HttpUrl):
+        mediawiki_api_url = mediawiki_api_url.unicode_string()
+    return _term_dictionaries.get(mediawiki_api_url)
+
+
+def set_term_dictionary(term_dictionary: TermDictionary):
+    """Register the term dictionary of a wikibase instance"""
+    _term_dictionaries[term_dictionary.mediawiki_api_url] = term_dictionary
+
+
+def remove_term_dictionary(mediawiki_api_url: HttpUrl | str):
+    """Remove the term dictionary of the given wikibase instance"""
+    if isinstance(mediawiki_api_url, HttpUrl):
+        mediawiki_api_url = mediawiki_api_url.unicode_string()
+    _term_dictionaries.pop(mediawiki_api_url, None)
+
+
 def log_execution_time(func):
     """
     Function decorator to log execution time of functions
@@ -55,6 +163,196 @@ class Wikibase(BaseModel):
         for i in range(0, len(lst), n):
             yield lst[i : i + n]
 
+    @classmethod
+    async def _stream_values_query_chunks(
+        cls,
+        query_template: Template,
+        param_name: str,
+        values: list[str],
+        endpoint_url: HttpUrl,
+        chunk_size: int | None = None,
+        max_concurrency: int = 10,
+        preserve_order: bool = False,
+        ttl: float | None = None,
+    ) -> AsyncGenerator[list[dict]]:
+        """Execute given query in chunks and yield the result rows of each chunk as soon as it is available
+        Duplicate values are queried only once. All chunks share the connection pool of the SPARQL client. Unless a
+        fixed chunk size is given, the chunk size and the number of concurrent chunks are tuned by the chunk scheduler
+        of the endpoint. Chunks that time out are split in half and retried.
+        :param query_template:
+        :param param_name:
+        :param values:
+        :param endpoint_url:
+        :param chunk_size: fixed chunk size. If None the chunk size is chosen by the chunk scheduler
+        :param max_concurrency: maximum number of chunks queried concurrently
+        :param preserve_order: If True the chunk results are yielded in the order of the values. Otherwise in the
+        order the chunks complete
+        :param ttl: time to live of the cached chunk results in seconds. If None the default ttl of the query cache is
+        used
+        :return: result rows of each chunk
+        """
+        scheduler = get_chunk_scheduler(endpoint_url)
+        values = list(dict.fromkeys(values))
+
+        async def query_chunk(item_id_chunk: list[str]) -> list[dict]:
+            source_items = "\n".join(item_id_chunk)
+            query = query_template.substitute(**{param_name: source_items})
+            logger.debug(f"Querying chunk of size {len(item_id_chunk)} from {endpoint_url}")
+            start = time.perf_counter()
+            lod = await cls.aexecute_query(query=query, endpoint_url=endpoint_url, ttl=ttl)
+            scheduler.record_success(len(item_id_chunk), time.perf_counter() - start, len(query.encode("utf-8")))
+            return lod
+
+        # chunks are identified by the position of their first value to restore the order of split chunks
+        retry_chunks: deque[tuple[int, list[str]]] = deque()
+        completed: dict[int, tuple[int, list[dict]]] = {}
+        next_position = 0
+        position = 0
+        running: dict[asyncio.Future, tuple[int, list[str]]] = {}
+        try:
+            while retry_chunks or position < len(values) or running:
+                concurrency = min(max_concurrency, scheduler.concurrency)
+                while len(running) < concurrency and (retry_chunks or position < len(values)):
+                    if retry_chunks:
+                        chunk_position, chunk = retry_chunks.popleft()
+                    else:
+                        size = chunk_size if chunk_size is not None else scheduler.chunk_size
+                        chunk_position, chunk = position, values[position : position + size]
+                        position += size
+                    running[asyncio.ensure_future(query_chunk(chunk))] = (chunk_position, chunk)
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=lambda t: running[t][0]):
+                    chunk_position, chunk = running.pop(task)
+                    try:
+                        lod = task.result()
+                    except Exception as e:
+                        if not is_timeout_error(e) or len(chunk) <= 1:
+                            raise e
+                        scheduler.record_timeout(len(chunk))
+                        scheduler.record_split()
+                        logger.debug(f"Chunk of size {len(chunk)} timed out → retrying in two halves")
+                        half = len(chunk) // 2
+                        retry_chunks.appendleft((chunk_position + half, chunk[half:]))
+                        retry_chunks.appendleft((chunk_position, chunk[:half]))
+                        continue
+                    if not preserve_order:
+                        yield lod
+                        continue
+                    completed[chunk_position] = (len(chunk), lod)
+                    while next_position in completed:
+                        number_of_values, lod = completed.pop(next_position)
+                        next_position += number_of_values
+                        yield lod
+        finally:
+            for pending_task in running:
+                pending_task.cancel()
+
+    @classmethod
+    async def aiter_values_query_in_chunks(
+        cls,
+        query_template: Template,
+        param_name: str,
+        values: list[str],
+        endpoint_url: HttpUrl,
+        chunk_size: int | None = None,
+        max_concurrency: int = 10,
+        preserve_order: bool = False,
+    ) -> AsyncIterator[dict]:
+        """Execute given query in chunks and yield the result rows as soon as their chunk is completed
+        :param query_template:
+        :param param_name:
+        :param values: duplicate values are queried only once
+        :param endpoint_url:
+        :param chunk_size: fixed chunk size. If None the chunk size is chosen by the chunk scheduler
+        :param max_concurrency: maximum number of chunks queried concurrently
+        :param preserve_order: If True the rows are yielded in the order of the values of their chunks
+        :return: result rows
+        """
+        stream = cls._stream_values_query_chunks(
+            query_template=query_template,
+            param_name=param_name,
+            values=values,
+            endpoint_url=endpoint_url,
+            chunk_size=chunk_size,
+            max_concurrency=max_concurrency,
+            preserve_order=preserve_order,
+        )
+        try:
+            async for lod in stream:
+                for row in lod:
+                    yield row
+        finally:
+            await stream.aclose()
+
+    @classmethod
+    def iter_values_query_in_chunks(
+        cls,
+        query_template: Template,
+        param_name: str,
+        values: list[str],
+        endpoint_url: HttpUrl,
+        chunk_size: int | None = None,
+        max_concurrency: int = 10,
+        preserve_order: bool = False,
+        ttl: float | None = None,
+    ) -> Iterator[dict]:
+        """Execute given query in chunks and yield the result rows as soon as their chunk is completed
+        Use this instead of execute_values_query_in_chunks to process the results of large lookups while the remaining
+        chunks are still queried.
+        :param query_template:
+        :param param_name:
+        :param values: duplicate values are queried only once
+        :param endpoint_url:
+        :param chunk_size: fixed chunk size. If None the chunk size is chosen by the chunk scheduler
+        :param max_concurrency: maximum number of chunks queried concurrently
+        :param preserve_order: If True the rows are yielded in the order of the values of their chunks
+        :param ttl: time to live of the cached chunk results in seconds. If None the default ttl of the query cache is
+        used
+        :return: result rows
+        """
+        stream = cls._stream_values_query_chunks(
+            query_template=query_template,
+            param_name=param_name,
+            values=values,
+            endpoint_url=endpoint_url,
+            chunk_size=chunk_size,
+            max_concurrency=max_concurrency,
+            preserve_order=preserve_order,
+            ttl=ttl,
+        )
+        return get_sparql_client().iter_stream(stream)
+
+    @classmethod
+    async def aexecute_values_query_in_chunks(
+        cls,
+        query_template: Template,
+        param_name: str,
+        values: list[str],
+        endpoint_url: HttpUrl,
+        chunk_size: int | None = None,
+        max_concurrency: int = 10,
+    ) -> list[dict]:
+        """Execute given query in chunks to speedup execution
+        :param chunk_size: fixed chunk size. If None the chunk size is chosen by the chunk scheduler
+        :param endpoint_url:
+        :param query_template:
+        :param param_name:
+        :param values:
+        :param max_concurrency: maximum number of chunks queried concurrently
+        :return:
+        """
+        return [
+            row
+            async for row in cls.aiter_values_query_in_chunks(
+                query_template=query_template,
+                param_name=param_name,
+                values=values,
+                endpoint_url=endpoint_url,
+                chunk_size=chunk_size,
+                max_concurrency=max_concurrency,
+            )
+        ]
+
     @classmethod
     def execute_values_query_in_chunks(
         cls,
@@ -62,90 +360,135 @@ class Wikibase(BaseModel):
         param_name: str,
         values: list[str],
         endpoint_url: HttpUrl,
-        chunk_size: int = 1000,
-    ):
+        chunk_size: int | None = None,
+        max_concurrency: int = 10,
+    ) -> list[dict]:
         """Execute given query in chunks to speedup execution
-        :param chunk_size:
+        :param chunk_size: fixed chunk size. If None the chunk size is chosen by the chunk scheduler
         :param endpoint_url:
         :param query_template:
         :param param_name:
         :param values:
+        :param max_concurrency: maximum number of chunks queried concurrently
         :return:
         """
-        lod = []
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            futures = []
-            for item_id_chunk in cls.chunks(values, chunk_size):
-                source_items = "\n".join(item_id_chunk)
-                query = query_template.substitute(**{param_name: source_items})
-                logger.debug(f"Querying chunk of size {len(item_id_chunk)} labels from {endpoint_url}")
-                future = executor.submit(
-                    cls.execute_query,
-                    query=query,
-                    endpoint_url=endpoint_url,
-                )
-                futures.append(future)
-            for future in as_completed(futures):
-                lod_chunk = future.result()
-                lod.extend(lod_chunk)
-        return lod
+        return get_sparql_client().run(
+            cls.aexecute_values_query_in_chunks(
+                query_template=query_template,
+                param_name=param_name,
+                values=values,
+                endpoint_url=endpoint_url,
+                chunk_size=chunk_size,
+                max_concurrency=max_concurrency,
+            )
+        )
 
     @classmethod
-    def execute_query(cls, query: str, endpoint_url: HttpUrl) -> list[dict]:
+    async def aexecute_query(cls, query: str, endpoint_url: HttpUrl, ttl: float | None = None) -> list[dict]:
         """Execute given query against given endpoint
         :param query:
         :param endpoint_url:
+        :param ttl: time to live of the cached result in seconds. If None the default ttl of the cache is used, which
+        disables caching unless the cache is configured otherwise. 0 bypasses the cache
         :return:
         """
         if query is None:
             logger.debug("No query provided")
             return None
         query_first_line = query.split("\n")[0][:30] if query.strip().startswith("#") else ""
-        query_hash = hashlib.sha512(query.encode("utf-8")).hexdigest()
+        query_hash = QueryCache.get_key(query, endpoint_url)
+        cache = get_query_cache()
+        if cache is not None and (ttl if ttl is not None else cache.default_ttl) <= 0:
+            cache = None
+        if cache is not None:
+            lod = cache.get(query, endpoint_url)
+            if lod is not None:
+                logger.debug(f"Query {query_first_line} ({query_hash}) served from cache")
+                return lod
         logger.debug(f"Executing SPARQL query {query_first_line} ({query_hash}) against {endpoint_url}")
         start = datetime.now()
-        sparql = SPARQLWrapper(
-            endpoint_url.unicode_string(),
-            agent=get_default_user_agent(),
-            returnFormat=JSON,
-        )
-        sparql.setQuery(query)
-        sparql.setMethod(POST)
-        resp = sparql.query().convert()
-        lod_raw = resp.get("results", {}).get("bindings")
+        lod = [row async for row in get_sparql_client().aiter_query(query, endpoint_url)]
         logger.debug(
-            f"Query ({query_hash}) execution finished! execution time : {(datetime.now() - start).total_seconds()}s, No. results: {len(lod_raw)}",  # noqa: E501
+            f"Query ({query_hash}) execution finished! execution time : {(datetime.now() - start).total_seconds()}s, No. results: {len(lod)}",  # noqa: E501
         )
-        lod = []
-        for d_raw in lod_raw:
-            d = {key: record.get("value", None) for key, record in d_raw.items()}
-            if d:
-                lod.append(d)
+        if cache is not None:
+            cache.set(query, endpoint_url, lod, ttl=ttl)
         return lod
 
     @classmethod
-    def execute_ask_query(cls, query: str, endpoint_url: HttpUrl) -> bool:
+    def execute_query(cls, query: str, endpoint_url: HttpUrl, ttl: float | None = None) -> list[dict]:
+        """Execute given query against given endpoint
+        :param query:
+        :param endpoint_url:
+        :param ttl: time to live of the cached result in seconds. If None the default ttl of the cache is used, which
+        disables caching unless the cache is configured otherwise. 0 bypasses the cache
+        :return:
+        """
+        return get_sparql_client().run(cls.aexecute_query(query, endpoint_url, ttl=ttl))
+
+    @classmethod
+    def iter_query(cls, query: str, endpoint_url: HttpUrl, row_format: RowFormat = "dict") -> Iterator[Any]:
+        """Execute given query against given endpoint and yield the result rows while the response is received.
+        Use this instead of execute_query for large results as the complete result is never held in memory. The result
+        is not cached.
+        :param query:
+        :param endpoint_url:
+        :param row_format: format of the rows. dict rows map the variables to the values, tuple and namedtuple rows
+        contain the values in the order of the query variables
+        :return:
+        """
+        logger.debug(f"Streaming SPARQL query ({QueryCache.get_key(query, endpoint_url)}) from {endpoint_url}")
+        return get_sparql_client().iter_query(query, endpoint_url, row_format=row_format)
+
+    @classmethod
+    def aiter_query(cls, query: str, endpoint_url: HttpUrl, row_format: RowFormat = "dict") -> AsyncIterator[Any]:
+        """Execute given query against given endpoint and yield the result rows while the response is received.
+        :param query:
+        :param endpoint_url:
+        :param row_format: format of the rows. Either dict, tuple or namedtuple
+        :return:
+        """
+        return get_sparql_client().aiter_query(query, endpoint_url, row_format=row_format)
+
+    @classmethod
+    async def aexecute_ask_query(cls, query: str, endpoint_url: HttpUrl) -> bool:
         """
         Execute given ask query against given endpoint
         :param query:
         :param endpoint_url:
         :return:
         """
-        sparql = SPARQLWrapper(
-            endpoint_url.unicode_string(),
-            agent=get_default_user_agent(),
-            returnFormat=JSON,
-        )
-        sparql.setQuery(query)
-        sparql.setMethod(POST)
-        resp = sparql.query().convert()
+        resp = await get_sparql_client().aquery(query, endpoint_url)
         return resp.get("boolean", False)
 
+    @classmethod
+    def execute_ask_query(cls, query: str, endpoint_url: HttpUrl) -> bool:
+        """
+        Execute given ask query against given endpoint
+        :param query:
+        :param endpoint_url:
+        :return:
+        """
+        return get_sparql_client().run(cls.aexecute_ask_query(query, endpoint_url))
+
     def get_property_types_of(self, prop_ids: set[str]) -> dict[str, str]:
         """Get the property types for the given properties
+        If a term dictionary is registered for this instance only the types missing in the dictionary are queried.
         :param prop_ids:
         :return:
         """
+        prefix = self.item_prefix.unicode_string()
+        properties = [prop_id if prop_id.startswith(prefix) else prefix + prop_id for prop_id in prop_ids]
+        term_dictionary = get_term_dictionary(self.mediawiki_api_url)
+        if term_dictionary is not None:
+            return term_dictionary.get_property_types(properties)
+        return self.query_property_types(properties)
+
+    def query_property_types(self, properties: list[str]) -> dict[str, str]:
+        """Query the property types for the given properties
+        :param properties: property URIs
+        :return:
+        """
         query_template = Template("""
         SELECT ?property ?type {
           VALUES ?property {
@@ -155,20 +498,27 @@ class Wikibase(BaseModel):
           ?property wikibase:propertyType ?type.
         }
         """)
-        values = []
-        prefix = self.item_prefix.unicode_string()
-        for prop_id in prop_ids:
-            if not prop_id.startswith(prefix):
-                prop_id = prefix + prop_id
-            values.append(f"<{prop_id}>")
-
-        lod = self.execute_values_query_in_chunks(
+        rows = self.iter_values_query_in_chunks(
             query_template=query_template,
             param_name="prop_ids",
-            values=values,
+            values=[f"<{prop}>" for prop in properties],
             endpoint_url=self.sparql_endpoint,
+            ttl=PROPERTY_TYPES_TTL,
         )
-        return {d.get("property"): d.get("type") for d in lod}
+        return {d["property"]: d["type"] for d in rows if d.get("property") is not None and d.get("type") is not None}
+
+    def query_all_property_types(self) -> dict[str, str]:
+        """Query the types of all properties
+        :return:
+        """
+        query = """
+        SELECT ?property ?type {
+          ?property rdf:type wikibase:Property.
+          ?property wikibase:propertyType ?type.
+        }
+        """
+        rows = self.iter_query(query, self.sparql_endpoint, row_format="tuple")
+        return {prop: prop_type for prop, prop_type in rows}
 
     def get_entity_label(
         self,
@@ -176,10 +526,22 @@ class Wikibase(BaseModel):
         language: str | None = None,
     ) -> dict[str, str]:
         """Get the labels for the given entities
-        :param endpoint_url:
+        If a term dictionary is registered for this instance only the labels missing in the dictionary are queried.
         :param entity_ids:
         :param language: if None english will be used
-        :param item_prefix:
+        :return:
+        """
+        if language is None:
+            language = "en"
+        term_dictionary = get_term_dictionary(self.mediawiki_api_url)
+        if term_dictionary is not None:
+            return term_dictionary.get_labels(entity_ids, language)
+        return self.query_entity_labels(entity_ids, language)
+
+    def query_entity_labels(self, entity_ids: list[str], language: str) -> dict[str, str]:
+        """Query the labels for the given entities
+        :param entity_ids: entity URIs
+        :param language:
         :return:
         """
         query_raw = Template("""
@@ -192,17 +554,15 @@ class Wikibase(BaseModel):
           ?qid rdfs:label ?label. FILTER(lang(?label)="$language")
         }
         """)
-        if language is None:
-            language = "en"
         query_template = Template(query_raw.safe_substitute(language=language, item_prefix=self.item_prefix))
         values = [f"<{entity_id}>" for entity_id in entity_ids]
-        lod = self.execute_values_query_in_chunks(
+        rows = self.iter_values_query_in_chunks(
             query_template=query_template,
             param_name="entity_ids",
             values=values,
             endpoint_url=self.sparql_endpoint,
         )
-        return {d.get("qid"): d.get("label") for d in lod}
+        return {d["qid"]: d["label"] for d in rows if d.get("qid") is not None and d.get("label") is not None}
 
     def get_wbi_login(self) -> wbi_login._Login:
         """Get WikibaseIntegrator login
@@ -254,19 +614,155 @@ class Wikibase(BaseModel):
             self._wbi = wbi
         return self._wbi
 
+    def login(self, renew: bool = False) -> wbi_login._Login | None:
+        """Log in to this wikibase instance. The login is kept and used for all following requests
+        :param renew: If True the current login is replaced by a new one
+        :return: login or None if no authorization is configured
+        """
+        if renew:
+            self._wbi = WikibaseIntegrator(login=self.get_wbi_login())
+        return self.wbi.login
+
+    def refresh_edit_token(self):
+        """Request a new edit token for the current login so that edits do not have to renew it
+        :return:
+        """
+        login = self.wbi.login
+        if login is not None:
+            login.generate_edit_credentials()
+            login.instantiation_time = time.time()
+
     @log_execution_time
-    def get_item(self, qid: str) -> ItemEntity:
+    def get_item(self, qid: str, for_update: bool = False) -> ItemEntity:
         """Get wikibase item by id
+        Items are served from the local mirror if it is fresh or from the entity cache if the cached revision is still
+        the current one.
         :param qid: Qid of the item
+        :param for_update: If True the current revision of the item is loaded. The mirror is skipped as it might lag
+        behind and a cached entity is only used after its revision was revalidated
         :return:
         """
         qid = self.get_entity_id(qid)
-        item = self.wbi.item.get(
-            qid,
+        mirror = None if for_update else get_mirror(self.mediawiki_api_url)
+        if mirror is not None:
+            entity_json = mirror.get_entity_json(qid)
+            if entity_json is not None:
+                return ItemEntity(api=self.wbi).from_json(entity_json)
+        cache = get_entity_cache()
+        entity_uri = self.get_entity_uri(qid)
+        if cache is not None:
+            entry = cache.get(entity_uri)
+            if entry is not None:
+                if not for_update and not cache.needs_revalidation(entry):
+                    cache.mark_valid(entity_uri)
+                    return ItemEntity(api=self.wbi).from_json(entry.get_entity_json())
+                elif self.get_lastrevids([qid]).get(qid) == entry.lastrevid:
+                    cache.mark_valid(entity_uri, revalidated=True)
+                    return ItemEntity(api=self.wbi).from_json(entry.get_entity_json())
+                else:
+                    cache.evict(entity_uri, outdated=True)
+        entity_json = self._get_entities_json([qid]).get(qid, {"id": qid, "missing": ""})
+        item = ItemEntity(api=self.wbi).from_json(entity_json)
+        if cache is not None:
+            cache.set(entity_uri, entity_json)
+        return item
+
+    def get_lastrevids(self, qids: list[str]) -> dict[str, int]:
+        """Get the current revision ids of the given entities without loading the entity data
+        :param qids: Qids of the entities (at most 50)
+        :return: lastrevid by entity id. Missing entities are not included
+        """
+        res = self.call_mediawiki(
+            mediawiki_api_call_helper,
+            data={"action": "wbgetentities", "ids": "|".join(qids), "props": "info", "format": "json"},
+            login=self.wbi.login,
+            allow_anonymous=True,
             mediawiki_api_url=self.mediawiki_api_url.unicode_string(),
             user_agent=get_default_user_agent(),
         )
-        return item
+        return {
+            entity_id: int(entity_json["lastrevid"])
+            for entity_id, entity_json in res.get("entities", {}).items()
+            if "lastrevid" in entity_json
+        }
+
+    def get_entity_uri(self, entity_id: str) -> str:
+        """Get the URI of the given entity id
+        :param entity_id:
+        :return:
+        """
+        return f"{self.item_prefix.unicode_string()}{self.get_entity_id(entity_id)}"
+
+    @log_execution_time
+    def get_items(self, qids: list[str], chunk_size: int = 50, max_workers: int = 4) -> list[ItemEntity | None]:
+        """Get multiple wikibase items with one wbgetentities request per chunk of ids
+        :param qids: Qids of the items
+        :param chunk_size: number of items per request. The MediaWiki API allows at most 50 ids per request
+        :param max_workers: maximum number of concurrent requests
+        :return: items in the order of the given qids. Items that do not exist are returned as None
+        """
+        entity_ids = [self.get_entity_id(qid) for qid in qids]
+        unique_ids = list(dict.fromkeys(entity_ids))
+        items: dict[str, ItemEntity | None] = {}
+        cache = get_entity_cache()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self._get_entities_json, id_chunk) for id_chunk in self.chunks(unique_ids, chunk_size)
+            ]
+            for future in as_completed(futures):
+                for entity_id, entity_json in future.result().items():
+                    if "missing" in entity_json:
+                        logger.debug(f"Item {entity_id} does not exist")
+                        items[entity_id] = None
+                    else:
+                        items[entity_id] = ItemEntity(api=self.wbi).from_json(entity_json)
+                        if cache is not None:
+                            cache.set(self.get_entity_uri(entity_id), entity_json)
+        return [items.get(entity_id) for entity_id in entity_ids]
+
+    def get_entities_json(self, entity_ids: list[str], chunk_size: int = 50) -> dict[str, dict]:
+        """Get the json representation of the given entities with one wbgetentities request per chunk of ids
+        :param entity_ids: ids of the entities
+        :param chunk_size: number of entities per request
+        :return: entity json by entity id. Missing entities are marked with the key "missing"
+        """
+        entities = {}
+        for id_chunk in self.chunks(entity_ids, chunk_size):
+            entities.update(self._get_entities_json(id_chunk))
+        return entities
+
+    def _get_entities_json(self, entity_ids: list[str]) -> dict[str, dict]:
+        """Get the json representation of the given entities with one wbgetentities request
+        :param entity_ids: ids of the entities (at most 50)
+        :return: entity json by entity id
+        """
+        res = self.call_mediawiki(
+            mediawiki_api_call_helper,
+            data={"action": "wbgetentities", "ids": "|".join(entity_ids), "format": "json"},
+            login=self.wbi.login,
+            allow_anonymous=True,
+            mediawiki_api_url=self.mediawiki_api_url.unicode_string(),
+            user_agent=get_default_user_agent(),
+        )
+        return res.get("entities", {})
+
+    def call_mediawiki[T](self, func: Callable[..., T], *args, max_retries: int | None = None, **kwargs) -> T:
+        """Call a wikibaseintegrator function querying the MediaWiki API of this instance through the resilience layer
+        The internal retries of wikibaseintegrator are disabled in favour of the rate limiting, backoff and circuit
+        breaker of the instance.
+        :param func: wikibaseintegrator function accepting the request arguments of mediawiki_api_call_helper
+        :param args: arguments of the function
+        :param max_retries: number of retries. Defaults to the retries of the resilience layer
+        :param kwargs: keyword arguments of the function
+        :return: result of the function
+        """
+        guard = get_endpoint_guard(self.mediawiki_api_url)
+        install_mediawiki_hook(wbi_helpers.default_session)
+        login = kwargs.get("login")
+        if login is not None:
+            install_mediawiki_hook(login.get_session())
+        call = functools.partial(func, *args, max_retries=1, retry_after=0, timeout=guard.request_timeout, **kwargs)
+        return guard.call(call, classify=classify_mediawiki_error, max_retries=max_retries)
 
     @log_execution_time
     def write_item(
@@ -278,33 +774,90 @@ class Wikibase(BaseModel):
         max_retries: int | None = None,
     ) -> ItemEntity | None:
         """Write the given item to the wikibase instance
-        :param max_retries:
+        :param max_retries: number of retries if the instance is throttling or unavailable. Defaults to the retries
+        of the resilience layer of the instance. Scheduled runs should use a low value
         :param fix_known_issues:
         :param item: item to write
         :param summary: summary of the changes
         :param tags: tags to add to the edit
         :return:
-        ToDo: add max retry for scheduled runs it needs to be low
         """
-        kwargs = dict()
-        if max_retries is not None:
-            kwargs["max_retries"] = max_retries
         try:
             if fix_known_issues:
                 self._fix_known_entity_issues(item)
-            res = item.write(
+            res = self.call_mediawiki(
+                item.write,
+                max_retries=max_retries,
                 mediawiki_api_url=self.mediawiki_api_url,
                 summary=summary,
                 tags=tags,
                 login=self.wbi.login,
                 user_agent=get_default_user_agent(),
-                **kwargs,
             )
         except Exception as e:
             logger.error(f"Failed to write item {item.id}: {e}")
             raise e
+        self.evict_cached_entity(item.id)
+        self.invalidate_query_cache()
+        self.mark_mirror_outdated(item.id)
+        self.invalidate_terms(item.id)
         return res
 
+    def modify_item[T](
+        self,
+        qid: str,
+        modify: Callable[[ItemEntity], bool],
+        get_result: Callable[[ItemEntity], T],
+        summary: str | None = None,
+    ) -> T:
+        """Apply the given modification to the current state of the item and write it
+        Modifications of the same item are serialized. Modifications submitted at almost the same time are applied to
+        one freshly loaded entity and written as one revision.
+        :param qid: id of the item
+        :param modify: applies the modification to the item and returns whether the item changed
+        :param get_result: computes the result from the written item
+        :param summary: summary of the modification
+        :return: result of the modification
+        """
+        return get_write_queue().submit(self, qid, modify=modify, get_result=get_result, summary=summary)
+
+    def evict_cached_entity(self, entity_id: str | None):
+        """Remove the given entity from the entity cache
+        :param entity_id:
+        :return:
+        """
+        cache = get_entity_cache()
+        if cache is not None and entity_id is not None:
+            cache.evict(self.get_entity_uri(entity_id))
+
+    def mark_mirror_outdated(self, entity_id: str | None):
+        """Mark the given entity as modified in the local mirror so that the mirror is not used until it is refreshed
+        :param entity_id:
+        :return:
+        """
+        mirror = get_mirror(self.mediawiki_api_url)
+        if mirror is not None:
+            mirror.mark_modified(entity_id)
+
+    def invalidate_terms(self, entity_id: str | None):
+        """Remove the label and property type of the given entity from the term dictionary
+        :param entity_id:
+        :return:
+        """
+        term_dictionary = get_term_dictionary(self.mediawiki_api_url)
+        if term_dictionary is not None and entity_id is not None:
+            term_dictionary.invalidate([self.get_entity_uri(entity_id)])
+
+    def invalidate_query_cache(self, query: str | None = None) -> int:
+        """Invalidate the cached SPARQL results of this wikibase instance
+        :param query: query to invalidate. If None all cached results of the sparql endpoint are invalidated
+        :return: number of invalidated results
+        """
+        cache = get_query_cache()
+        if cache is None:
+            return 0
+        return cache.invalidate(query=query, endpoint_url=self.sparql_endpoint)
+
     @staticmethod
     def get_entity_id(entity_url: str) -> str:
         """Get the ID of the given entity url without the namespace prefix
@@ -330,8 +883,8 @@ class Wikibase(BaseModel):
         if end_date is None:
             end_date = start_date + timedelta(days=1)
         query = query_template.substitute(start_date=start_date.isoformat(), end_date=end_date.isoformat())
-        lod = self.execute_query(query, self.sparql_endpoint)
-        return {d.get("item", "") for d in lod if isinstance(d.get("item"), str)}
+        rows = self.iter_query(query, self.sparql_endpoint, row_format="tuple")
+        return {item for (item,) in rows if isinstance(item, str)}
 
     def _fix_known_entity_issues(self, entity: ItemEntity | PropertyEntity):
         """Fix known issues with entities that lead to a denial of the mediawiki api
@@ -372,10 +925,15 @@ class Wikibase(BaseModel):
         :param entity:
         :return:
         """
-        entity.delete(
+        self.call_mediawiki(
+            entity.delete,
             mediawiki_api_url=self.mediawiki_api_url,
             reason=reason,
             login=self.wbi.login,
             user_agent=get_default_user_agent(),
             **kwargs,
         )
+        self.evict_cached_entity(entity.id)
+        self.invalidate_query_cache()
+        self.mark_mirror_outdated(entity.id)
+        self.invalidate_terms(entity.id)
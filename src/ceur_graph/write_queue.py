@@ -0,0 +1,224 @@
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel
+from wikibaseintegrator.entities import ItemEntity
+
+if TYPE_CHECKING:
+    from ceur_graph.wikibase import Wikibase
+
+logger = logging.getLogger(__name__)
+
+
+class ItemModification:
+    """
+    Pending modification of an item
+    """
+
+    def __init__(
+        self,
+        modify: Callable[[ItemEntity], bool],
+        get_result: Callable[[ItemEntity], Any],
+        summary: str | None = None,
+    ):
+        """
+        constructor
+        :param modify: applies the modification to the loaded item and returns whether the item changed
+        :param get_result: computes the result of the modification from the written item
+        :param summary: summary of the modification
+        """
+        self.modify = modify
+        self.get_result = get_result
+        self.summary = summary
+        self.future: Future = Future()
+
+
+class WriteQueueStats(BaseModel):
+    """
+    Counters of the write queue
+    """
+
+    modifications: int = 0
+    failed_modifications: int = 0
+    batches: int = 0
+    writes: int = 0
+    coalesced: int = 0
+
+
+class ItemWriteQueue:
+    """
+    Serializes the modifications of each item and coalesces modifications of the same user submitted within a short
+    window.
+    The modifications of a batch are applied in submission order to one freshly loaded entity which is written as a
+    single revision. Each submitter receives its own result or error.
+    """
+
+    def __init__(self, coalesce_window: float = 0.05, max_batch_size: int = 50):
+        """
+        constructor
+        :param coalesce_window: seconds the first modification of a batch waits for further modifications of the item
+        :param max_batch_size: maximum number of modifications written as one revision
+        """
+        self.coalesce_window = coalesce_window
+        self.max_batch_size = max_batch_size
+        self._lock = threading.Lock()
+        self._open_batches: dict[tuple[str, str, int], list[ItemModification]] = {}
+        # item → lock serializing the batches of the item and number of batches holding or waiting for it
+        self._item_locks: dict[tuple[str, str], tuple[threading.Lock, int]] = {}
+        self._stats = WriteQueueStats()
+
+    def submit[T](
+        self,
+        wikibase: "Wikibase",
+        qid: str,
+        modify: Callable[[ItemEntity], bool],
+        get_result: Callable[[ItemEntity], T],
+        summary: str | None = None,
+    ) -> T:
+        """
+        Submit a modification of the given item and block until it is written
+        :param wikibase: wikibase instance of the item
+        :param qid: id of the item
+        :param modify: applies the modification to the loaded item and returns whether the item changed. Errors only
+        fail this modification
+        :param get_result: computes the result of the modification from the written item
+        :param summary: summary of the modification
+        :return: result of the modification
+        """
+        qid = wikibase.get_entity_id(qid)
+        key = (wikibase.mediawiki_api_url.unicode_string(), qid)
+        # only modifications of the same login are coalesced so that each edit is attributed to its user
+        batch_key = (*key, id(wikibase))
+        modification = ItemModification(modify, get_result, summary)
+        with self._lock:
+            self._stats.modifications += 1
+            open_batch = self._open_batches.get(batch_key)
+            if open_batch is None or len(open_batch) >= self.max_batch_size:
+                is_leader = True
+                batch: list[ItemModification] = []
+                self._open_batches[batch_key] = batch
+            else:
+                is_leader = False
+                batch = open_batch
+                self._stats.coalesced += 1
+            batch.append(modification)
+        if is_leader:
+            if self.coalesce_window > 0:
+                time.sleep(self.coalesce_window)
+            with self._lock:
+                if self._open_batches.get(batch_key) is batch:
+                    del self._open_batches[batch_key]
+            with self._item_lock(key):
+                try:
+                    self._write_batch(wikibase, qid, batch)
+                except Exception as e:
+                    for pending in batch:
+                        if not pending.future.done():
+                            pending.future.set_exception(e)
+        return modification.future.result()
+
+    @contextmanager
+    def _item_lock(self, key: tuple[str, str]) -> Iterator[None]:
+        """
+        Serialize the batches of the given item. The lock is only kept while a batch of the item is written or waiting
+        so that the locks do not accumulate for every item ever written.
+        :param key: api url and id of the item
+        :return:
+        """
+        with self._lock:
+            lock, batches = self._item_locks.get(key, (threading.Lock(), 0))
+            self._item_locks[key] = (lock, batches + 1)
+        try:
+            with lock:
+                yield
+        finally:
+            with self._lock:
+                lock, batches = self._item_locks[key]
+                if batches == 1:
+                    del self._item_locks[key]
+                else:
+                    self._item_locks[key] = (lock, batches - 1)
+
+    def _write_batch(self, wikibase: "Wikibase", qid: str, batch: list[ItemModification]):
+        """
+        Apply the given modifications to the current state of the item and write the item once
+        :param wikibase:
+        :param qid:
+        :param batch:
+        :return:
+        """
+        try:
+            item = wikibase.get_item(qid, for_update=True)
+        except Exception as e:
+            for modification in batch:
+                modification.future.set_exception(e)
+            return
+        applied: list[ItemModification] = []
+        has_changes = False
+        for modification in batch:
+            try:
+                has_changes = modification.modify(item) or has_changes
+            except Exception as e:
+                logger.debug(f"Modification of {qid} failed: {e}")
+                modification.future.set_exception(e)
+                with self._lock:
+                    self._stats.failed_modifications += 1
+                # the failed modification might have changed the item partially
+                item = wikibase.get_item(qid, for_update=True)
+                for applied_modification in applied:
+                    applied_modification.modify(item)
+                continue
+            applied.append(modification)
+        with self._lock:
+            self._stats.batches += 1
+        if not applied:
+            return
+        if has_changes:
+            summaries = list(dict.fromkeys(m.summary for m in applied if m.summary))
+            try:
+                item = wikibase.write_item(item, summary="; ".join(summaries) if summaries else None)
+            except Exception as e:
+                for modification in applied:
+                    modification.future.set_exception(e)
+                return
+            with self._lock:
+                self._stats.writes += 1
+            logger.debug(f"Wrote {len(applied)} modifications of {qid} as one revision")
+        for modification in applied:
+            try:
+                modification.future.set_result(modification.get_result(item))
+            except Exception as e:
+                modification.future.set_exception(e)
+
+    def stats(self) -> WriteQueueStats:
+        """
+        Get the counters of the write queue
+        :return:
+        """
+        with self._lock:
+            return self._stats.model_copy()
+
+
+_write_queue: ItemWriteQueue | None = None
+_write_queue_lock = threading.Lock()
+
+
+def get_write_queue() -> ItemWriteQueue:
+    """Get the process wide item write queue"""
+    global _write_queue
+    with _write_queue_lock:
+        if _write_queue is None:
+            _write_queue = ItemWriteQueue()
+        return _write_queue
+
+
+def set_write_queue(write_queue: ItemWriteQueue | None):
+    """Set the process wide item write queue. None resets the queue"""
+    global _write_queue
+    with _write_queue_lock:
+        _write_queue = write_queue
@@ -0,0 +1,67 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+from ceur_graph.api.concurrency import READ_ROUTES, route_limits, set_route_limit
+from ceur_graph.main import app
+
+
+def slow_get_item_by_id(wikibase, item_id: str, target_model):
+    time.sleep(0.1)
+    return {"qid": item_id, "label": f"Vol-{item_id}", "description": "ceur-ws volume"}
+
+
+class TestConcurrency(unittest.IsolatedAsyncioTestCase):
+    """
+    load tests the offloading of the blocking route handlers
+    """
+
+    def setUp(self):
+        self.read_limit = route_limits[READ_ROUTES]
+        patcher = patch("ceur_graph.api.volume.handle_get_item_by_id", slow_get_item_by_id)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        set_route_limit(READ_ROUTES, self.read_limit)
+
+    async def get_volumes(self, number_of_requests: int) -> float:
+        """
+        Send the given number of concurrent volume requests
+        :return: elapsed time in seconds
+        """
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            start = time.perf_counter()
+            responses = await asyncio.gather(*[client.get(f"/volumes/Q{i}") for i in range(number_of_requests)])
+            elapsed = time.perf_counter() - start
+        self.assertTrue(all(response.status_code == 200 for response in responses))
+        return elapsed
+
+    async def test_throughput_scales_with_limit(self):
+        set_route_limit(READ_ROUTES, 1)
+        sequential = await self.get_volumes(8)
+        set_route_limit(READ_ROUTES, 8)
+        concurrent = await self.get_volumes(8)
+        self.assertGreaterEqual(sequential, 0.8)
+        self.assertLess(concurrent, sequential / 3)
+
+    async def test_event_loop_not_blocked(self):
+        set_route_limit(READ_ROUTES, 1)
+        # warm up the app to exclude one-time setup costs
+        await self.get_volumes(1)
+        requests = asyncio.create_task(self.get_volumes(4))
+        gaps = []
+        while not requests.done():
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            gaps.append(time.perf_counter() - start)
+        await requests
+        self.assertLess(max(gaps), 0.08)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, PropertyMock, patch
+
+from wikibaseintegrator.wbi_login import LoginError
+
+from ceur_graph.api.sessions import SessionManager
+from ceur_graph.ceur_dev import CeurDev
+
+
+class TestSessionManager(unittest.TestCase):
+    """
+    tests the login reuse and eviction of the session manager with mocked logins
+    """
+
+    def setUp(self):
+        self.session_manager = SessionManager(max_sessions=2, idle_timeout=60)
+        self.addCleanup(self.session_manager.stop_maintenance)
+        patcher = patch.object(CeurDev, "login")
+        self.login = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_login_reuse(self):
+        session = self.session_manager.login("alice", "secret")
+        self.assertIs(session, self.session_manager.login("alice", "secret"))
+        self.assertEqual(1, self.login.call_count)
+        # a different password requires a new login handshake
+        self.assertIsNot(session, self.session_manager.login("alice", "other"))
+        self.assertEqual(2, self.login.call_count)
+        stats = self.session_manager.stats()
+        self.assertEqual(2, stats.logins)
+        self.assertEqual(1, stats.reused_logins)
+
+    def test_tokens(self):
+        session = self.session_manager.login("alice", "secret")
+        self.session_manager.add_token("alice", "token", time.time() + 60)
+        self.session_manager.add_token("alice", "expired", time.time() - 1)
+        self.assertIs(session.wikibase, self.session_manager.get_session("token").wikibase)
+        self.assertIsNone(self.session_manager.get_session("expired"))
+        self.assertIsNone(self.session_manager.get_session("unknown"))
+        self.assertEqual(1, self.session_manager.stats().tokens)
+
+    def test_eviction(self):
+        self.session_manager.login("alice", "secret")
+        self.session_manager.add_token("alice", "alice-token", time.time() + 60)
+        self.session_manager.login("bob", "secret")
+        self.session_manager.get_session("alice-token")
+        # bob is the least recently used session
+        self.session_manager.login("carol", "secret")
+        self.assertIsNotNone(self.session_manager.get_session("alice-token"))
+        self.session_manager.login("bob", "secret")
+        self.assertEqual(4, self.login.call_count)
+        # idle sessions are evicted along with their tokens
+        self.session_manager.idle_timeout = 0
+        self.assertEqual(2, self.session_manager.evict())
+        self.assertIsNone(self.session_manager.get_session("alice-token"))
+        self.assertEqual(4, self.session_manager.stats().evicted_sessions)
+
+    def test_user_locks_are_released(self):
+        self.session_manager.login("alice", "secret")
+        self.login.side_effect = LoginError("wrong password")
+        self.assertRaises(LoginError, self.session_manager.login, "mallory", "guess")
+        self.assertEqual({}, self.session_manager._user_locks)
+
+    def test_concurrent_logins(self):
+        login_started = threading.Event()
+        release_login = threading.Event()
+
+        def login():
+            login_started.set()
+            release_login.wait(5)
+
+        self.login.side_effect = login
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            first = executor.submit(self.session_manager.login, "alice", "secret")
+            login_started.wait(5)
+            second = executor.submit(self.session_manager.login, "alice", "secret")
+            time.sleep(0.05)
+            self.assertEqual(2, self.session_manager._user_locks["alice"][1])
+            release_login.set()
+            # the second login waits for the first one and reuses its session
+            self.assertIs(first.result(), second.result())
+        self.assertEqual(1, self.login.call_count)
+        self.assertEqual({}, self.session_manager._user_locks)
+
+    def test_refresh_tokens(self):
+        self.session_manager.login("alice", "secret")
+        login = MagicMock(token_renew_period=60, instantiation_time=time.time())
+        with (
+            patch.object(CeurDev, "wbi", new_callable=PropertyMock) as wbi,
+            patch.object(CeurDev, "refresh_edit_token") as refresh_edit_token,
+        ):
+            wbi.return_value.login = login
+            self.assertEqual(0, self.session_manager.refresh_tokens())
+            login.instantiation_time -= 50
+            self.assertEqual(1, self.session_manager.refresh_tokens())
+            refresh_edit_token.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from ceur_graph.ceur_dev import CeurDev, get_ceur_dev
+from ceur_graph.main import app
+from ceur_graph.wikibase import get_mirror, get_term_dictionary
+
+
+class TestSharedCeurDev(unittest.TestCase):
+    """
+    tests the shared anonymous CeurDev instance of the read routes
+    """
+
+    def test_lifespan(self):
+        wikibases = []
+
+        def get_item_by_id(wikibase, item_id: str, target_model):
+            wikibases.append(wikibase)
+            return {"qid": item_id, "label": f"Vol-{item_id}", "description": "ceur-ws volume"}
+
+        with (
+            tempfile.TemporaryDirectory() as tmp_dir,
+            patch("ceur_graph.main.JOB_STORE_PATH", Path(tmp_dir).joinpath("jobs.sqlite")),
+            patch("ceur_graph.api.volume.handle_get_item_by_id", get_item_by_id),
+            TestClient(app) as client,
+        ):
+            shared = get_ceur_dev()
+            for qid in ["Q1", "Q2"]:
+                self.assertEqual(200, client.get(f"/volumes/{qid}").status_code)
+        self.assertEqual([shared, shared], wikibases)
+        self.assertIsNot(shared, get_ceur_dev())
+
+    def test_term_dictionary_lifespan(self):
+        property_types = {"https://ceur-dev.wikibase.cloud/entity/P1": "http://wikiba.se/ontology#WikibaseItem"}
+        with (
+            tempfile.TemporaryDirectory() as tmp_dir,
+            patch("ceur_graph.main.JOB_STORE_PATH", Path(tmp_dir).joinpath("jobs.sqlite")),
+            patch.dict(
+                os.environ,
+                {
+                    "CEUR_GRAPH_TERM_DICTIONARY_ENABLED": "true",
+                    "CEUR_GRAPH_TERM_DICTIONARY_PATH": str(Path(tmp_dir).joinpath("terms.sqlite")),
+                },
+            ),
+            patch.object(CeurDev, "query_all_property_types", return_value=property_types),
+            patch.object(CeurDev, "get_items_modified_at", return_value=set()),
+            TestClient(app),
+        ):
+            term_dictionary = get_term_dictionary(get_ceur_dev().mediawiki_api_url)
+            self.assertIsNotNone(term_dictionary)
+            self.assertEqual(property_types, term_dictionary.store.get_property_types(property_types))
+        self.assertIsNone(get_term_dictionary(term_dictionary.mediawiki_api_url))
+
+    def test_mirror_lifespan(self):
+        with (
+            tempfile.TemporaryDirectory() as tmp_dir,
+            patch("ceur_graph.main.JOB_STORE_PATH", Path(tmp_dir).joinpath("jobs.sqlite")),
+            patch.dict(
+                os.environ,
+                {
+                    "CEUR_GRAPH_MIRROR_ENABLED": "true",
+                    "CEUR_GRAPH_MIRROR_PATH": str(Path(tmp_dir).joinpath("mirror.sqlite")),
+                },
+            ),
+            patch.object(CeurDev, "get_items_modified_at", return_value=set()),
+            patch.object(CeurDev, "get_entities_json", return_value={}),
+            TestClient(app),
+        ):
+            mirror = get_mirror(get_ceur_dev().mediawiki_api_url)
+            self.assertIsNotNone(mirror)
+            # the first synchronization runs in the background
+            deadline = time.time() + 5
+            while not mirror.is_fresh() and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertTrue(mirror.is_fresh())
+        self.assertIsNone(get_mirror(mirror.mediawiki_api_url))
+
+    def test_request_overhead(self):
+        """
+        benchmark of the per request overhead of providing the wikibase instance before and after sharing it
+        """
+        number_of_requests = 200
+        start = time.perf_counter()
+        for _ in range(number_of_requests):
+            _ = CeurDev().wbi
+        per_request_before = (time.perf_counter() - start) / number_of_requests
+        start = time.perf_counter()
+        for _ in range(number_of_requests):
+            _ = get_ceur_dev().wbi
+        per_request_after = (time.perf_counter() - start) / number_of_requests
+        self.assertLess(
+            per_request_after * 5,
+            per_request_before,
+            f"per request overhead before: {per_request_before * 1e6:.1f}µs after: {per_request_after * 1e6:.1f}µs",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
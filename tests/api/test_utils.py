@@ -1,8 +1,14 @@
 import unittest
+from unittest.mock import MagicMock
 
-from ceur_graph.api.utils import get_model_label
-from ceur_graph.datamodel.scholarsignature import ScholarSignature
+from wikibaseintegrator import WikibaseIntegrator
+
+from ceur_graph.api.utils import StatementBatchStatus, get_model_label, handle_statement_batch_creation
+from ceur_graph.datamodel.paper import PaperCreate
+from ceur_graph.datamodel.scholarsignature import ScholarSignature, ScholarSignatureCreate
 from ceur_graph.datamodel.subject import SubjectBase
+from ceur_graph.wbgenerator import create_item_from_model
+from ceur_graph.write_queue import ItemWriteQueue
 
 
 class TestUtils(unittest.TestCase):
@@ -14,3 +20,54 @@ class TestUtils(unittest.TestCase):
         self.assertEqual("scholar signature", get_model_label(ScholarSignature))
 
         self.assertEqual("subject", get_model_label(SubjectBase))
+
+    def test_statement_batch_creation(self):
+        paper = PaperCreate(
+            label="Test paper",
+            description="ceur-ws paper 2025",
+            title="Test paper title",
+            published_in="Q1",
+            full_work_available_at_url="https://ceur-ws.org/Vol-1/paper1.pdf",
+        )
+        item = create_item_from_model(paper, WikibaseIntegrator())
+
+        def write_item(item, summary=None):
+            for i, claim in enumerate(item.claims):
+                claim.id = f"Q42${i}"
+            return item
+
+        wikibase = MagicMock()
+        wikibase.get_item.return_value = item
+        wikibase.write_item.side_effect = write_item
+        wikibase.get_entity_id.side_effect = lambda entity_id: entity_id
+        write_queue = ItemWriteQueue(coalesce_window=0)
+        wikibase.modify_item.side_effect = lambda qid, modify, get_result, summary=None: write_queue.submit(
+            wikibase, qid, modify, get_result, summary
+        )
+        statements = [
+            {"object_named_as": "Jane Doe", "series_ordinal": 1},
+            {"object_named_as": "John Doe", "series_ordinal": 2},
+            {"object_named_as": "Jane Doe", "series_ordinal": 3},
+            {"object_named_as": "Max Mustermann", "series_ordinal": "first"},
+        ]
+        results = handle_statement_batch_creation(
+            wikibase=wikibase,
+            item_id="Q42",
+            statements=statements,
+            create_model=ScholarSignatureCreate,
+            target_model=ScholarSignature,
+        )
+        self.assertEqual(
+            [
+                StatementBatchStatus.CREATED,
+                StatementBatchStatus.CREATED,
+                StatementBatchStatus.DUPLICATE,
+                StatementBatchStatus.INVALID,
+            ],
+            [result.status for result in results],
+        )
+        self.assertEqual(1, wikibase.get_item.call_count)
+        self.assertEqual(1, wikibase.write_item.call_count)
+        self.assertIsInstance(results[1].statement, ScholarSignature)
+        self.assertEqual("John Doe", results[1].statement.object_named_as)
+        self.assertIsNotNone(results[1].statement.statement_id)
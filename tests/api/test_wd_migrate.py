@@ -0,0 +1,92 @@
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from ceur_graph.api.sessions import SessionManager
+from ceur_graph.api.wd_migrate import EntityImportStatus, migrate_entities, run_import_job
+from ceur_graph.ceur_dev import CeurDev
+from ceur_graph.datamodel.auth import WikibaseBotAuth
+from ceur_graph.jobs import Job, JobDeferredError
+
+
+class FakeMigrator:
+    """
+    Migrator recording the batches it translates and migrates
+    """
+
+    def __init__(self):
+        self.translated: list[list[str]] = []
+        self.migrated: list[tuple[list[str], int]] = []
+        self.mapper = MagicMock()
+
+    def translate_entities_by_id(self, item_ids: list[str]):
+        self.translated.append(item_ids)
+        # Q3 does not exist in Wikidata and Q2 already exists as Q20
+        entities = {
+            item_id: SimpleNamespace(
+                original_entity=SimpleNamespace(id=item_id),
+                entity=SimpleNamespace(id="Q20" if item_id == "Q2" else None),
+                created_entity=None,
+                errors=[],
+            )
+            for item_id in item_ids
+            if item_id != "Q3"
+        }
+        return SimpleNamespace(entities=entities)
+
+    def migrate_entities_to_target(self, translations, summary, max_workers):
+        self.migrated.append((list(translations.entities), max_workers))
+        for item_id, entity in translations.entities.items():
+            if item_id == "Q4":
+                entity.errors.append("edit conflict")
+            else:
+                entity.created_entity = SimpleNamespace(id=entity.entity.id or f"Q{item_id[1:]}0")
+        return list(translations.entities.values())
+
+
+class TestWikidataImport(unittest.TestCase):
+    """
+    tests the batch import of Wikidata entities
+    """
+
+    def setUp(self):
+        self.ceur_dev = CeurDev(WikibaseBotAuth(user="alice", password="secret"))
+
+    def test_migrate_entities_in_one_run(self):
+        migrator = FakeMigrator()
+        pool = MagicMock()
+        pool.get_migrator.return_value = migrator
+        with patch("ceur_graph.api.wd_migrate.get_migrator_pool", return_value=pool):
+            results = migrate_entities(self.ceur_dev, ["Q1", "Q2", "Q3", "Q4"], max_workers=3)
+        pool.get_migrator.assert_called_once_with("alice", self.ceur_dev)
+        migrator.mapper.invalidate.assert_called_once_with(["Q1", "Q2", "Q3", "Q4"])
+        # the mapping of the created entity is cached for the following imports
+        migrator.mapper.add_mappings.assert_called_once_with({"Q1": "Q10"})
+        self.assertEqual([["Q1", "Q2", "Q3", "Q4"]], migrator.translated)
+        self.assertEqual([(["Q1", "Q2", "Q4"], 3)], migrator.migrated)
+        self.assertEqual(["Q1", "Q2", "Q3", "Q4"], [result.wikidata_id for result in results])
+        self.assertEqual(
+            [
+                EntityImportStatus.CREATED,
+                EntityImportStatus.UPDATED,
+                EntityImportStatus.NOT_FOUND,
+                EntityImportStatus.FAILED,
+            ],
+            [result.status for result in results],
+        )
+        self.assertEqual(["Q10", "Q20", None, None], [result.ceurdev_id for result in results])
+        self.assertEqual("edit conflict", results[3].detail)
+
+    def test_defer_job_without_session(self):
+        job = Job(job_id="1", kind="wd_import", username="alice", params={"entity_ids": ["Q1"]}, created_at=time.time())
+        with patch("ceur_graph.api.wd_migrate.get_session_manager", return_value=SessionManager()):
+            with self.assertRaises(JobDeferredError):
+                run_import_job(job)
+            job.created_at = 0
+            with self.assertRaises(ValueError):
+                run_import_job(job)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
 
+from pydantic import ValidationError
 from wikibaseintegrator.wbi_enums import WikibaseSnakType
 
 from ceur_graph.datamodel.item import CEUR_DEV_ID
@@ -11,6 +12,13 @@ class TestSubject(unittest.TestCase):
         subject_field = Subject.get_statement_subject(CEUR_DEV_ID)
         self.assertEqual("subject_id", subject_field)
 
+    def test_statement_layout(self):
+        layout = Subject.get_statement_layout(CEUR_DEV_ID)
+        self.assertIs(layout, Subject.get_statement_layout(CEUR_DEV_ID))
+        self.assertEqual("subject_id", layout.subject_field)
+        self.assertEqual(("object_named_as",), layout.qualifier_fields)
+        self.assertRaises(ValidationError, setattr, layout, "subject_field", "object_named_as")
+
     def test_loading_from_record(self):
         subject_record = {"subject_id": "somevalue", "object_named_as": "Wikidata"}
         subject = SubjectCreate.model_validate(subject_record)
@@ -0,0 +1,702 @@
+"""
+Local stand-in of a Wikibase instance for offline tests and benchmarks.
+
+The server implements the parts of the MediaWiki action API used by wikibaseintegrator (login, csrf tokens,
+wbgetentities, wbeditentity, wbremoveclaims and delete) and a SPARQL endpoint answering queries from an in-memory
+triple store that mirrors the entities in the Wikibase RDF format. Latency and errors can be injected per endpoint.
+"""
+
+import json
+import logging
+import random
+import secrets
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from decimal import Decimal, InvalidOperation
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Literal
+from urllib.parse import parse_qs, urlparse
+
+from rdflib import RDF, RDFS, XSD, Dataset, Namespace, URIRef
+from rdflib import Literal as RdfLiteral
+from rdflib.graph import Graph
+
+from ceur_graph.ceur_dev import CeurDevSettings
+
+logger = logging.getLogger(__name__)
+
+FIXTURES_PATH = Path(__file__).parent.joinpath("fixtures")
+CEUR_DEV_FIXTURE = FIXTURES_PATH.joinpath("ceur_dev.json")
+CEUR_DEV_CONCEPT_URI = "https://ceur-dev.wikibase.cloud/"
+
+API_PATH = "/w/api.php"
+SPARQL_PATH = "/query/sparql"
+SESSION_COOKIE = "fakewikibase_session"
+ANONYMOUS_TOKEN = "+\\"
+
+Endpoint = Literal["api", "sparql"]
+
+WIKIBASE = Namespace("http://wikiba.se/ontology#")
+SCHEMA = Namespace("http://schema.org/")
+SKOS = Namespace("http://www.w3.org/2004/02/skos/core#")
+GEO = Namespace("http://www.opengis.net/ont/geosparql#")
+PROV = Namespace("http://www.w3.org/ns/prov#")
+
+# property datatypes whose name in the Wikibase ontology is not the camel case of the datatype id
+ONTOLOGY_DATATYPES = {
+    "commonsMedia": "CommonsMedia",
+    "monolingualtext": "Monolingualtext",
+    "url": "Url",
+}
+
+
+def get_ontology_datatype(datatype: str) -> URIRef:
+    """
+    Get the Wikibase ontology URI of the given property datatype, e.g. wikibase-item → wikibase:WikibaseItem
+    :param datatype:
+    :return:
+    """
+    name = ONTOLOGY_DATATYPES.get(datatype, "".join(part.capitalize() for part in datatype.split("-")))
+    return WIKIBASE[name]
+
+
+@dataclass
+class InjectedError:
+    """
+    Error returned instead of the response of a request
+    """
+
+    status: int = 503
+    endpoint: Endpoint | None = None
+    retry_after: float | None = None
+    # MediaWiki error code returned with status 200, e.g. maxlag or ratelimited
+    mediawiki_code: str | None = None
+
+
+@dataclass
+class Session:
+    """
+    Session of a client identified by its cookie
+    """
+
+    login_token: str
+    user: str | None = None
+    csrf_token: str | None = None
+
+
+class FakeWikibaseError(Exception):
+    """
+    MediaWiki API error
+    """
+
+    def __init__(self, code: str, info: str, messages: list[dict] | None = None):
+        super().__init__(info)
+        self.code = code
+        self.info = info
+        self.messages = messages
+
+
+class EntityStore:
+    """
+    Entities of the fake instance and their RDF representation.
+    Each entity is stored in its own named graph so that an edit replaces only the triples of the edited entity.
+    """
+
+    def __init__(self, concept_uri: str):
+        self.concept_uri = concept_uri
+        self.entity = Namespace(f"{concept_uri}entity/")
+        self.statement = Namespace(f"{concept_uri}entity/statement/")
+        self.reference = Namespace(f"{concept_uri}reference/")
+        self.namespaces = {
+            "wd": self.entity,
+            "wdt": Namespace(f"{concept_uri}prop/direct/"),
+            "p": Namespace(f"{concept_uri}prop/"),
+            "ps": Namespace(f"{concept_uri}prop/statement/"),
+            "pq": Namespace(f"{concept_uri}prop/qualifier/"),
+            "pr": Namespace(f"{concept_uri}prop/reference/"),
+            "wds": self.statement,
+            "wdref": self.reference,
+            "wikibase": WIKIBASE,
+            "schema": SCHEMA,
+            "skos": SKOS,
+            "geo": GEO,
+            "prov": PROV,
+            "rdf": RDF,
+            "rdfs": RDFS,
+            "xsd": XSD,
+        }
+        self.lock = threading.RLock()
+        self.entities: dict[str, dict] = {}
+        self.dataset = Dataset(default_union=True)
+        self._revision = 0
+        self._page_id = 0
+        self._next_ids = {"item": 1, "property": 1}
+
+    def _next_revision(self) -> int:
+        self._revision += 1
+        return self._revision
+
+    def _new_id(self, entity_type: str) -> str:
+        prefix = "P" if entity_type == "property" else "Q"
+        while f"{prefix}{self._next_ids[entity_type]}" in self.entities:
+            self._next_ids[entity_type] += 1
+        entity_id = f"{prefix}{self._next_ids[entity_type]}"
+        self._next_ids[entity_type] += 1
+        return entity_id
+
+    def get_datatype(self, property_id: str) -> str | None:
+        prop = self.entities.get(property_id)
+        return prop.get("datatype") if prop is not None else None
+
+    def save(self, entity: dict) -> dict:
+        """
+        Store the given entity as a new revision
+        :param entity: entity json with an id
+        :return: stored entity
+        """
+        with self.lock:
+            entity_id = entity["id"]
+            previous = self.entities.get(entity_id)
+            self._page_id += previous is None
+            entity.update(
+                {
+                    "pageid": previous["pageid"] if previous is not None else self._page_id,
+                    "ns": 122 if entity["type"] == "property" else 120,
+                    "title": f"{'Property' if entity['type'] == 'property' else 'Item'}:{entity_id}",
+                    "lastrevid": self._next_revision(),
+                    "modified": datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                }
+            )
+            self._normalize_claims(entity)
+            self.entities[entity_id] = entity
+            self._update_graph(entity)
+            return entity
+
+    def delete(self, entity_id: str):
+        with self.lock:
+            if self.entities.pop(entity_id, None) is None:
+                raise FakeWikibaseError("missingtitle", "The page you specified doesn't exist.")
+            self.dataset.remove_graph(self.entity[entity_id])
+
+    def load(self, entities: Iterable[dict]) -> int:
+        """
+        Store the given entities, e.g. from a fixture
+        :param entities: entity json as returned by wbgetentities
+        :return: number of stored entities
+        """
+        count = 0
+        with self.lock:
+            # properties first so that the datatypes of the claims are known
+            for entity in sorted(entities, key=lambda e: e.get("type") != "property"):
+                self.save(json.loads(json.dumps(entity)))
+                count += 1
+        return count
+
+    def _normalize_claims(self, entity: dict):
+        for claims in entity.get("claims", {}).values():
+            for claim in claims:
+                claim.setdefault("id", f"{entity['id']}${uuid.uuid4()}")
+                claim.setdefault("type", "statement")
+                claim.setdefault("rank", "normal")
+                snaks = [claim["mainsnak"]]
+                for qualifiers in claim.get("qualifiers", {}).values():
+                    snaks.extend(qualifiers)
+                for reference in claim.get("references", []):
+                    reference.setdefault("hash", uuid.uuid4().hex)
+                    for reference_snaks in reference.get("snaks", {}).values():
+                        snaks.extend(reference_snaks)
+                for snak in snaks:
+                    datatype = snak.get("datatype") or self.get_datatype(snak["property"])
+                    if datatype is not None:
+                        snak["datatype"] = datatype
+                    snak.setdefault("hash", uuid.uuid4().hex)
+                claim.setdefault("qualifiers-order", list(claim.get("qualifiers", {})))
+
+    def _get_value(self, snak: dict) -> URIRef | RdfLiteral | None:
+        """
+        Get the RDF value of the given snak
+        """
+        if snak.get("snaktype", "value") != "value":
+            return None
+        datavalue = snak["datavalue"]
+        value = datavalue["value"]
+        match datavalue["type"]:
+            case "wikibase-entityid":
+                return self.entity[value["id"]]
+            case "string":
+                if snak.get("datatype") == "url":
+                    return URIRef(value)
+                return RdfLiteral(value)
+            case "monolingualtext":
+                return RdfLiteral(value["text"], lang=value["language"])
+            case "time":
+                return RdfLiteral(value["time"].lstrip("+"), datatype=XSD.dateTime)
+            case "quantity":
+                try:
+                    return RdfLiteral(Decimal(value["amount"]), datatype=XSD.decimal)
+                except InvalidOperation:
+                    return None
+            case "globecoordinate":
+                return RdfLiteral(f"Point({value['longitude']} {value['latitude']})", datatype=GEO.wktLiteral)
+        return None
+
+    def _update_graph(self, entity: dict):
+        entity_id = entity["id"]
+        subject = self.entity[entity_id]
+        self.dataset.remove_graph(subject)
+        graph: Graph = self.dataset.graph(subject)
+        ns = self.namespaces
+        graph.add((subject, SCHEMA.version, RdfLiteral(entity["lastrevid"])))
+        graph.add((subject, SCHEMA.dateModified, RdfLiteral(entity["modified"], datatype=XSD.dateTime)))
+        if entity["type"] == "property":
+            graph.add((subject, RDF.type, WIKIBASE.Property))
+            graph.add((subject, WIKIBASE.propertyType, get_ontology_datatype(entity["datatype"])))
+            graph.add((subject, WIKIBASE.directClaim, ns["wdt"][entity_id]))
+            graph.add((subject, WIKIBASE.claim, ns["p"][entity_id]))
+            graph.add((subject, WIKIBASE.statementProperty, ns["ps"][entity_id]))
+            graph.add((subject, WIKIBASE.qualifier, ns["pq"][entity_id]))
+        else:
+            graph.add((subject, RDF.type, WIKIBASE.Item))
+        for label in entity.get("labels", {}).values():
+            graph.add((subject, RDFS.label, RdfLiteral(label["value"], lang=label["language"])))
+            graph.add((subject, SCHEMA.name, RdfLiteral(label["value"], lang=label["language"])))
+        for description in entity.get("descriptions", {}).values():
+            graph.add((subject, SCHEMA.description, RdfLiteral(description["value"], lang=description["language"])))
+        for aliases in entity.get("aliases", {}).values():
+            for alias in aliases:
+                graph.add((subject, SKOS.altLabel, RdfLiteral(alias["value"], lang=alias["language"])))
+        for property_id, claims in entity.get("claims", {}).items():
+            ranks = {claim["rank"] for claim in claims}
+            best_rank = "preferred" if "preferred" in ranks else "normal"
+            for claim in claims:
+                statement = self.statement[claim["id"].replace("$", "-")]
+                graph.add((subject, ns["p"][property_id], statement))
+                graph.add((statement, RDF.type, WIKIBASE.Statement))
+                graph.add((statement, WIKIBASE.rank, WIKIBASE[f"{claim['rank'].capitalize()}Rank"]))
+                value = self._get_value(claim["mainsnak"])
+                if value is not None:
+                    graph.add((statement, ns["ps"][property_id], value))
+                    if claim["rank"] == best_rank:
+                        graph.add((subject, ns["wdt"][property_id], value))
+                for qualifier_id, qualifiers in claim.get("qualifiers", {}).items():
+                    for qualifier in qualifiers:
+                        value = self._get_value(qualifier)
+                        if value is not None:
+                            graph.add((statement, ns["pq"][qualifier_id], value))
+                for reference in claim.get("references", []):
+                    reference_node = self.reference[reference["hash"]]
+                    graph.add((statement, PROV.wasDerivedFrom, reference_node))
+                    for reference_id, reference_snaks in reference.get("snaks", {}).items():
+                        for reference_snak in reference_snaks:
+                            value = self._get_value(reference_snak)
+                            if value is not None:
+                                graph.add((reference_node, ns["pr"][reference_id], value))
+
+    def query(self, query: str) -> bytes:
+        """
+        Execute the given SPARQL query. The prefixes of the Wikibase query service are predefined.
+        :param query:
+        :return: result in the SPARQL JSON results format
+        """
+        with self.lock:
+            result = self.dataset.query(query, initNs=self.namespaces)
+            return result.serialize(format="json")
+
+
+def apply_edit(entity: dict, data: dict, clear: bool = False) -> dict:
+    """
+    Apply the given wbeditentity data to the entity. Terms and claims not mentioned in the data are kept.
+    :param entity: current entity json
+    :param data: edit data
+    :param clear: If True the entity is emptied before the data is applied
+    :return: edited entity json
+    """
+    if clear:
+        for key in ["labels", "descriptions", "aliases", "claims", "sitelinks"]:
+            entity[key] = {}
+    for key in ["labels", "descriptions", "sitelinks"]:
+        terms = entity.setdefault(key, {})
+        values = data.get(key, {})
+        if isinstance(values, list):
+            values = {value.get("language", value.get("site")): value for value in values}
+        for language, term in values.items():
+            if "remove" in term:
+                terms.pop(language, None)
+            else:
+                terms[language] = term
+    aliases = entity.setdefault("aliases", {})
+    for language, language_aliases in data.get("aliases", {}).items():
+        aliases[language] = [alias for alias in language_aliases if "remove" not in alias]
+        if not aliases[language]:
+            del aliases[language]
+    claims = entity.setdefault("claims", {})
+    edited_claims = data.get("claims", {})
+    if isinstance(edited_claims, list):
+        grouped: dict[str, list[dict]] = {}
+        for claim in edited_claims:
+            grouped.setdefault(claim["mainsnak"]["property"], []).append(claim)
+        edited_claims = grouped
+    for property_id, property_claims in edited_claims.items():
+        for claim in property_claims:
+            existing = claims.setdefault(property_id, [])
+            index = next((i for i, c in enumerate(existing) if "id" in claim and c.get("id") == claim["id"]), None)
+            if "remove" in claim:
+                if index is not None:
+                    del existing[index]
+            elif index is not None:
+                existing[index] = claim
+            else:
+                existing.append(claim)
+            if not existing:
+                del claims[property_id]
+    if "datatype" in data:
+        entity.setdefault("datatype", data["datatype"])
+    return entity
+
+
+class FakeWikibase:
+    """
+    Local HTTP server standing in for a Wikibase instance.
+    Entities are kept in memory and can be seeded from fixtures. Users log in with the passwords registered with
+    add_user. Each request is delayed by the configured latency and fails with the configured error rate or with the
+    errors queued by inject_error.
+    """
+
+    def __init__(
+        self,
+        concept_uri: str = CEUR_DEV_CONCEPT_URI,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0,
+        sparql_latency: float | None = None,
+        error_rate: float = 0,
+        error_status: int = 503,
+        seed: int | None = None,
+    ):
+        """
+        constructor
+        :param concept_uri: base of the entity URIs in the RDF data. Defaults to the concept URI of ceur-dev so that
+        the queries of CeurDev can be used unchanged
+        :param host: host to bind the server to
+        :param port: port to bind the server to. 0 chooses a free port
+        :param latency: seconds each request is delayed
+        :param sparql_latency: seconds each SPARQL request is delayed. Defaults to latency
+        :param error_rate: fraction of the requests that fail with error_status
+        :param error_status: status code of the randomly failing requests
+        :param seed: seed of the random errors
+        """
+        self.store = EntityStore(concept_uri)
+        self.latency = latency
+        self.sparql_latency = sparql_latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.users: dict[str, str] = {}
+        self.requests: Counter[str] = Counter()
+        self._random = random.Random(seed)
+        self._errors: deque[InjectedError] = deque()
+        self._sessions: dict[str, Session] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def mediawiki_api_url(self) -> str:
+        return f"{self.base_url}{API_PATH}"
+
+    @property
+    def sparql_endpoint(self) -> str:
+        return f"{self.base_url}{SPARQL_PATH}"
+
+    def get_ceur_dev_settings(self) -> CeurDevSettings:
+        """
+        Get the settings pointing CeurDev at this server
+        :return:
+        """
+        return CeurDevSettings(
+            sparql_endpoint=self.sparql_endpoint,
+            website=f"{self.base_url}/",
+            item_prefix=str(self.store.entity),
+            property_prefix=str(self.store.namespaces["wdt"]),
+            mediawiki_api_url=self.mediawiki_api_url,
+        )
+
+    def get_environment(self) -> dict[str, str]:
+        """
+        Get the environment variables pointing CeurDev at this server, e.g. to run the API against it
+        :return:
+        """
+        settings = self.get_ceur_dev_settings()
+        return {f"CEUR_DEV_{key.upper()}": str(value) for key, value in settings.model_dump().items()}
+
+    def add_user(self, username: str, password: str):
+        """
+        Register a user that can log in
+        :param username: login name, e.g. the bot name User@bot
+        :param password:
+        :return:
+        """
+        self.users[username] = password
+
+    def load_fixture(self, path: Path = CEUR_DEV_FIXTURE) -> int:
+        """
+        Seed the server with the entities of the given fixture
+        :param path: json file with a list of entities in the wbgetentities format
+        :return: number of loaded entities
+        """
+        return self.store.load(json.loads(path.read_text()))
+
+    def inject_error(
+        self,
+        count: int = 1,
+        status: int = 503,
+        endpoint: Endpoint | None = None,
+        retry_after: float | None = None,
+        mediawiki_code: str | None = None,
+    ):
+        """
+        Fail the next requests with the given error
+        :param count: number of failing requests
+        :param status: HTTP status of the error
+        :param endpoint: endpoint whose requests fail. None fails the next requests of any endpoint
+        :param retry_after: value of the Retry-After header
+        :param mediawiki_code: MediaWiki error code, e.g. maxlag or ratelimited, returned with status 200 by the API
+        :return:
+        """
+        with self._lock:
+            for _ in range(count):
+                self._errors.append(InjectedError(status, endpoint, retry_after, mediawiki_code))
+
+    def _take_error(self, endpoint: Endpoint) -> InjectedError | None:
+        with self._lock:
+            for error in self._errors:
+                if error.endpoint is None or error.endpoint == endpoint:
+                    self._errors.remove(error)
+                    return error
+            if self.error_rate and self._random.random() < self.error_rate:
+                return InjectedError(self.error_status, endpoint)
+        return None
+
+    def start(self) -> "FakeWikibase":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, name="fake-wikibase", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeWikibase":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _get_session(self, cookie_header: str | None) -> tuple[str, Session]:
+        cookie = SimpleCookie(cookie_header or "")
+        with self._lock:
+            session_id = cookie[SESSION_COOKIE].value if SESSION_COOKIE in cookie else None
+            if session_id is None or session_id not in self._sessions:
+                session_id = secrets.token_hex(16)
+                self._sessions[session_id] = Session(login_token=secrets.token_hex(16))
+            return session_id, self._sessions[session_id]
+
+    def handle_api(self, params: dict[str, str], session: Session) -> dict:
+        """
+        Handle a MediaWiki action API request
+        :param params: request parameters
+        :param session: session of the client
+        :return: json response
+        """
+        action = params.get("action")
+        self.requests[f"api:{action}"] += 1
+        if params.get("assert") in ("user", "bot") and session.user is None:
+            raise FakeWikibaseError(f"assert{params['assert']}failed", "You are no longer logged in")
+        match action:
+            case "query" if params.get("meta") == "tokens":
+                token_type = params.get("type", "csrf")
+                if token_type == "login":
+                    return {"query": {"tokens": {"logintoken": session.login_token}}}
+                return {"query": {"tokens": {"csrftoken": session.csrf_token or ANONYMOUS_TOKEN}}}
+            case "login":
+                username = params.get("lgname")
+                if params.get("lgtoken") != session.login_token:
+                    return {"login": {"result": "Failed", "reason": "Invalid login token"}}
+                if username not in self.users or self.users[username] != params.get("lgpassword"):
+                    return {"login": {"result": "Failed", "reason": "Incorrect username or password entered."}}
+                session.user = username
+                session.csrf_token = f"{secrets.token_hex(16)}+\\"
+                return {"login": {"result": "Success", "lguserid": 1, "lgusername": username.split("@")[0]}}
+            case "wbgetentities":
+                return {"entities": self._get_entities(params.get("ids", "").split("|"), params.get("props"))}
+            case "wbeditentity":
+                self._check_token(params, session)
+                return {"entity": self._edit_entity(params), "success": 1}
+            case "wbremoveclaims":
+                self._check_token(params, session)
+                return {"claims": self._remove_claims(params.get("claim", "").split("|")), "success": 1}
+            case "delete":
+                self._check_token(params, session)
+                title = params.get("title")
+                if title is None:
+                    page_id = int(params.get("pageid", -1))
+                    title = next((e["title"] for e in self.store.entities.values() if e["pageid"] == page_id), "")
+                self.store.delete(title.split(":")[-1])
+                return {"delete": {"title": title, "reason": params.get("reason", ""), "logid": 1}}
+        raise FakeWikibaseError("badvalue", f"Unsupported action {action}")
+
+    def _check_token(self, params: dict[str, str], session: Session):
+        if session.csrf_token is None or params.get("token") != session.csrf_token:
+            raise FakeWikibaseError("badtoken", "Invalid CSRF token.")
+
+    def _get_entities(self, entity_ids: list[str], props: str | None) -> dict[str, dict]:
+        entities = {}
+        with self.store.lock:
+            for entity_id in entity_ids:
+                entity = self.store.entities.get(entity_id)
+                if entity is None:
+                    entities[entity_id] = {"id": entity_id, "missing": ""}
+                elif props == "info":
+                    info_keys = ["type", "id", "pageid", "ns", "title", "lastrevid", "modified"]
+                    entities[entity_id] = {key: entity[key] for key in info_keys}
+                else:
+                    entities[entity_id] = json.loads(json.dumps(entity))
+        return entities
+
+    def _edit_entity(self, params: dict[str, str]) -> dict:
+        data = json.loads(params.get("data", "{}"))
+        with self.store.lock:
+            entity_id = params.get("id")
+            if entity_id is not None:
+                current = self.store.entities.get(entity_id)
+                if current is None:
+                    raise FakeWikibaseError("no-such-entity", f"Could not find an entity with the ID {entity_id}")
+                entity = json.loads(json.dumps(current))
+            else:
+                entity_type = params.get("new", "item")
+                if entity_type == "property" and "datatype" not in data:
+                    raise FakeWikibaseError("param-missing", "The datatype of the property is missing")
+                entity = {"type": entity_type, "id": self.store._new_id(entity_type)}
+            apply_edit(entity, data, clear="clear" in params)
+            return json.loads(json.dumps(self.store.save(entity)))
+
+    def _remove_claims(self, claim_ids: list[str]) -> list[str]:
+        with self.store.lock:
+            entity_id = claim_ids[0].split("$")[0]
+            current = self.store.entities.get(entity_id)
+            if current is None:
+                raise FakeWikibaseError("no-such-entity", f"Could not find an entity with the ID {entity_id}")
+            entity = json.loads(json.dumps(current))
+            for property_id, claims in list(entity.get("claims", {}).items()):
+                entity["claims"][property_id] = [claim for claim in claims if claim["id"] not in claim_ids]
+                if not entity["claims"][property_id]:
+                    del entity["claims"][property_id]
+            self.store.save(entity)
+        return claim_ids
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args: Any):
+                logger.debug(format % args)
+
+            def _send(self, status: int, body: bytes, content_type: str, headers: dict[str, str] | None = None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _read_params(self) -> dict[str, str]:
+                params = {key: values[-1] for key, values in parse_qs(urlparse(self.path).query).items()}
+                length = int(self.headers.get("Content-Length", 0))
+                if length:
+                    body = self.rfile.read(length).decode("utf-8")
+                    if self.headers.get("Content-Type", "").startswith("application/sparql-query"):
+                        params["query"] = body
+                    else:
+                        params.update({key: values[-1] for key, values in parse_qs(body).items()})
+                return params
+
+            def _handle(self):
+                path = urlparse(self.path).path
+                params = self._read_params()
+                endpoint: Endpoint
+                if path == API_PATH:
+                    endpoint = "api"
+                elif path == SPARQL_PATH:
+                    endpoint = "sparql"
+                else:
+                    self._send(404, b"Not found", "text/plain")
+                    return
+                latency = fake.sparql_latency if endpoint == "sparql" and fake.sparql_latency is not None else None
+                latency = latency if latency is not None else fake.latency
+                if latency:
+                    time.sleep(latency)
+                error = fake._take_error(endpoint)
+                if error is not None:
+                    fake.requests[f"{endpoint}:error"] += 1
+                    headers = {"Retry-After": str(error.retry_after)} if error.retry_after is not None else {}
+                    if error.mediawiki_code is not None and endpoint == "api":
+                        lag = error.retry_after if error.retry_after is not None else 0
+                        body = {"error": {"code": error.mediawiki_code, "info": "Injected error", "lag": lag}}
+                        if error.mediawiki_code == "ratelimited":
+                            body["error"]["messages"] = [{"name": "actionthrottledtext"}]
+                        self._send(200, json.dumps(body).encode(), "application/json", headers)
+                    else:
+                        self._send(error.status, b"Injected error", "text/plain", headers)
+                    return
+                if endpoint == "sparql":
+                    self._handle_sparql(params)
+                else:
+                    self._handle_api(params)
+
+            def _handle_sparql(self, params: dict[str, str]):
+                fake.requests["sparql"] += 1
+                try:
+                    body = fake.store.query(params.get("query", ""))
+                except Exception as e:
+                    self._send(400, f"Query failed: {e}".encode(), "text/plain")
+                    return
+                self._send(200, body, "application/sparql-results+json")
+
+            def _handle_api(self, params: dict[str, str]):
+                session_id, session = fake._get_session(self.headers.get("Cookie"))
+                try:
+                    response = fake.handle_api(params, session)
+                except FakeWikibaseError as e:
+                    error: dict[str, Any] = {"code": e.code, "info": e.info}
+                    if e.messages is not None:
+                        error["messages"] = e.messages
+                    response = {"error": error}
+                headers = {"Set-Cookie": f"{SESSION_COOKIE}={session_id}; Path=/"}
+                self._send(200, json.dumps(response).encode(), "application/json", headers)
+
+            def do_GET(self):
+                self._handle()
+
+            def do_POST(self):
+                self._handle()
+
+        return Handler
@@ -0,0 +1,63 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from benchmarks.wbgenerator import (
+    BenchmarkResult,
+    compare_results,
+    get_benchmarks,
+    load_baseline,
+    run_benchmarks,
+    save_baseline,
+)
+
+
+class TestWbGeneratorBenchmarks(unittest.TestCase):
+    """
+    tests the benchmark suite of the wbgenerator conversions
+    """
+
+    def get_result(self, name: str, ops_per_sec: float, allocated_bytes: int) -> BenchmarkResult:
+        return BenchmarkResult(
+            name=name,
+            ops_per_sec=ops_per_sec,
+            time_per_op=1 / ops_per_sec,
+            time_stdev=0,
+            allocated_bytes=allocated_bytes,
+            rounds=1,
+            iterations=1,
+        )
+
+    def test_run_benchmarks(self):
+        benchmarks = get_benchmarks()
+        self.assertEqual(len(benchmarks), len({benchmark.name for benchmark in benchmarks}))
+        results = run_benchmarks(benchmarks, rounds=1, min_round_time=0, allocation_runs=1)
+        self.assertEqual([benchmark.name for benchmark in benchmarks], list(results))
+        for result in results.values():
+            self.assertGreater(result.ops_per_sec, 0)
+            self.assertGreater(result.allocated_bytes, 0)
+
+    def test_compare_against_baseline(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir).joinpath("baseline.json")
+            self.assertIsNone(load_baseline(path))
+            results = {"a": self.get_result("a", 100, 1000), "b": self.get_result("b", 100, 1000)}
+            save_baseline(results, machine_speed=1000, path=path)
+            baseline = load_baseline(path)
+        results = {
+            "a": self.get_result("a", 80, 1050),
+            "b": self.get_result("b", 70, 1200),
+            "new": self.get_result("new", 1, 1),
+        }
+        regressions = compare_results(baseline, results, threshold=0.25, allocation_threshold=0.1)
+        self.assertEqual([("b", "ops_per_sec"), ("b", "allocated_bytes")], [(r.name, r.metric) for r in regressions])
+        self.assertAlmostEqual(-0.3, regressions[0].change)
+        # on a machine half as fast as the one of the baseline the throughput is expected to be halved
+        regressions = compare_results(baseline, results, machine_speed=500, threshold=0.25, allocation_threshold=0.1)
+        self.assertEqual([("b", "allocated_bytes")], [(r.name, r.metric) for r in regressions])
+        regressions = compare_results(baseline, results, machine_speed=2000, threshold=0.25, allocation_threshold=0.1)
+        self.assertEqual(["ops_per_sec", "ops_per_sec", "allocated_bytes"], [r.metric for r in regressions])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+import asyncio
+import threading
+import unittest
+from string import Template
+from unittest.mock import patch
+from urllib.parse import parse_qs
+
+import httpx
+
+from ceur_graph.chunk_scheduler import AdaptiveChunkScheduler, set_chunk_scheduler
+from ceur_graph.resilience import CircuitState, EndpointGuard, set_endpoint_guard
+from ceur_graph.sparql import SparqlClient
+from ceur_graph.wikibase import Wikibase
+
+ENDPOINT = "https://example.org/sparql"
+
+
+class TestAdaptiveChunkScheduler(unittest.TestCase):
+    """
+    tests the tuning of the chunk size and concurrency
+    """
+
+    def test_grow_towards_target_latency(self):
+        scheduler = AdaptiveChunkScheduler(initial_chunk_size=100, target_latency=1.0, max_chunk_size=1000)
+        # 1ms per value → ideal chunk size is 1000 values
+        for _ in range(5):
+            scheduler.record_success(scheduler.chunk_size, scheduler.chunk_size * 0.001, scheduler.chunk_size * 10)
+        stats = scheduler.stats()
+        self.assertEqual(1000, stats.chunk_size)
+        self.assertGreater(stats.chunk_size_increases, 1)
+        self.assertEqual(5, stats.chunks)
+
+    def test_query_size_limit(self):
+        scheduler = AdaptiveChunkScheduler(initial_chunk_size=100, max_query_bytes=5000)
+        scheduler.record_success(100, 0.01, 100 * 100)
+        self.assertEqual(50, scheduler.chunk_size)
+
+    def test_timeout(self):
+        scheduler = AdaptiveChunkScheduler(initial_chunk_size=400, max_concurrency=8)
+        scheduler.record_timeout(400)
+        stats = scheduler.stats()
+        self.assertEqual(200, stats.chunk_size)
+        self.assertEqual(4, stats.concurrency)
+        self.assertEqual(1, stats.timeouts)
+        scheduler.record_success(200, 1, 1000)
+        self.assertEqual(5, scheduler.concurrency)
+
+
+class TestChunkedValuesQuery(unittest.TestCase):
+    """
+    tests splitting and retrying timed out chunks
+    """
+
+    def setUp(self):
+        self.scheduler = AdaptiveChunkScheduler(initial_chunk_size=400, min_chunk_size=1)
+        set_chunk_scheduler(ENDPOINT, self.scheduler)
+        self.chunk_sizes = []
+
+    def tearDown(self):
+        set_chunk_scheduler(ENDPOINT, AdaptiveChunkScheduler())
+
+    async def execute_query(self, query: str, endpoint_url: str, ttl: float | None = None) -> list[dict]:
+        values = query.split()
+        self.chunk_sizes.append(len(values))
+        if len(values) > 100:
+            raise httpx.ReadTimeout("query timed out")
+        return [{"value": value} for value in values]
+
+    def test_split_timed_out_chunks(self):
+        values = [f"v{i}" for i in range(1000)]
+        with patch.object(Wikibase, "aexecute_query", side_effect=self.execute_query):
+            lod = Wikibase.execute_values_query_in_chunks(Template("$values"), "values", values, ENDPOINT)
+        self.assertCountEqual(values, [d["value"] for d in lod])
+        stats = self.scheduler.stats()
+        self.assertGreater(stats.splits, 0)
+        self.assertEqual(stats.splits, stats.timeouts)
+        self.assertLessEqual(stats.timeouts, 8)
+        self.assertLess(stats.size_ceiling, 400)
+        self.assertEqual(1000, stats.values)
+
+    def test_split_timed_out_chunks_through_endpoint_guard(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            chunk = parse_qs(request.content.decode())["query"][0].split()
+            if len(chunk) > 3:
+                return httpx.Response(504)
+            bindings = [{"value": {"type": "literal", "value": value}} for value in chunk]
+            return httpx.Response(200, json={"head": {"vars": ["value"]}, "results": {"bindings": bindings}})
+
+        client = SparqlClient(transport=httpx.MockTransport(handler))
+        self.addCleanup(client.close)
+        guard = EndpointGuard(ENDPOINT, failure_threshold=5, base_delay=0.001)
+        set_endpoint_guard(guard)
+        self.addCleanup(set_endpoint_guard, EndpointGuard(ENDPOINT))
+        values = [f"v{i}" for i in range(64)]
+        with patch("ceur_graph.wikibase._sparql_client", client), patch("ceur_graph.wikibase._query_cache", None):
+            lod = Wikibase.execute_values_query_in_chunks(Template("$values"), "values", values, ENDPOINT)
+        self.assertCountEqual(values, [d["value"] for d in lod])
+        metrics = guard.metrics()
+        self.assertGreater(metrics.failures, 5)
+        self.assertEqual(0, metrics.circuit_trips)
+        self.assertEqual(CircuitState.CLOSED, metrics.circuit_state)
+
+    def test_fixed_chunk_size(self):
+        values = [f"v{i}" for i in range(250)]
+        with patch.object(Wikibase, "aexecute_query", side_effect=self.execute_query):
+            Wikibase.execute_values_query_in_chunks(Template("$values"), "values", values, ENDPOINT, chunk_size=50)
+        self.assertEqual([50] * 5, self.chunk_sizes)
+
+    def test_non_timeout_error(self):
+        async def execute_query(query: str, endpoint_url: str, ttl: float | None = None) -> list[dict]:
+            raise ValueError("invalid query")
+
+        with patch.object(Wikibase, "aexecute_query", side_effect=execute_query):
+            self.assertRaises(
+                ValueError, Wikibase.execute_values_query_in_chunks, Template("$values"), "values", ["v1"], ENDPOINT
+            )
+
+    def test_deduplicate_values(self):
+        values = [f"v{i % 10}" for i in range(100)]
+        with patch.object(Wikibase, "aexecute_query", side_effect=self.execute_query):
+            lod = Wikibase.execute_values_query_in_chunks(Template("$values"), "values", values, ENDPOINT)
+        self.assertEqual([10], self.chunk_sizes)
+        self.assertCountEqual([f"v{i}" for i in range(10)], [d["value"] for d in lod])
+
+    def test_preserve_order(self):
+        values = [f"v{i}" for i in range(1000)]
+
+        async def execute_query(query: str, endpoint_url: str, ttl: float | None = None) -> list[dict]:
+            chunk = query.split()
+            # earlier chunks take longer to complete
+            await asyncio.sleep(0.05 / (1 + values.index(chunk[0])))
+            return await self.execute_query(query, endpoint_url, ttl)
+
+        with patch.object(Wikibase, "aexecute_query", side_effect=execute_query):
+            rows = Wikibase.iter_values_query_in_chunks(
+                Template("$values"), "values", values, ENDPOINT, preserve_order=True
+            )
+            self.assertEqual(values, [d["value"] for d in rows])
+        self.assertGreater(self.scheduler.stats().splits, 0)
+
+    def test_stream_completed_chunks(self):
+        values = [f"v{i}" for i in range(100)]
+        release_slow_chunk = threading.Event()
+
+        async def execute_query(query: str, endpoint_url: str, ttl: float | None = None) -> list[dict]:
+            chunk = query.split()
+            if chunk[0] == "v0":
+                await asyncio.to_thread(release_slow_chunk.wait, 5)
+            return [{"value": value} for value in chunk]
+
+        with patch.object(Wikibase, "aexecute_query", side_effect=execute_query):
+            rows = Wikibase.iter_values_query_in_chunks(Template("$values"), "values", values, ENDPOINT, chunk_size=50)
+            # the second chunk is yielded while the first chunk is still running
+            self.assertEqual("v50", next(rows)["value"])
+            release_slow_chunk.set()
+            self.assertEqual(99, len(list(rows)))
+
+
+if __name__ == "__main__":
+    unittest.main()
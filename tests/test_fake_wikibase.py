@@ -0,0 +1,95 @@
+import os
+import time
+import unittest
+from unittest.mock import patch
+
+from wikibaseintegrator.wbi_login import LoginError
+
+from ceur_graph.ceur_dev import CeurDev, CeurDevSettings
+from ceur_graph.datamodel.auth import WikibaseBotAuth
+from ceur_graph.resilience import EndpointGuard, get_endpoint_guard, set_endpoint_guard
+from tests.fake_wikibase import FakeWikibase
+
+
+class TestFakeWikibase(unittest.TestCase):
+    """
+    tests CeurDev against the local stand-in of the ceur-dev instance
+    """
+
+    def setUp(self):
+        self.fake = FakeWikibase()
+        self.fake.load_fixture()
+        self.fake.add_user("alice@bot", "secret")
+        self.fake.start()
+        self.addCleanup(self.fake.stop)
+        set_endpoint_guard(EndpointGuard(self.fake.mediawiki_api_url, base_delay=0.001))
+        set_endpoint_guard(EndpointGuard(self.fake.sparql_endpoint, base_delay=0.001))
+        self.ceur_dev = CeurDev(
+            WikibaseBotAuth(user="alice@bot", password="secret"), settings=self.fake.get_ceur_dev_settings()
+        )
+
+    def test_settings_from_environment(self):
+        with patch.dict(os.environ, self.fake.get_environment()):
+            ceur_dev = CeurDev()
+        self.assertEqual(self.fake.mediawiki_api_url, ceur_dev.mediawiki_api_url.unicode_string())
+        self.assertEqual(self.fake.sparql_endpoint, ceur_dev.sparql_endpoint.unicode_string())
+        # the concept URIs stay the ones used in the queries
+        self.assertEqual(CeurDevSettings().item_prefix, ceur_dev.item_prefix)
+
+    def test_queries(self):
+        self.assertEqual(self.ceur_dev.get_entity_uri("Q100"), self.ceur_dev.get_proceedings_by_volume_number(1))
+        self.assertEqual(
+            [self.ceur_dev.get_entity_uri(f"Q{qid}") for qid in (201, 202, 203)],
+            sorted(self.ceur_dev.get_papers_of_proceedings_by_volume_number(2)),
+        )
+        self.assertIsNone(self.ceur_dev.get_proceedings_by_volume_number(3))
+        property_types = self.ceur_dev.get_property_types_of({"P15", "P12"})
+        self.assertEqual("http://wikiba.se/ontology#WikibaseItem", property_types[self.ceur_dev.get_entity_uri("P15")])
+        self.assertEqual("http://wikiba.se/ontology#Url", property_types[self.ceur_dev.get_entity_uri("P12")])
+
+    def test_write_items(self):
+        item = self.ceur_dev.get_item("Q101")
+        self.assertEqual("Paper 1 of Vol-1", item.labels.get("en").value)
+        item.labels.set("en", "Renamed paper")
+        self.ceur_dev.write_item(item, summary="rename")
+        new_item = self.ceur_dev.wbi.item.new()
+        new_item.labels.set("en", "New paper")
+        new_item = self.ceur_dev.write_item(new_item)
+        uris = [self.ceur_dev.get_entity_uri(qid) for qid in ("Q101", new_item.id)]
+        self.assertEqual(
+            {uris[0]: "Renamed paper", uris[1]: "New paper"},
+            self.ceur_dev.get_entity_label(uris),
+        )
+        self.assertEqual(1, self.fake.requests["api:login"])
+        self.ceur_dev.delete_entity(new_item)
+        self.assertEqual([None], self.ceur_dev.get_items([new_item.id]))
+
+    def test_login_with_wrong_password(self):
+        ceur_dev = CeurDev(
+            WikibaseBotAuth(user="alice@bot", password="wrong"), settings=self.fake.get_ceur_dev_settings()
+        )
+        with self.assertRaises(LoginError):
+            _ = ceur_dev.wbi
+
+    def test_injected_errors_are_retried(self):
+        self.ceur_dev.login()
+        self.fake.inject_error(endpoint="api", status=503)
+        self.fake.inject_error(endpoint="api", mediawiki_code="maxlag")
+        self.assertEqual("CEUR Workshop Proceedings", self.ceur_dev.get_item("Q13").labels.get("en").value)
+        metrics = get_endpoint_guard(self.fake.mediawiki_api_url).metrics()
+        self.assertEqual(2, metrics.retries)
+        self.assertEqual(1, metrics.throttled)
+        self.fake.inject_error(endpoint="sparql", status=429, retry_after=0)
+        self.assertEqual(self.ceur_dev.get_entity_uri("Q200"), self.ceur_dev.get_proceedings_by_volume_number(2))
+        self.assertEqual(1, get_endpoint_guard(self.fake.sparql_endpoint).metrics().throttled)
+        self.assertEqual(1, self.fake.requests["sparql:error"])
+
+    def test_latency(self):
+        self.fake.latency = 0.1
+        start = time.perf_counter()
+        self.ceur_dev.get_items(["Q13"])
+        self.assertGreaterEqual(time.perf_counter() - start, 0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
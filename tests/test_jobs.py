@@ -0,0 +1,110 @@
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from ceur_graph.jobs import Job, JobDeferredError, JobManager, JobStatus, JobStore
+
+
+class TestJobManager(unittest.TestCase):
+    """
+    tests the execution and persistence of background jobs
+    """
+
+    def test_run_jobs(self):
+        manager = JobManager()
+        manager.register("square", lambda job: job.params["value"] ** 2)
+        manager.register("fail", lambda job: 1 / 0)
+        succeeding = manager.submit("square", {"value": 3}, username="alice")
+        failing = manager.submit("fail", {})
+        self.assertEqual(JobStatus.QUEUED, manager.get_job(succeeding.job_id).status)
+        self.assertEqual(succeeding.job_id, manager.run_next().job_id)
+        job = manager.run_next()
+        self.assertEqual(failing.job_id, job.job_id)
+        self.assertEqual(JobStatus.FAILED, job.status)
+        self.assertIn("division by zero", job.error)
+        job = manager.get_job(succeeding.job_id)
+        self.assertEqual(JobStatus.SUCCEEDED, job.status)
+        self.assertEqual(9, job.result)
+        self.assertEqual("alice", job.username)
+        self.assertIsNone(manager.run_next())
+        stats = manager.stats()
+        self.assertEqual(1, stats.succeeded)
+        self.assertEqual(1, stats.failed)
+
+    def test_unknown_kind(self):
+        with self.assertRaises(ValueError):
+            JobManager().submit("unknown", {})
+
+    def test_defer(self):
+        manager = JobManager(defer_delay=60)
+        attempts = []
+
+        def handler(job: Job):
+            attempts.append(job.attempts)
+            if len(attempts) == 1:
+                raise JobDeferredError("waiting for login")
+            return "done"
+
+        manager.register("deferred", handler)
+        manager.submit("deferred", {})
+        job = manager.run_next()
+        self.assertEqual(JobStatus.QUEUED, job.status)
+        self.assertEqual("waiting for login", job.error)
+        # the job is not due before the deferral delay
+        self.assertIsNone(manager.run_next())
+        manager.store.defer(job.job_id, time.time(), "due")
+        job = manager.run_next()
+        self.assertEqual(JobStatus.SUCCEEDED, job.status)
+        self.assertEqual([1, 2], attempts)
+
+    def test_worker_pool(self):
+        manager = JobManager(workers=2)
+        running = 0
+        max_running = 0
+        lock = threading.Lock()
+
+        def handler(job: Job):
+            nonlocal running, max_running
+            with lock:
+                running += 1
+                max_running = max(max_running, running)
+            time.sleep(0.05)
+            with lock:
+                running -= 1
+            return job.params["value"]
+
+        manager.register("sleep", handler)
+        manager.start()
+        jobs = [manager.submit("sleep", {"value": i}) for i in range(6)]
+        deadline = time.time() + 10
+        while time.time() < deadline and manager.stats().succeeded < len(jobs):
+            time.sleep(0.01)
+        manager.stop()
+        self.assertEqual([i for i in range(6)], [manager.get_job(job.job_id).result for job in jobs])
+        self.assertEqual(2, max_running)
+
+    def test_queued_jobs_survive_restart(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir).joinpath("jobs.sqlite")
+            store = JobStore(path)
+            manager = JobManager(store)
+            manager.register("echo", lambda job: job.params)
+            queued = manager.submit("echo", {"value": 1})
+            interrupted = manager.submit("echo", {"value": 2})
+            store.claim_next(["echo"])
+            store.close()
+
+            restarted = JobManager(JobStore(path))
+            restarted.register("echo", lambda job: job.params)
+            self.assertEqual(JobStatus.QUEUED, restarted.get_job(interrupted.job_id).status)
+            restarted.run_next()
+            restarted.run_next()
+            for job in [queued, interrupted]:
+                self.assertEqual(job.params, restarted.get_job(job.job_id).result)
+            restarted.store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from ceur_graph.datamodel.auth import WikibaseBotAuth
+from ceur_graph.migration import (
+    MigratorPool,
+    ProfileCache,
+    SharedItemMapper,
+    get_migration_profile_resource,
+    get_user_profile,
+)
+
+
+class TestMigration(unittest.TestCase):
+    """
+    tests the caching of the migration profile, mappings and migrators
+    """
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.profile_path = Path(tmp_dir.name).joinpath("profile.yaml")
+        with get_migration_profile_resource().open("rb") as source, open(self.profile_path, "wb") as target:
+            shutil.copyfileobj(source, target)
+
+    def touch_profile(self):
+        mtime = self.profile_path.stat().st_mtime + 10
+        os.utime(self.profile_path, (mtime, mtime))
+
+    def test_load_profile_once(self):
+        cache = ProfileCache()
+        self.assertIs(cache.get(), cache.get())
+        self.assertEqual(1, cache.loads)
+
+    def test_hot_reload(self):
+        cache = ProfileCache(self.profile_path, check_interval=0)
+        profile = cache.get()
+        self.assertIs(profile, cache.get())
+        self.touch_profile()
+        self.assertIsNot(profile, cache.get())
+        self.assertEqual(2, cache.generation)
+
+    def test_user_profile_overlay(self):
+        profile = ProfileCache(self.profile_path).get()
+        user_profile = get_user_profile(profile, WikibaseBotAuth(user="alice", password="secret"))
+        self.assertEqual("alice", user_profile.target.user)
+        self.assertEqual("secret", user_profile.target.bot_password)
+        self.assertIsNone(profile.target.bot_password)
+        self.assertIs(profile.mapping, user_profile.mapping)
+        self.assertIs(profile.source, user_profile.source)
+
+    def test_pool_migrators_per_user(self):
+        pool = MigratorPool(ProfileCache(self.profile_path, check_interval=0))
+        alice = MagicMock(auth_config=WikibaseBotAuth(user="alice", password="secret"))
+        bob = MagicMock(auth_config=WikibaseBotAuth(user="bob", password="secret"))
+        migrator = pool.get_migrator("alice", alice)
+        self.assertIs(migrator, pool.get_migrator("alice", alice))
+        other = pool.get_migrator("bob", bob)
+        self.assertIsNot(migrator, other)
+        # all migrators share the cached mappings
+        self.assertIs(migrator.mapper, other.mapper)
+        # writes use the login of the session
+        self.assertIs(alice.login.return_value, migrator.get_wikibase_login(migrator.profile.target))
+        self.touch_profile()
+        reloaded = pool.get_migrator("alice", alice)
+        self.assertIsNot(migrator, reloaded)
+        self.assertIsNot(migrator.mapper, reloaded.mapper)
+        stats = pool.stats()
+        self.assertEqual(1, stats.migrators_reused)
+        self.assertEqual(3, stats.migrators_created)
+        self.assertEqual(2, stats.migrators)
+
+    def test_shared_mapper(self):
+        mapper = SharedItemMapper(ProfileCache(self.profile_path).get(), missing_ttl=60)
+        queried = []
+
+        def query_mappings_for(ids):
+            queried.append(sorted(ids))
+            mapper._init_cache_for(ids)
+
+        with patch.object(mapper, "query_mappings_for", side_effect=query_mappings_for):
+            mapper.prepare_cache_for(["Q1", "Q2"])
+            mapper.add_mappings({"Q1": "Q10"})
+            mapper.prepare_cache_for(["Q1", "Q2"])
+            self.assertEqual("Q10", mapper.get_mapping_for("Q1"))
+            self.assertEqual([["Q1", "Q2"]], queried)
+            # missing mappings expire
+            with patch("ceur_graph.migration.time.monotonic", return_value=time.monotonic() + 120):
+                mapper.prepare_cache_for(["Q1", "Q2"])
+            self.assertEqual([["Q1", "Q2"], ["Q2"]], queried)
+            mapper.invalidate(["Q1"])
+            mapper.prepare_cache_for(["Q1", "Q2"])
+            self.assertEqual([["Q1", "Q2"], ["Q2"], ["Q1"]], queried)
+
+
+if __name__ == "__main__":
+    unittest.main()
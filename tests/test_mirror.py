@@ -0,0 +1,165 @@
+import time
+import unittest
+from datetime import UTC, datetime
+from unittest.mock import patch
+
+from ceur_graph.ceur_dev import CeurDev
+from ceur_graph.mirror import MirrorStore, WikibaseMirror
+from ceur_graph.wikibase import remove_mirror, set_mirror
+
+ENTITY_PREFIX = "https://ceur-dev.wikibase.cloud/entity/"
+
+
+def get_item_snak(prop_nr: str, qid: str) -> dict:
+    return {
+        "snaktype": "value",
+        "property": prop_nr,
+        "datavalue": {"value": {"entity-type": "item", "id": qid}, "type": "wikibase-entityid"},
+        "datatype": "wikibase-item",
+    }
+
+
+def get_entity_json(entity_id: str, claims: dict | None = None) -> dict:
+    return {
+        "type": "item",
+        "id": entity_id,
+        "lastrevid": 1,
+        "labels": {"en": {"language": "en", "value": f"label of {entity_id}"}},
+        "descriptions": {},
+        "aliases": {},
+        "sitelinks": {},
+        "claims": claims or {},
+    }
+
+
+def get_volume_json(entity_id: str, volume_number: int) -> dict:
+    claim = {
+        "id": f"{entity_id}$1",
+        "type": "statement",
+        "rank": "normal",
+        "mainsnak": get_item_snak("P15", "Q13"),
+        "qualifiers": {
+            "P17": [
+                {
+                    "snaktype": "value",
+                    "property": "P17",
+                    "datavalue": {"value": str(volume_number), "type": "string"},
+                    "datatype": "string",
+                }
+            ]
+        },
+    }
+    return get_entity_json(entity_id, {"P15": [claim]})
+
+
+def get_paper_json(entity_id: str, volume_id: str) -> dict:
+    claim = {"id": f"{entity_id}$1", "type": "statement", "rank": "normal", "mainsnak": get_item_snak("P94", volume_id)}
+    return get_entity_json(entity_id, {"P94": [claim]})
+
+
+class TestMirror(unittest.TestCase):
+    """
+    tests the local mirror of the ceur-dev wikibase
+    """
+
+    def setUp(self):
+        self.ceur_dev = CeurDev()
+        self.entities = {
+            "Q100": get_volume_json("Q100", 3450),
+            "Q101": get_paper_json("Q101", "Q100"),
+            "Q102": get_paper_json("Q102", "Q100"),
+            "Q200": get_volume_json("Q200", 3451),
+        }
+        self.modified = [f"{ENTITY_PREFIX}{entity_id}" for entity_id in self.entities]
+        self.mirror = WikibaseMirror(self.ceur_dev, MirrorStore(), max_staleness=60)
+        set_mirror(self.mirror)
+        patchers = [
+            patch.object(CeurDev, "get_items_modified_at", side_effect=lambda start, end: set(self.modified)),
+            patch.object(CeurDev, "get_entities_json", side_effect=self.get_entities_json),
+            patch.object(CeurDev, "execute_query", side_effect=AssertionError("query service must not be used")),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        remove_mirror(self.ceur_dev.mediawiki_api_url)
+
+    def get_entities_json(self, entity_ids: list[str]) -> dict:
+        return {entity_id: self.entities.get(entity_id, {"id": entity_id, "missing": ""}) for entity_id in entity_ids}
+
+    def test_sync(self):
+        self.assertFalse(self.mirror.is_fresh())
+        result = self.mirror.sync(until=datetime(2025, 1, 1, tzinfo=UTC))
+        self.assertEqual(4, result.updated)
+        self.assertTrue(self.mirror.is_fresh())
+        self.assertEqual(datetime(2025, 1, 1, tzinfo=UTC), self.mirror.get_watermark())
+        self.assertEqual(["Q100"], self.mirror.find_entities("P15", "Q13", qualifier=("P17", "3450")))
+        self.assertEqual([], self.mirror.find_entities("P15", "Q13", qualifier=("P17", "1")))
+        self.assertEqual(["Q101", "Q102"], self.mirror.find_entities("P94", "Q100"))
+        self.assertEqual("label of Q101", self.ceur_dev.get_item("Q101").labels.get("en").value)
+
+        # incremental sync removes deleted entities and moves the paper to another volume
+        del self.entities["Q102"]
+        self.entities["Q101"] = get_paper_json("Q101", "Q200")
+        self.modified = [f"{ENTITY_PREFIX}Q101", f"{ENTITY_PREFIX}Q102"]
+        result = self.mirror.sync()
+        self.assertEqual(1, result.updated)
+        self.assertEqual(1, result.deleted)
+        self.assertEqual([], self.mirror.find_entities("P94", "Q100"))
+        self.assertEqual(["Q101"], self.mirror.find_entities("P94", "Q200"))
+
+    def test_staleness(self):
+        self.mirror.sync()
+        self.mirror.store.set_state(WikibaseMirror.LAST_SYNC_KEY, str(time.time() - 120))
+        self.assertFalse(self.mirror.is_fresh())
+        self.assertIsNone(self.mirror.find_entities("P94", "Q100"))
+        self.assertIsNone(self.mirror.get_entity_json("Q100"))
+
+    def test_modified_entities(self):
+        self.mirror.sync()
+        self.ceur_dev.mark_mirror_outdated("Q101")
+        # only the written entity and searches are not answered from the mirror
+        self.assertTrue(self.mirror.is_fresh())
+        self.assertIsNone(self.mirror.get_entity_json("Q101"))
+        self.assertIsNotNone(self.mirror.get_entity_json("Q102"))
+        self.assertIsNone(self.mirror.find_entities("P94", "Q100"))
+        self.modified = []
+        self.mirror.sync()
+        self.assertTrue(self.mirror.is_fresh())
+        self.assertEqual({}, self.mirror.store.get_pending())
+
+    def test_write_during_sync(self):
+        self.mirror.sync()
+        self.ceur_dev.mark_mirror_outdated("Q101")
+
+        def get_entities_json(entity_ids: list[str]) -> dict:
+            entities = self.get_entities_json(entity_ids)
+            # the pending entity is written again after it was fetched
+            self.ceur_dev.mark_mirror_outdated("Q101")
+            return entities
+
+        self.modified = []
+        with patch.object(CeurDev, "get_entities_json", side_effect=get_entities_json):
+            self.mirror.sync()
+        self.assertEqual(["Q101"], list(self.mirror.store.get_pending()))
+        self.assertIsNone(self.mirror.get_entity_json("Q101"))
+        self.mirror.sync()
+        self.assertEqual({}, self.mirror.store.get_pending())
+        self.assertIsNotNone(self.mirror.get_entity_json("Q101"))
+
+    def test_get_item_for_update(self):
+        self.mirror.sync()
+        # edit made after the sync that the mirror does not know yet
+        self.entities["Q101"] = get_paper_json("Q101", "Q200")
+        with patch.object(CeurDev, "_get_entities_json", side_effect=self.get_entities_json) as get_entities_json:
+            item = self.ceur_dev.get_item("Q101")
+            get_entities_json.assert_not_called()
+            self.assertEqual("Q100", item.claims.get("P94")[0].mainsnak.datavalue["value"]["id"])
+            item = self.ceur_dev.get_item("Q101", for_update=True)
+            get_entities_json.assert_called_once_with(["Q101"])
+            self.assertEqual("Q200", item.claims.get("P94")[0].mainsnak.datavalue["value"]["id"])
+
+
+if __name__ == "__main__":
+    unittest.main()
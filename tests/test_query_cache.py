@@ -0,0 +1,94 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from ceur_graph.query_cache import MemoryCacheBackend, QueryCache, SqliteCacheBackend
+
+ENDPOINT = "https://example.org/sparql"
+
+
+class TestQueryCache(unittest.TestCase):
+    """
+    tests the SPARQL result cache
+    """
+
+    def test_normalized_key(self):
+        query_a = """
+            SELECT ?s {
+              ?s ?p ?o.
+            }
+        """
+        query_b = "SELECT ?s {\n?s ?p ?o.\n}"
+        self.assertEqual(QueryCache.get_key(query_a, ENDPOINT), QueryCache.get_key(query_b, ENDPOINT))
+        self.assertNotEqual(QueryCache.get_key(query_a, ENDPOINT), QueryCache.get_key(query_a, "https://other.org"))
+
+    def test_hit_miss_and_ttl(self):
+        cache = QueryCache(default_ttl=60)
+        self.assertIsNone(cache.get("q", ENDPOINT))
+        cache.set("q", ENDPOINT, [{"a": "1"}])
+        self.assertEqual([{"a": "1"}], cache.get("q", ENDPOINT))
+        cache.set("expired", ENDPOINT, [{"a": "1"}], ttl=0.01)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("expired", ENDPOINT))
+        stats = cache.stats()
+        self.assertEqual(1, stats.hits)
+        self.assertEqual(2, stats.misses)
+
+    def test_lru_eviction(self):
+        cache = QueryCache(backend=MemoryCacheBackend(max_bytes=20), default_ttl=60)
+        cache.set("q1", ENDPOINT, ["x" * 5])
+        cache.set("q2", ENDPOINT, ["x" * 5])
+        cache.get("q1", ENDPOINT)
+        cache.set("q3", ENDPOINT, ["x" * 5])
+        self.assertIsNotNone(cache.get("q1", ENDPOINT))
+        self.assertIsNone(cache.get("q2", ENDPOINT))
+        self.assertEqual(1, cache.stats().evictions)
+
+    def test_invalidation(self):
+        cache = QueryCache(default_ttl=60)
+        cache.set("q1", ENDPOINT, [])
+        cache.set("q2", ENDPOINT, [])
+        cache.set("q1", "https://other.org", [])
+        self.assertEqual(1, cache.invalidate("q1", ENDPOINT))
+        self.assertEqual(1, cache.invalidate(endpoint_url=ENDPOINT))
+        self.assertEqual(1, cache.stats().entries)
+
+    def test_opt_in(self):
+        cache = QueryCache()
+        cache.set("q", ENDPOINT, [{"a": "1"}])
+        self.assertIsNone(cache.get("q", ENDPOINT))
+        cache.set("q", ENDPOINT, [{"a": "1"}], ttl=60)
+        self.assertEqual([{"a": "1"}], cache.get("q", ENDPOINT))
+
+    def test_invalidation_window(self):
+        cache = QueryCache(default_ttl=60, invalidation_window=0.05)
+        cache.invalidate(endpoint_url=ENDPOINT)
+        # results read right after a write might not contain the write yet
+        cache.set("q", ENDPOINT, [])
+        self.assertIsNone(cache.get("q", ENDPOINT))
+        cache.set("q", "https://other.org", [])
+        self.assertEqual([], cache.get("q", "https://other.org"))
+        time.sleep(0.05)
+        cache.set("q", ENDPOINT, [])
+        self.assertEqual([], cache.get("q", ENDPOINT))
+
+    def test_sqlite_backend(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "cache.db"
+            backend = SqliteCacheBackend(path, max_bytes=20)
+            cache = QueryCache(backend=backend, default_ttl=60)
+            cache.set("q1", ENDPOINT, ["x" * 5])
+            cache.set("q2", ENDPOINT, ["x" * 5])
+            cache.get("q1", ENDPOINT)
+            cache.set("q3", ENDPOINT, ["x" * 5])
+            self.assertEqual(["x" * 5], cache.get("q1", ENDPOINT))
+            self.assertIsNone(cache.get("q2", ENDPOINT))
+            backend.close()
+            reopened = QueryCache(backend=SqliteCacheBackend(path))
+            self.assertEqual(["x" * 5], reopened.get("q3", ENDPOINT))
+            reopened.backend.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
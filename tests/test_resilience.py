@@ -0,0 +1,165 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock
+
+import httpx
+import requests
+from wikibaseintegrator.wbi_exceptions import MaxRetriesReachedException
+
+from ceur_graph.resilience import (
+    CircuitOpenError,
+    CircuitState,
+    EndpointGuard,
+    TokenBucket,
+    classify_mediawiki_error,
+    classify_sparql_error,
+    record_mediawiki_throttling,
+    set_endpoint_guard,
+)
+from ceur_graph.sparql import SparqlClient
+
+ENDPOINT = "https://example.org/resilience/sparql"
+
+
+def get_requests_response(status_code: int, content: bytes = b"{}", headers: dict | None = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    response.headers.update(headers or {})
+    return response
+
+
+class TestEndpointGuard(unittest.TestCase):
+    """
+    tests rate limiting, retries and the circuit breaker
+    """
+
+    def test_token_bucket(self):
+        bucket = TokenBucket(rate=10, capacity=2)
+        self.assertEqual(0, bucket.reserve())
+        self.assertEqual(0, bucket.reserve())
+        self.assertAlmostEqual(0.1, bucket.reserve(), places=2)
+        self.assertAlmostEqual(0.2, bucket.reserve(), places=2)
+
+    def test_retry_throttled_call(self):
+        guard = EndpointGuard(ENDPOINT, base_delay=0.001)
+        throttled = httpx.HTTPStatusError(
+            "throttled",
+            request=httpx.Request("POST", ENDPOINT),
+            response=httpx.Response(429, headers={"Retry-After": "0.05"}),
+        )
+        func = MagicMock(side_effect=[throttled, "result"])
+        self.assertEqual("result", guard.call(func, classify=classify_sparql_error))
+        metrics = guard.metrics()
+        self.assertEqual(2, metrics.attempts)
+        self.assertEqual(1, metrics.retries)
+        self.assertEqual(1, metrics.throttled)
+        self.assertGreaterEqual(metrics.backoff_wait, 0.05)
+        self.assertEqual(CircuitState.CLOSED, metrics.circuit_state)
+
+    def test_circuit_breaker(self):
+        guard = EndpointGuard(ENDPOINT, max_retries=0, failure_threshold=2, reset_timeout=0.05)
+        func = MagicMock(side_effect=httpx.ConnectError("unreachable"))
+        for _ in range(2):
+            self.assertRaises(httpx.ConnectError, guard.call, func, classify=classify_sparql_error)
+        # fails fast without calling the endpoint
+        self.assertRaises(CircuitOpenError, guard.call, func, classify=classify_sparql_error)
+        self.assertEqual(2, func.call_count)
+        metrics = guard.metrics()
+        self.assertEqual(CircuitState.OPEN, metrics.circuit_state)
+        self.assertEqual(1, metrics.circuit_trips)
+        self.assertEqual(1, metrics.circuit_rejections)
+        # a successful trial call closes the circuit
+        guard.breaker._opened_at -= 0.05
+        self.assertEqual("result", guard.call(lambda: "result", classify=classify_sparql_error))
+        self.assertEqual(CircuitState.CLOSED, guard.metrics().circuit_state)
+
+    def test_throttled_trial_call(self):
+        guard = EndpointGuard(ENDPOINT, max_retries=0, failure_threshold=1, reset_timeout=0.05)
+        self.assertRaises(
+            httpx.ConnectError,
+            guard.call,
+            MagicMock(side_effect=httpx.ConnectError("unreachable")),
+            classify=classify_sparql_error,
+        )
+        guard.breaker._opened_at -= 0.05
+        throttled = httpx.HTTPStatusError(
+            "throttled", request=httpx.Request("POST", ENDPOINT), response=httpx.Response(429)
+        )
+        self.assertRaises(
+            httpx.HTTPStatusError, guard.call, MagicMock(side_effect=throttled), classify=classify_sparql_error
+        )
+        # the throttled trial neither closes nor reopens the circuit, the next call is the trial
+        self.assertEqual(CircuitState.HALF_OPEN, guard.metrics().circuit_state)
+        self.assertEqual("result", guard.call(lambda: "result", classify=classify_sparql_error))
+        self.assertEqual(CircuitState.CLOSED, guard.metrics().circuit_state)
+
+    def test_cancelled_trial_call(self):
+        guard = EndpointGuard(ENDPOINT, max_retries=0, failure_threshold=1, reset_timeout=0.05)
+        self.assertRaises(
+            httpx.ConnectError,
+            guard.call,
+            MagicMock(side_effect=httpx.ConnectError("unreachable")),
+            classify=classify_sparql_error,
+        )
+        guard.breaker._opened_at -= 0.05
+
+        async def cancelled_trial():
+            task = asyncio.create_task(guard.acall(lambda: asyncio.sleep(10), classify=classify_sparql_error))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancelled_trial())
+
+        async def result():
+            return "result"
+
+        self.assertEqual("result", asyncio.run(guard.acall(result, classify=classify_sparql_error)))
+        self.assertEqual(CircuitState.CLOSED, guard.metrics().circuit_state)
+
+    def test_client_errors_are_not_retried(self):
+        guard = EndpointGuard(ENDPOINT)
+        bad_request = httpx.HTTPStatusError(
+            "bad request", request=httpx.Request("POST", ENDPOINT), response=httpx.Response(400)
+        )
+        func = MagicMock(side_effect=bad_request)
+        self.assertRaises(httpx.HTTPStatusError, guard.call, func, classify=classify_sparql_error)
+        self.assertEqual(1, func.call_count)
+        self.assertEqual(0, guard.metrics().failures)
+
+    def test_mediawiki_maxlag(self):
+        record_mediawiki_throttling(
+            get_requests_response(200, b'{"error": {"code": "maxlag", "info": "lagged", "lag": 7}}')
+        )
+        failure = classify_mediawiki_error(MaxRetriesReachedException("gave up"))
+        self.assertTrue(failure.throttled)
+        self.assertEqual(7, failure.retry_after)
+        # the reported throttling is consumed
+        failure = classify_mediawiki_error(MaxRetriesReachedException("gave up"))
+        self.assertFalse(failure.throttled)
+        record_mediawiki_throttling(get_requests_response(200, b'{"entities": {}}'))
+        self.assertIsNone(classify_mediawiki_error(ValueError("invalid")))
+
+
+class TestSparqlClientResilience(unittest.TestCase):
+    """
+    tests that the SPARQL client retries throttled queries
+    """
+
+    def test_retry_after_throttling(self):
+        responses = [
+            httpx.Response(429, headers={"Retry-After": "0"}),
+            httpx.Response(200, json={"head": {"vars": ["q"]}, "results": {"bindings": [{"q": {"value": "1"}}]}}),
+        ]
+        client = SparqlClient(transport=httpx.MockTransport(lambda request: responses.pop(0)))
+        self.addCleanup(client.close)
+        guard = EndpointGuard(ENDPOINT, base_delay=0.001)
+        set_endpoint_guard(guard)
+        self.assertEqual([{"q": "1"}], list(client.iter_query("SELECT ?q {}", ENDPOINT)))
+        self.assertEqual(1, guard.metrics().throttled)
+
+
+if __name__ == "__main__":
+    unittest.main()
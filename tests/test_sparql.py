@@ -0,0 +1,116 @@
+import asyncio
+import json
+import unittest
+from urllib.parse import parse_qs
+
+import httpx
+
+from ceur_graph.sparql import SparqlClient, SparqlJsonStreamParser
+
+ENDPOINT = "https://example.org/sparql"
+
+
+class TestSparqlClient(unittest.IsolatedAsyncioTestCase):
+    """
+    tests the pooled SPARQL client against a mocked endpoint
+    """
+
+    def setUp(self):
+        self.requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            query = parse_qs(request.content.decode())["query"][0]
+            return httpx.Response(200, json={"results": {"bindings": [{"q": {"type": "literal", "value": query}}]}})
+
+        self.client = SparqlClient(user_agent="test-agent", transport=httpx.MockTransport(handler))
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_query(self):
+        res = self.client.query("SELECT * {}", ENDPOINT)
+        self.assertEqual("SELECT * {}", res["results"]["bindings"][0]["q"]["value"])
+        self.assertEqual("test-agent", self.requests[0].headers["User-Agent"])
+
+    async def test_aquery_from_foreign_loop(self):
+        queries = [f"SELECT {i}" for i in range(5)]
+        results = await asyncio.gather(*[self.client.aquery(query, ENDPOINT) for query in queries])
+        self.assertEqual(queries, [res["results"]["bindings"][0]["q"]["value"] for res in results])
+
+    def test_shared_pool(self):
+        self.client.query("SELECT 1", ENDPOINT)
+        pool = self.client._client
+        self.client.query("SELECT 2", ENDPOINT)
+        self.assertIs(pool, self.client._client)
+
+
+def get_sparql_result(number_of_rows: int) -> dict:
+    bindings = []
+    for i in range(number_of_rows):
+        binding = {"item": {"type": "uri", "value": f"https://example.org/Q{i}"}}
+        if i % 2 == 0:
+            binding["label"] = {"type": "literal", "xml:lang": "en", "value": f"label [{i}], {{escaped}}"}
+        bindings.append(binding)
+    return {"head": {"vars": ["item", "label"]}, "results": {"bindings": bindings}}
+
+
+class TestSparqlJsonStreamParser(unittest.TestCase):
+    """
+    tests the incremental parsing of SPARQL JSON results
+    """
+
+    def test_feed_in_chunks(self):
+        result = get_sparql_result(10)
+        text = json.dumps(result, indent=2)
+        for chunk_size in [1, 7, len(text)]:
+            with self.subTest(chunk_size=chunk_size):
+                parser = SparqlJsonStreamParser()
+                bindings = []
+                for i in range(0, len(text), chunk_size):
+                    bindings.extend(parser.feed(text[i : i + chunk_size]))
+                parser.close()
+                self.assertEqual(["item", "label"], parser.vars)
+                self.assertEqual(result["results"]["bindings"], bindings)
+
+    def test_truncated_result(self):
+        parser = SparqlJsonStreamParser()
+        text = json.dumps(get_sparql_result(3))
+        self.assertEqual(2, len(parser.feed(text[: text.rindex("{")])))
+        self.assertRaises(ValueError, parser.close)
+
+
+class TestSparqlClientStreaming(unittest.TestCase):
+    """
+    tests streaming query results from a mocked endpoint
+    """
+
+    def setUp(self):
+        content = json.dumps(get_sparql_result(5)).encode()
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=content))
+        self.client = SparqlClient(transport=transport)
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_iter_query(self):
+        rows = list(self.client.iter_query("SELECT * {}", ENDPOINT))
+        self.assertEqual(5, len(rows))
+        self.assertEqual({"item": "https://example.org/Q1"}, rows[1])
+
+    def test_iter_query_tuple_rows(self):
+        rows = list(self.client.iter_query("SELECT * {}", ENDPOINT, row_format="tuple"))
+        self.assertEqual(("https://example.org/Q1", None), rows[1])
+        rows = list(self.client.iter_query("SELECT * {}", ENDPOINT, row_format="namedtuple"))
+        self.assertEqual("https://example.org/Q2", rows[2].item)
+        self.assertEqual("label [2], {escaped}", rows[2].label)
+
+    def test_aiter_query(self):
+        async def collect() -> list:
+            return [row async for row in self.client.aiter_query("SELECT * {}", ENDPOINT, row_format="tuple")]
+
+        self.assertEqual(5, len(asyncio.run(collect())))
+
+
+if __name__ == "__main__":
+    unittest.main()
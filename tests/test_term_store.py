@@ -0,0 +1,92 @@
+import sqlite3
+import tempfile
+import unittest
+from datetime import UTC, datetime
+from pathlib import Path
+from unittest.mock import patch
+
+from ceur_graph.ceur_dev import CeurDev
+from ceur_graph.term_store import TermDictionary, TermStore
+from ceur_graph.wikibase import remove_term_dictionary, set_term_dictionary
+
+ENTITY_PREFIX = "https://ceur-dev.wikibase.cloud/entity/"
+
+
+class TestTermDictionary(unittest.TestCase):
+    """
+    tests the persistent label and property type dictionary with mocked queries
+    """
+
+    def setUp(self):
+        self.ceur_dev = CeurDev()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.path = Path(self.tmp_dir.name) / "terms.db"
+        self.term_dictionary = TermDictionary(self.ceur_dev, TermStore(self.path))
+        set_term_dictionary(self.term_dictionary)
+        self.addCleanup(remove_term_dictionary, self.ceur_dev.mediawiki_api_url)
+        self.queried_labels = []
+
+    def query_entity_labels(self, entity_ids: list[str], language: str) -> dict[str, str]:
+        self.queried_labels.append(entity_ids)
+        return {entity_id: f"{language} label of {entity_id}" for entity_id in entity_ids if entity_id.endswith("1")}
+
+    def test_labels(self):
+        uris = [f"{ENTITY_PREFIX}Q1", f"{ENTITY_PREFIX}Q2"]
+        with patch.object(CeurDev, "query_entity_labels", side_effect=self.query_entity_labels):
+            labels = self.ceur_dev.get_entity_label(uris)
+            self.assertEqual({uris[0]: f"en label of {uris[0]}"}, labels)
+            self.assertEqual(labels, self.ceur_dev.get_entity_label(uris))
+            self.assertEqual(1, len(self.queried_labels))
+            # only the missing language and entities are queried
+            self.ceur_dev.get_entity_label([*uris, f"{ENTITY_PREFIX}Q11"], language="de")
+            self.assertEqual([*uris, f"{ENTITY_PREFIX}Q11"], self.queried_labels[1])
+            self.ceur_dev.get_entity_label([f"{ENTITY_PREFIX}Q11", f"{ENTITY_PREFIX}Q3"])
+            self.assertEqual([[f"{ENTITY_PREFIX}Q11", f"{ENTITY_PREFIX}Q3"]], self.queried_labels[2:])
+        stats = self.term_dictionary.stats()
+        self.assertEqual(2, stats.hits)
+        self.assertEqual(7, stats.misses)
+        self.assertEqual(7, stats.labels)
+        # the store persists
+        self.term_dictionary.store.close()
+        store = TermStore(self.path)
+        self.addCleanup(store.close)
+        self.assertEqual({uris[0]: f"en label of {uris[0]}", uris[1]: None}, store.get_labels(uris, "en"))
+
+    def test_property_types(self):
+        property_types = {f"{ENTITY_PREFIX}P1": "http://wikiba.se/ontology#WikibaseItem"}
+        with patch.object(CeurDev, "query_all_property_types", return_value=property_types):
+            self.assertEqual(1, self.term_dictionary.preload_property_types())
+        with patch.object(CeurDev, "query_property_types", return_value={}) as query_property_types:
+            self.assertEqual(property_types, self.ceur_dev.get_property_types_of({"P1"}))
+            query_property_types.assert_not_called()
+
+    def test_sync(self):
+        uri = f"{ENTITY_PREFIX}Q1"
+        self.term_dictionary.sync(datetime(2024, 1, 1, tzinfo=UTC))
+        with patch.object(CeurDev, "query_entity_labels", side_effect=self.query_entity_labels):
+            self.ceur_dev.get_entity_label([uri])
+            with patch.object(CeurDev, "get_items_modified_at", return_value={uri}) as get_items_modified_at:
+                self.assertEqual(1, self.term_dictionary.sync(datetime(2024, 1, 2, tzinfo=UTC)))
+                self.assertEqual(datetime(2023, 12, 31, 23, 50, tzinfo=UTC), get_items_modified_at.call_args[0][0])
+            self.ceur_dev.get_entity_label([uri])
+        self.assertEqual(2, len(self.queried_labels))
+
+    def test_failed_invalidation(self):
+        uri = f"{ENTITY_PREFIX}Q1"
+        store = self.term_dictionary.store
+        store.set_labels({uri: "label"}, "en")
+        # let the second delete of the invalidation fail
+        store._con.execute("DROP TABLE property_types")
+        with self.assertRaises(sqlite3.OperationalError):
+            store.invalidate([uri])
+        self.assertEqual({uri: "label"}, store.get_labels([uri], "en"))
+        # the connection is not left in the failed transaction
+        store.set_labels({uri: "new label"}, "en")
+        other_store = TermStore(self.path)
+        self.addCleanup(other_store.close)
+        self.assertEqual({uri: "new label"}, other_store.get_labels([uri], "en"))
+
+
+if __name__ == "__main__":
+    unittest.main()
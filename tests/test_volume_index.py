@@ -0,0 +1,72 @@
+import unittest
+from unittest.mock import patch
+
+from ceur_graph.ceur_dev import CeurDev
+from ceur_graph.volume_index import VolumeIndex
+
+ENTITY_PREFIX = "https://ceur-dev.wikibase.cloud/entity/"
+
+
+def get_row(proceedings_id: str, volume_number: str, document_id: str | None = None) -> dict:
+    row = {"proceedings": f"{ENTITY_PREFIX}{proceedings_id}", "volume_number": volume_number}
+    if document_id is not None:
+        row["document"] = f"{ENTITY_PREFIX}{document_id}"
+    return row
+
+
+class TestVolumeIndex(unittest.TestCase):
+    """
+    tests the volume index with mocked query results
+    """
+
+    def setUp(self):
+        self.rows = [
+            get_row("Q100", "1", "Q101"),
+            get_row("Q100", "1", "Q102"),
+            get_row("Q200", "2"),
+            get_row("Q300", "3", "Q301"),
+            get_row("Q400", "invalid"),
+        ]
+        self.queries = []
+        self.ceur_dev = CeurDev()
+        self.volume_index = VolumeIndex(self.ceur_dev, page_size=2)
+        patcher = patch.object(CeurDev, "execute_query", side_effect=self.execute_query)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def execute_query(self, query: str, endpoint_url, ttl=None) -> list[dict]:
+        self.queries.append(query)
+        offset = int(query.split("OFFSET")[-1])
+        return self.rows[offset : offset + 2]
+
+    def test_load(self):
+        self.assertEqual(f"{ENTITY_PREFIX}Q100", self.volume_index.get_proceedings(1))
+        self.assertEqual(3, len(self.queries))
+        self.assertEqual(3, len(self.volume_index))
+        self.assertEqual([f"{ENTITY_PREFIX}Q101", f"{ENTITY_PREFIX}Q102"], self.volume_index.get_papers(1))
+        self.assertEqual([], self.volume_index.get_papers(2))
+        self.assertIsNone(self.volume_index.get_proceedings(4))
+        volumes = self.volume_index.get_volumes([3, 4])
+        self.assertEqual(f"{ENTITY_PREFIX}Q300", volumes[0].proceedings)
+        self.assertEqual([f"{ENTITY_PREFIX}Q301"], volumes[0].papers)
+        self.assertIsNone(volumes[1].proceedings)
+        self.assertEqual(3, len(self.queries))
+
+    def test_refresh(self):
+        self.volume_index.load()
+        # Q102 moved to volume 2 and volume 3 was renumbered to 4
+        modified = {f"{ENTITY_PREFIX}Q102", f"{ENTITY_PREFIX}Q300"}
+        refresh_rows = [get_row("Q200", "2", "Q102"), get_row("Q300", "4", "Q301")]
+        with (
+            patch.object(CeurDev, "get_items_modified_at", return_value=modified),
+            patch.object(CeurDev, "execute_query", return_value=refresh_rows),
+        ):
+            self.assertEqual(2, self.volume_index.refresh())
+        self.assertEqual([f"{ENTITY_PREFIX}Q101"], self.volume_index.get_papers(1))
+        self.assertEqual([f"{ENTITY_PREFIX}Q102"], self.volume_index.get_papers(2))
+        self.assertIsNone(self.volume_index.get_proceedings(3))
+        self.assertEqual([f"{ENTITY_PREFIX}Q301"], self.volume_index.get_papers(4))
+
+
+if __name__ == "__main__":
+    unittest.main()
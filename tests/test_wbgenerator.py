@@ -0,0 +1,137 @@
+import unittest
+
+from pydantic import AnyHttpUrl
+from wikibaseintegrator import WikibaseIntegrator
+
+from ceur_graph.datamodel.item import CEUR_DEV_ID
+from ceur_graph.datamodel.paper import Paper, PaperCreate, PaperUpdate
+from ceur_graph.datamodel.reference import Reference, ReferenceCreate
+from ceur_graph.datamodel.scholarsignature import ScholarSignature, ScholarSignatureCreate
+from ceur_graph.wbgenerator import (
+    FieldRole,
+    add_statement_from_model,
+    create_item_from_model,
+    delete_statement_by_matching_model,
+    get_mapping_plan,
+    get_model_from_item,
+    get_models_from_qualified_statement,
+    get_statement_index,
+    update_item_from_model,
+)
+
+
+class TestWbGenerator(unittest.TestCase):
+    """
+    tests the conversion between models and wikibase entities
+    """
+
+    def setUp(self):
+        self.wbi = WikibaseIntegrator()
+        self.paper = PaperCreate(
+            label="Test paper",
+            description="ceur-ws paper 2025",
+            title="Test paper title",
+            published_in="Q1",
+            full_work_available_at_url=AnyHttpUrl("https://ceur-ws.org/Vol-1/paper1.pdf"),
+            pages=12,
+        )
+
+    def test_mapping_plan(self):
+        plan = get_mapping_plan(Paper)
+        self.assertIs(plan, get_mapping_plan(Paper))
+        self.assertEqual(FieldRole.SUBJECT, plan.fields["qid"].role)
+        self.assertEqual(FieldRole.LABEL, plan.fields["label"].role)
+        self.assertEqual("P94", plan.fields["published_in"].prop_nr)
+        author_plan = get_mapping_plan(ScholarSignature)
+        self.assertEqual(FieldRole.STATEMENT, author_plan.fields["scholar_id"].role)
+        self.assertEqual(FieldRole.QUALIFIER, author_plan.fields["affiliation"].role)
+        self.assertTrue(author_plan.fields["affiliation"].is_list)
+
+    def test_statement_mapping_plan(self):
+        plan = get_mapping_plan(ScholarSignature)
+        self.assertIs(plan, get_mapping_plan(ScholarSignature))
+        self.assertIs(plan.fields["scholar_id"], plan.get_statement_subject())
+        self.assertEqual("P93", plan.get_statement_subject().prop_nr)
+        self.assertIn(plan.fields["affiliation"], plan.qualifiers)
+        self.assertNotIn(plan.fields["scholar_id"], plan.qualifiers)
+        # subclasses get their own plan
+        self.assertIsNot(plan, get_mapping_plan(ScholarSignatureCreate))
+
+    def test_item_roundtrip(self):
+        item = create_item_from_model(self.paper, self.wbi)
+        item.id = "Q42"
+        paper = get_model_from_item(item, Paper)
+        self.assertEqual("Q42", paper.qid)
+        self.assertEqual(self.paper.title, paper.title)
+        self.assertEqual(self.paper.pages, paper.pages)
+        self.assertEqual(self.paper.full_work_available_at_url, paper.full_work_available_at_url)
+
+        update_item_from_model(PaperUpdate(title="New title"), item)
+        self.assertEqual("New title", get_model_from_item(item, Paper).title)
+        self.assertEqual(1, len(item.claims.get("P5")))
+
+    def test_minimal_item_update(self):
+        item = create_item_from_model(self.paper, self.wbi)
+        item.id = "Q42"
+        for i, claim in enumerate(item.claims):
+            claim.id = f"Q42${i}"
+        report = update_item_from_model(PaperUpdate(title=self.paper.title, label=self.paper.label), item)
+        self.assertFalse(report.has_changes)
+        self.assertEqual(["label", "title"], report.unchanged)
+        self.assertFalse(any(claim.removed for claim in item.claims))
+
+        report = update_item_from_model(PaperUpdate(title="New title", pages=12), item)
+        self.assertEqual(["title"], report.changed)
+        self.assertEqual(["pages"], report.unchanged)
+        title_claims = item.claims.get("P5")
+        self.assertEqual([True, False], [claim.removed for claim in title_claims])
+        self.assertEqual("New title", get_model_from_item(item, Paper).title)
+
+    def test_statement_roundtrip(self):
+        item = create_item_from_model(self.paper, self.wbi)
+        author = ScholarSignatureCreate(
+            scholar_id="Q5",
+            object_named_as="Jane Doe",
+            series_ordinal=1,
+            affiliation=["Q7", "Q8"],
+        )
+        reference = ReferenceCreate(object_named_as="Some reference", series_ordinal=1, author_name_string=["A", "B"])
+        add_statement_from_model(item, author)
+        add_statement_from_model(item, reference)
+        self.assertRaises(ValueError, add_statement_from_model, item, author)
+        for i, claim in enumerate(item.claims):
+            claim.id = f"Q42${i}"
+        authors = get_models_from_qualified_statement(item, ScholarSignature)
+        self.assertEqual(1, len(authors))
+        self.assertEqual(["Q7", "Q8"], authors[0].affiliation)
+        self.assertEqual(1, authors[0].series_ordinal)
+        references = get_models_from_qualified_statement(item, Reference)
+        self.assertEqual("somevalue", references[0].reference_id)
+        self.assertEqual(["A", "B"], references[0].author_name_string)
+        self.assertEqual("reference_id", Reference.get_statement_subject(CEUR_DEV_ID))
+
+    def test_statement_index(self):
+        item = create_item_from_model(self.paper, self.wbi)
+        for i in range(50):
+            add_statement_from_model(item, ScholarSignatureCreate(object_named_as=f"Author {i}", series_ordinal=i + 1))
+        index = get_statement_index(item, ScholarSignatureCreate)
+        self.assertEqual(50, index.claim_count)
+        duplicate = ScholarSignatureCreate(object_named_as="Author 7", series_ordinal=99)
+        self.assertEqual(8, index.find(duplicate).series_ordinal)
+        self.assertRaises(ValueError, add_statement_from_model, item, duplicate)
+
+        self.assertTrue(delete_statement_by_matching_model(item, duplicate))
+        self.assertIsNone(index.find(duplicate))
+        self.assertFalse(delete_statement_by_matching_model(item, duplicate))
+        add_statement_from_model(item, duplicate)
+        self.assertEqual(99, index.find(duplicate).series_ordinal)
+
+        # claims modified outside of the index trigger a rebuild
+        item.claims.get("P93")[0].remove()
+        rebuilt_index = get_statement_index(item, ScholarSignatureCreate)
+        self.assertIsNot(index, rebuilt_index)
+        self.assertIsNone(rebuilt_index.find(ScholarSignatureCreate(object_named_as="Author 0", series_ordinal=1)))
+
+
+if __name__ == "__main__":
+    unittest.main()
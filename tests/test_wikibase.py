@@ -0,0 +1,102 @@
+import unittest
+from unittest.mock import patch
+
+from ceur_graph.ceur_dev import CeurDev
+from ceur_graph.entity_cache import EntityCache
+from ceur_graph.wikibase import get_entity_cache, set_entity_cache
+
+
+def get_entity_json(entity_id: str) -> dict:
+    return {
+        "type": "item",
+        "id": entity_id,
+        "lastrevid": 1,
+        "labels": {"en": {"language": "en", "value": f"label of {entity_id}"}},
+        "descriptions": {},
+        "aliases": {},
+        "sitelinks": {},
+        "claims": {},
+    }
+
+
+class TestWikibase(unittest.TestCase):
+    """
+    tests Wikibase entity access without a live wikibase instance
+    """
+
+    def setUp(self):
+        self.ceur_dev = CeurDev()
+        self.entity_cache = get_entity_cache()
+        set_entity_cache(EntityCache())
+
+    def tearDown(self):
+        set_entity_cache(self.entity_cache)
+
+    def test_get_items(self):
+        requested_ids = []
+
+        def wbgetentities(data: dict, **kwargs) -> dict:
+            ids = data["ids"].split("|")
+            requested_ids.append(ids)
+            entities = {}
+            for entity_id in ids:
+                if entity_id == "Q404":
+                    entities[entity_id] = {"id": entity_id, "missing": ""}
+                else:
+                    entities[entity_id] = get_entity_json(entity_id)
+            return {"entities": entities}
+
+        qids = [f"Q{i}" for i in range(1, 121)] + ["https://ceur-dev.wikibase.cloud/entity/Q5", "Q404"]
+        with patch("ceur_graph.wikibase.mediawiki_api_call_helper", side_effect=wbgetentities):
+            items = self.ceur_dev.get_items(qids)
+        self.assertEqual(3, len(requested_ids))
+        self.assertTrue(all(len(ids) <= 50 for ids in requested_ids))
+        self.assertEqual([f"Q{i}" for i in range(1, 121)] + ["Q5"], [item.id for item in items[:-1]])
+        self.assertEqual("label of Q7", items[6].labels.get("en").value)
+        self.assertIsNone(items[-1])
+
+    def test_get_item_revalidation(self):
+        revisions = {"Q1": 1}
+        requests = []
+
+        def wbgetentities(data: dict, **kwargs) -> dict:
+            requests.append(data.get("props", "all"))
+            entity_json = get_entity_json("Q1")
+            entity_json["lastrevid"] = revisions["Q1"]
+            if data.get("props") == "info":
+                entity_json = {key: entity_json[key] for key in ["type", "id", "lastrevid"]}
+            return {"entities": {"Q1": entity_json}}
+
+        with patch("ceur_graph.wikibase.mediawiki_api_call_helper", side_effect=wbgetentities):
+            self.ceur_dev.get_item("Q1")
+            item = self.ceur_dev.get_item("Q1")
+            self.assertEqual(["all", "info"], requests)
+            item.labels.set("en", "modified")
+            self.assertEqual("label of Q1", self.ceur_dev.get_item("Q1").labels.get("en").value)
+            revisions["Q1"] = 2
+            item = self.ceur_dev.get_item("Q1")
+            self.assertEqual(["all", "info", "info", "info", "all"], requests)
+            self.assertEqual(2, item.lastrevid)
+        stats = get_entity_cache().stats()
+        self.assertEqual(2, stats.revalidations)
+        self.assertEqual(1, stats.outdated)
+
+    def test_get_item_max_stale(self):
+        set_entity_cache(EntityCache(max_stale=60))
+        with patch(
+            "ceur_graph.wikibase.mediawiki_api_call_helper", return_value={"entities": {"Q1": get_entity_json("Q1")}}
+        ) as api_call:
+            self.ceur_dev.get_item("Q1")
+            self.ceur_dev.get_item("Q1")
+            self.assertEqual(1, api_call.call_count)
+            # loading for an update always revalidates the cached revision
+            self.ceur_dev.get_item("Q1", for_update=True)
+            self.assertEqual("info", api_call.call_args.kwargs["data"]["props"])
+            self.assertEqual(2, api_call.call_count)
+            self.ceur_dev.evict_cached_entity("Q1")
+            self.ceur_dev.get_item("Q1")
+            self.assertEqual(3, api_call.call_count)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from wikibaseintegrator import WikibaseIntegrator
+
+from ceur_graph.write_queue import ItemWriteQueue
+
+
+class TestItemWriteQueue(unittest.TestCase):
+    """
+    tests the serialization and coalescing of item modifications
+    """
+
+    def setUp(self):
+        self.wikibase = MagicMock()
+        self.wikibase.mediawiki_api_url.unicode_string.return_value = "https://example.org/w/api.php"
+        self.wikibase.get_entity_id.side_effect = lambda entity_id: entity_id
+        self.wikibase.get_item.side_effect = lambda qid, for_update=False: WikibaseIntegrator().item.new()
+        self.wikibase.write_item.side_effect = lambda item, summary=None: item
+
+    def submit_concurrently(self, queue: ItemWriteQueue, modifications: list) -> list:
+        results: list = [None] * len(modifications)
+
+        def run(i: int):
+            try:
+                results[i] = queue.submit(
+                    self.wikibase,
+                    "Q1",
+                    modifications[i],
+                    get_result=lambda item: item.labels.get("en").value,
+                    summary=f"edit {i}",
+                )
+            except Exception as e:
+                results[i] = e
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(len(modifications))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_coalesce_concurrent_modifications(self):
+        queue = ItemWriteQueue(coalesce_window=0.2)
+
+        def set_label(i: int):
+            def modify(item):
+                item.labels.set("en", f"label {i}")
+                return True
+
+            return modify
+
+        results = self.submit_concurrently(queue, [set_label(i) for i in range(5)])
+        self.assertEqual(1, self.wikibase.get_item.call_count)
+        self.assertEqual(1, self.wikibase.write_item.call_count)
+        # all callers see the final state of the single written revision
+        self.assertEqual(1, len(set(results)))
+        summary = self.wikibase.write_item.call_args.kwargs["summary"]
+        self.assertEqual(5, summary.count("edit"))
+        stats = queue.stats()
+        self.assertEqual(5, stats.modifications)
+        self.assertEqual(4, stats.coalesced)
+        self.assertEqual(1, stats.writes)
+
+    def test_failed_modification_only_fails_its_submitter(self):
+        queue = ItemWriteQueue(coalesce_window=0.2)
+
+        def modify(item):
+            item.labels.set("en", "valid")
+            return True
+
+        def invalid_modify(item):
+            item.labels.set("en", "partially applied")
+            raise ValueError("invalid modification")
+
+        results = self.submit_concurrently(queue, [modify, invalid_modify])
+        self.assertEqual("valid", results[0])
+        self.assertIsInstance(results[1], ValueError)
+        self.assertEqual(1, self.wikibase.write_item.call_count)
+        self.assertEqual(1, queue.stats().failed_modifications)
+
+    def test_skip_write_without_changes(self):
+        queue = ItemWriteQueue(coalesce_window=0)
+        result = queue.submit(self.wikibase, "Q1", lambda item: False, get_result=lambda item: "unchanged")
+        self.assertEqual("unchanged", result)
+        self.wikibase.write_item.assert_not_called()
+
+    def test_write_error_fails_all_submitters(self):
+        queue = ItemWriteQueue(coalesce_window=0.2)
+        self.wikibase.write_item.side_effect = ConnectionError("wikibase not reachable")
+
+        def modify(item):
+            item.labels.set("en", "label")
+            return True
+
+        results = self.submit_concurrently(queue, [modify, modify])
+        self.assertTrue(all(isinstance(result, ConnectionError) for result in results))
+
+    def test_serialized_batches_release_item_locks(self):
+        queue = ItemWriteQueue(coalesce_window=0, max_batch_size=1)
+        running = []
+        overlapping = []
+
+        def write_item(item, summary=None):
+            overlapping.append(len(running))
+            running.append(item)
+            time.sleep(0.01)
+            running.remove(item)
+            return item
+
+        self.wikibase.write_item.side_effect = write_item
+
+        def modify(item):
+            item.labels.set("en", "label")
+            return True
+
+        self.submit_concurrently(queue, [modify] * 5)
+        self.assertEqual(5, self.wikibase.write_item.call_count)
+        # the batches of the item are written one after the other
+        self.assertEqual([0] * 5, overlapping)
+        self.assertEqual({}, queue._item_locks)